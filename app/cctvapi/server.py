@@ -1,37 +1,129 @@
+# 시작 시간 측정: 이후 처음 로드되는 모듈별 import 시간을 기록 (가장 먼저 실행, /ready?verbose=true)
+from shared.startup.imports import import_timer
+import_timer.install()
+
+import asyncio
 import requests
-import numpy as np
 import json
+import logging
+import math
 import os
+import time
 
 from fastapi import FastAPI, HTTPException, Query
+from requests.adapters import HTTPAdapter
 from typing import Optional, Dict, Any, Tuple, List 
+from redis.exceptions import RedisError
+from shared.redis import client as redis_client
+from shared.logs.structured import DEBUG_PAYLOADS, setup_logging
+from shared.metrics.registry import observe_upstream, record_cache, setup_metrics
+from shared.profiling.hooks import setup_profiling
+from shared.startup.readiness import setup_readiness
+from shared.resilience.breaker import CircuitOpenError, get_breaker
+
+# 큐 기반 JSON 로깅 (요청 경로에서는 큐에 넣기만 함)
+setup_logging(service="cctvapi")
+logger = logging.getLogger(__name__)
 
 # --- FastAPI 앱 설정 ---
 app = FastAPI(
     title="ITS CCTV Nearest Search API",
     description="GPS 좌표를 받아 가장 가까운 고속도로 CCTV 정보를 반환하는 API입니다."
 )
+
+# /metrics 엔드포인트 + 요청/외부 API/캐시/이벤트 루프 메트릭
+setup_metrics(app, service="cctvapi")
+# PROFILING_TOKEN이 있을 때만 /debug/profile + 요청 단위 CPU 프로파일 (X-Profile: cpu)
+setup_profiling(app)
 # ---------------------
 
-def get_nearest_cctv_info(lat: float, lng: float) -> Optional[Tuple[Dict[str, Any], Optional[str]]]:
+# --- 타일 캐시 설정 ---
+# geohash 5자리 ≈ 4.9km x 4.9km. 같은 타일 안의 요청은 같은 후보 목록을 공유합니다.
+CCTV_TILE_PRECISION = int(os.getenv("CCTV_TILE_PRECISION", "5"))
+# ITS 스트림 URL에는 만료되는 인증 토큰이 붙어 있어 짧게 유지합니다.
+CCTV_CACHE_EXPIRE = int(os.getenv("CCTV_CACHE_EXPIRE", "300"))  # 5분
+# CCTV가 없는 타일(음성 결과)은 URL 만료와 무관하므로 더 길게 유지합니다.
+CCTV_EMPTY_CACHE_EXPIRE = int(os.getenv("CCTV_EMPTY_CACHE_EXPIRE", "3600"))  # 1시간
+CCTV_SEARCH_RADIUS = 0.5  # 탐색 범위 ±0.5도
+# 벤치마크 등에서 로컬 대역 서버로 바꿀 수 있도록 환경 변수로 덮어쓸 수 있습니다.
+ITS_API_BASE_URL = os.getenv("ITS_API_BASE_URL", "https://openapi.its.go.kr:9443")
+# ITS 장애 시 빠르게 실패하도록 서킷 브레이커 + 관측 지연 기반 타임아웃 사용
+ITS_BREAKER = get_breaker("its")
+# ITS 연결 재사용 (요청마다 TLS 연결을 새로 맺지 않도록 공유 세션 + 연결 풀)
+its_session = requests.Session()
+its_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=int(os.getenv("ITS_POOL_SIZE", "4"))))
+# 준비 단계에서 캐시를 채울 좌표 ("위도,경도;위도,경도", 기본: 서울 시청)
+CCTV_WARM_POINTS = os.getenv("CCTV_WARM_POINTS", "37.5665,126.9780")
+
+_GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_encode(lat: float, lng: float, precision: int = CCTV_TILE_PRECISION) -> str:
+    """위경도를 geohash 문자열로 변환합니다."""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # 짝수 비트는 경도, 홀수 비트는 위도
+
+    while len(chars) < precision:
+        rng, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits = bits << 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def geohash_center(tile: str) -> Tuple[float, float]:
+    """geohash 타일의 중심 위경도를 반환합니다."""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    even = True
+
+    for ch in tile:
+        bits = _GEOHASH_BASE32.index(ch)
+        for shift in range(4, -1, -1):
+            rng = lng_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if (bits >> shift) & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return (lat_range[0] + lat_range[1]) / 2, (lng_range[0] + lng_range[1]) / 2
+
+
+def fetch_tile_candidates(tile: str) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
     """
-    ITS 국가교통정보센터 API를 호출하여 입력된 경위도에 가장 가까운 CCTV 정보를 찾습니다.
+    타일 중심 기준 ±0.5도 영역의 CCTV 목록을 ITS API에서 조회해 유효한 좌표를 가진 후보만 반환합니다.
     """
     # API Key를 함수 내부에 직접 명시했습니다. (원래 방식대로 복구)
     API_KEY = os.getenv("ITS_CCTV_API_KEY")
 
     if not API_KEY:
-        print("오류: ITS_CCTV_API_KEY 환경 변수가 설정 X")
+        logger.error("ITS_CCTV_API_KEY 환경 변수가 설정 X")
         return None, "서버 설정 오류: API 키가 없습니다."
 
-    # 탐색 범위를 ±0.5도로 설정했습니다.
-    minX = str(lng - 0.5)
-    maxX = str(lng + 0.5)
-    minY = str(lat - 0.5)
-    maxY = str(lat + 0.5)
+    center_lat, center_lng = geohash_center(tile)
+
+    minX = str(center_lng - CCTV_SEARCH_RADIUS)
+    maxX = str(center_lng + CCTV_SEARCH_RADIUS)
+    minY = str(center_lat - CCTV_SEARCH_RADIUS)
+    maxY = str(center_lat + CCTV_SEARCH_RADIUS)
 
     # cctvType=2: 동영상 파일 요청 / type=ex: 고속도로 CCTV
-    api_call = f'https://openapi.its.go.kr:9443/cctvInfo?' \
+    api_call = f'{ITS_API_BASE_URL}/cctvInfo?' \
                f'apiKey={API_KEY}' \
                f'&type=ex&cctvType=2' \
                f'&minX={minX}&maxX={maxX}' \
@@ -39,51 +131,112 @@ def get_nearest_cctv_info(lat: float, lng: float) -> Optional[Tuple[Dict[str, An
                f'&getType=json'
 
     try:
-        w_dataset = requests.get(api_call, timeout=10).json()
+        ITS_BREAKER.before_call()
+    except CircuitOpenError as e:
+        logger.warning(str(e))
+        return None, "ITS API 장애로 일시적으로 조회를 중단했습니다. 잠시 후 다시 시도해 주세요."
+
+    try:
+        start = time.perf_counter()
+        with observe_upstream("ITS", "cctvInfo") as call:
+            response = its_session.get(api_call, timeout=ITS_BREAKER.timeout())
+            call.status = response.status_code
+        if response.status_code >= 500:
+            ITS_BREAKER.record_failure()
+            response.raise_for_status()
+        w_dataset = response.json()
+        ITS_BREAKER.record_success(time.perf_counter() - start)
         
-        # --- DEBUG: Full Response 출력 ---
-        print("\n--- DEBUG: Full API Response ---")
-        print(json.dumps(w_dataset, indent=2, ensure_ascii=False))
-        print("----------------------------------\n")
+        # 전체 응답 덤프는 LOG_DEBUG_PAYLOADS=true일 때만
+        if DEBUG_PAYLOADS:
+            logger.info("ITS API 응답 내용", extra={"log_class": "payload", "tile": tile, "body": w_dataset})
 
         cctv_data: List[Dict[str, Any]] = w_dataset.get('response', {}).get('data', [])
 
-        if not cctv_data: 
-            return None, "해당 영역에서 CCTV 데이터를 찾을 수 없습니다."
-        
-        # 최단 거리 계산 (NumPy 활용)
-        valid_cctv_data: List[Dict[str, Any]] = []
-        valid_coords: List[Tuple[float, float]] = []
-        
-        for data in cctv_data:
+        # 캐시에는 응답에 필요한 필드만 저장합니다.
+        candidates: List[Dict[str, Any]] = []
+        for data in cctv_data or []:
             try:
-                coord_y = float(data.get('coordy', ''))
-                coord_x = float(data.get('coordx', ''))
-                valid_coords.append((coord_y, coord_x))
-                valid_cctv_data.append(data)
-            except ValueError:
+                float(data.get('coordy', ''))
+                float(data.get('coordx', ''))
+            except (TypeError, ValueError):
                 continue
+            candidates.append({
+                "cctvname": data.get('cctvname', 'Unknown'),
+                "cctvurl": data.get('cctvurl', ''),
+                "cctvtype": data.get('cctvtype', ''),
+                "coordy": data.get('coordy'),
+                "coordx": data.get('coordx'),
+            })
 
-        if not valid_cctv_data:
-            return None, "유효한 좌표를 가진 CCTV 데이터가 없습니다."
-
-        coords = np.array(valid_coords)
-        target = np.array((lat, lng))
-        distances = np.linalg.norm(coords - target, axis=1)
-        min_index = np.argmin(distances)
+        return candidates, None
 
-        return valid_cctv_data[min_index], None
-        
     except requests.exceptions.RequestException as e:
+        if not isinstance(e, requests.exceptions.HTTPError):
+            ITS_BREAKER.record_failure()
         error_msg = f"API 통신 오류 (requests): {e}"
-        print(error_msg)
+        logger.error(error_msg)
         return None, error_msg
     except Exception as e:
         error_msg = f"데이터 처리 중 예상치 못한 오류: {e}"
-        print(error_msg)
+        logger.exception(error_msg)
         return None, error_msg
 
 
+def get_tile_candidates(tile: str) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+    """
+    타일 캐시에서 후보 목록을 조회하고, 없으면 ITS API를 호출해 캐시에 저장합니다.
+    CCTV가 없는 타일은 빈 목록으로 캐시됩니다(음성 캐시).
+    """
+    cache_key = f"cctv:tile:{tile}"
+    try:
+        cached = redis_client.redis.get(cache_key)
+    except RedisError as e:
+        logger.warning(f"Redis 조회 실패, ITS API 직접 호출: {e}")
+        cached = None
+
+    if cached is not None:
+        try:
+            candidates = json.loads(cached)
+            record_cache(cache_key, "hit")
+            return candidates, None
+        except json.JSONDecodeError:
+            logger.warning("캐시된 JSON 파싱 오류. API 재호출")
+    record_cache(cache_key, "miss")
+
+    candidates, error_msg = fetch_tile_candidates(tile)
+    if error_msg:
+        # 통신 오류는 캐시하지 않습니다.
+        return None, error_msg
+
+    expire = CCTV_CACHE_EXPIRE if candidates else CCTV_EMPTY_CACHE_EXPIRE
+    try:
+        redis_client.redis.set(cache_key, json.dumps(candidates, ensure_ascii=False), ex=expire)
+    except RedisError as e:
+        logger.warning(f"Redis 저장 실패: {e}")
+
+    return candidates, None
+
+
+def get_nearest_cctv_info(lat: float, lng: float) -> Optional[Tuple[Dict[str, Any], Optional[str]]]:
+    """
+    요청 좌표가 속한 타일의 CCTV 후보 중 입력된 경위도에 가장 가까운 CCTV 정보를 찾습니다.
+    """
+    tile = geohash_encode(lat, lng)
+    candidates, error_msg = get_tile_candidates(tile)
+
+    if error_msg:
+        return None, error_msg
+
+    if not candidates:
+        return None, None
+
+    # 최단 거리 계산 (후보는 타일당 수십 개라 NumPy 없이 계산합니다)
+    nearest = min(candidates, key=lambda c: math.hypot(float(c['coordy']) - lat, float(c['coordx']) - lng))
+
+    return nearest, None
+
+
 @app.get('/get_cctv')
 def get_cctv(
     # 위도: 최남단 33.0 ~ 최북단 39.0 (요청에 따라 범위 조정)
@@ -94,7 +247,7 @@ def get_cctv(
     """
     GET 요청으로 위도(lat)와 경도(lng)를 받아 가장 가까운 CCTV 정보를 JSON으로 반환합니다.
     """
-    print(f"\n--- API 요청 수신: Lat={lat}, Lng={lng} ---")
+    logger.info("API 요청 수신", extra={"log_class": "request", "lat": lat, "lng": lng})
     
     cctv_info, error_message = get_nearest_cctv_info(lat, lng)
 
@@ -112,4 +265,36 @@ def get_cctv(
         "cctv_type": cctv_info.get('cctvtype', ''),
         "cctv_lat": cctv_info.get('coordy', ''),
         "cctv_lng": cctv_info.get('coordx', '')
-    }
\ No newline at end of file
+    }
+
+
+# --- 준비 단계 (/ready) ---
+async def ping_redis():
+    await asyncio.to_thread(redis_client.redis.ping)
+
+
+async def connect_its():
+    # 연결 풀에 ITS 연결을 미리 맺습니다. (응답 상태는 보지 않음)
+    await asyncio.to_thread(its_session.head, ITS_API_BASE_URL, timeout=5)
+
+
+async def prime_tiles():
+    failed = []
+    for point in filter(None, (part.strip() for part in CCTV_WARM_POINTS.split(";"))):
+        lat, _, lng = point.partition(",")
+        tile = geohash_encode(float(lat), float(lng))
+        _, error_msg = await asyncio.to_thread(get_tile_candidates, tile)
+        if error_msg:
+            failed.append(tile)
+    if failed:
+        raise RuntimeError(f"캐시를 채우지 못한 타일: {', '.join(failed)}")
+
+
+async def warm_up(readiness):
+    await readiness.step("redis", ping_redis, retry=True)
+    await readiness.step("upstream", connect_its, retry=True)
+    await readiness.step("warm", prime_tiles)
+
+
+# /ready: Redis, ITS 연결 풀, CCTV_WARM_POINTS 타일 캐시가 준비된 뒤에만 200 (readinessProbe)
+setup_readiness(app, service="cctvapi", warm_up=warm_up)
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+import pytest
+
+from cctvapi import server
+
+
+@pytest.fixture
+def its(monkeypatch):
+    """ITS API 대신 정해진 후보를 돌려주고 호출된 타일을 기록합니다."""
+    its = SimpleNamespace(calls=[], responses={})
+
+    def fetch(tile):
+        its.calls.append(tile)
+        return its.responses.get(tile, ([], None))
+
+    monkeypatch.setattr(server, "fetch_tile_candidates", fetch)
+    return its
+
+
+def cctv(name, lat, lng):
+    return {"cctvname": name, "cctvurl": f"http://its/{name}", "cctvtype": "2", "coordy": str(lat), "coordx": str(lng)}
+
+
+def test_geohash_encode_known_value():
+    assert server.geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert server.geohash_encode(37.5665, 126.9780) == "wydm9"
+
+
+def test_geohash_center_stays_in_tile():
+    for lat, lng in [(37.5665, 126.9780), (35.1796, 129.0756), (33.4996, 126.5312)]:
+        tile = server.geohash_encode(lat, lng)
+        assert server.geohash_encode(*server.geohash_center(tile), len(tile)) == tile
+
+
+def test_nearby_points_share_a_tile():
+    assert server.geohash_encode(37.5665, 126.9780) == server.geohash_encode(37.5670, 126.9785)
+
+
+def test_tile_candidates_cached(its, fake_redis):
+    tile = server.geohash_encode(37.5665, 126.9780)
+    its.responses[tile] = ([cctv("a", 37.56, 126.97)], None)
+
+    first, _ = server.get_tile_candidates(tile)
+    second, _ = server.get_tile_candidates(tile)
+
+    assert first == second == [cctv("a", 37.56, 126.97)]
+    assert its.calls == [tile]
+    assert 0 < fake_redis.ttl(f"cctv:tile:{tile}") <= server.CCTV_CACHE_EXPIRE
+
+
+def test_empty_tile_cached_longer(its, fake_redis):
+    tile = server.geohash_encode(35.0, 125.0)
+
+    assert server.get_tile_candidates(tile) == ([], None)
+    assert server.get_tile_candidates(tile) == ([], None)
+    assert its.calls == [tile]
+    assert server.CCTV_CACHE_EXPIRE < fake_redis.ttl(f"cctv:tile:{tile}") <= server.CCTV_EMPTY_CACHE_EXPIRE
+
+
+def test_fetch_error_not_cached(its, fake_redis):
+    tile = server.geohash_encode(37.5665, 126.9780)
+    its.responses[tile] = (None, "API 통신 오류")
+
+    assert server.get_tile_candidates(tile) == (None, "API 통신 오류")
+    assert server.get_tile_candidates(tile) == (None, "API 통신 오류")
+    assert len(its.calls) == 2
+    assert fake_redis.get(f"cctv:tile:{tile}") is None
+
+
+def test_nearest_cctv_in_tile(its):
+    lat, lng = 37.5665, 126.9780
+    its.responses[server.geohash_encode(lat, lng)] = (
+        [cctv("far", 37.9, 127.3), cctv("near", 37.57, 126.98), cctv("mid", 37.6, 127.0)], None)
+
+    nearest, error = server.get_nearest_cctv_info(lat, lng)
+
+    assert error is None
+    assert nearest["cctvname"] == "near"
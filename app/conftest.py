@@ -0,0 +1,24 @@
+import fakeredis
+import pytest
+
+from shared.redis import client as redis_client
+
+# ----------------------------------------------
+# 테스트 공용 fixture
+# ----------------------------------------------
+# 모든 테스트는 Lua 스크립트(쿼터, 요청 제한)까지 실행되는 fakeredis를 사용합니다. (테스트마다 새 서버)
+# 문자열용/바이너리용 클라이언트가 같은 서버를 봅니다.
+
+
+@pytest.fixture
+def redis_server():
+    """fakeredis 서버. connected = False로 Redis 장애를 흉내 냅니다."""
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture(autouse=True)
+def fake_redis(monkeypatch, redis_server):
+    server = redis_server
+    monkeypatch.setattr(redis_client, "redis", fakeredis.FakeRedis(server=server, decode_responses=True))
+    monkeypatch.setattr(redis_client, "redis_binary", fakeredis.FakeRedis(server=server))
+    return redis_client.redis
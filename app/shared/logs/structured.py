@@ -0,0 +1,160 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# ----------------------------------------------
+# 비동기 구조화(JSON) 로깅
+# ----------------------------------------------
+# 요청 처리 경로에서는 레코드를 큐에 넣기만 하고, 포맷팅(JSON 직렬화)과 stdout 쓰기는
+# 별도 스레드(QueueListener)가 처리합니다. 큐가 가득 차면 기다리지 않고 버립니다.
+#
+# 메시지 종류(log_class)별 샘플링/초당 제한:
+#   logger.info("...", extra={"log_class": "cache"})  -> LOG_SAMPLE_RATES의 cache 비율만 기록
+#   log_class가 없으면 "모듈:줄번호"가 종류가 됩니다.
+#   WARNING 이상은 샘플링하지 않고 초당 제한만 적용합니다. 제한으로 버린 개수는 다음 레코드의 suppressed로 남깁니다.
+#
+# 외부 API 응답 본문/헤더 같은 페이로드 덤프는 LOG_DEBUG_PAYLOADS=true일 때만 기록합니다.
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_RATE_LIMIT = float(os.getenv("LOG_RATE_LIMIT", "20"))  # 종류별 초당 최대 레코드 수
+# 종류별 샘플링 비율 (예: "cache=0.01,upstream=0.1")
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "cache=0.01,upstream=0.1")
+DEBUG_PAYLOADS = os.getenv("LOG_DEBUG_PAYLOADS", "false").lower() == "true"
+# 요청마다 전체 URL(서비스 키 포함)을 INFO로 남기는 라이브러리 로거는 WARNING부터만
+QUIET_LOGGERS = ("httpx", "httpcore")
+
+# LogRecord 기본 속성 (나머지 extra 필드만 JSON에 추가)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+
+def parse_rates(value: str) -> dict:
+    rates = {}
+    for part in value.split(","):
+        name, _, rate = part.partition("=")
+        if name.strip() and rate.strip():
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+class JsonFormatter(logging.Formatter):
+    def __init__(self, service: str):
+        super().__init__()
+        self.service = service
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "service": self.service,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key not in entry:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """메시지 종류별 샘플링 + 초당 제한 (토큰 버킷)"""
+
+    def __init__(self, rates: dict, rate_limit: float):
+        super().__init__()
+        self.rates = rates
+        self.rate_limit = rate_limit
+        self.buckets = {}      # 종류 -> (토큰, 마지막 갱신 시각)
+        self.suppressed = {}   # 종류 -> 제한으로 버린 개수
+        self.lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        log_class = getattr(record, "log_class", None) or f"{record.module}:{record.lineno}"
+        if record.levelno < logging.WARNING:
+            rate = self.rates.get(log_class, 1.0)
+            if rate < 1.0:
+                if random.random() >= rate:
+                    return False
+                record.sample_rate = rate
+
+        now = time.monotonic()
+        with self.lock:
+            tokens, updated = self.buckets.get(log_class, (self.rate_limit, now))
+            tokens = min(self.rate_limit, tokens + (now - updated) * self.rate_limit)
+            if tokens < 1.0:
+                self.buckets[log_class] = (tokens, now)
+                self.suppressed[log_class] = self.suppressed.get(log_class, 0) + 1
+                return False
+            self.buckets[log_class] = (tokens - 1.0, now)
+            suppressed = self.suppressed.pop(log_class, 0)
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """큐가 가득 차면 기다리지 않고 버리는 QueueHandler"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 포맷팅은 리스너 스레드에서 합니다. 여기서는 메시지 인자와 예외만 문자열로 고정합니다.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        # 큐가 넘쳐 버린 개수는 다음으로 큐에 들어가는 레코드의 dropped로 남깁니다.
+        dropped = self.dropped
+        if dropped:
+            record.dropped = dropped
+        try:
+            self.queue.put_nowait(record)
+            self.dropped -= dropped
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener = None
+
+
+def setup_logging(service: str):
+    """루트 로거를 큐 기반 JSON 로깅으로 설정합니다. (프로세스당 한 번)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter(service))
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    handler = DroppingQueueHandler(log_queue)
+    handler.addFilter(SamplingFilter(parse_rates(LOG_SAMPLE_RATES), LOG_RATE_LIMIT))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(LOG_LEVEL)
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
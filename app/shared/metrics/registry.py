@@ -0,0 +1,269 @@
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from starlette.responses import Response
+
+# 20m CPU 파드 기준으로 버킷 수와 라벨 조합을 최소한으로 유지합니다.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LOOP_LAG_INTERVAL = float(os.getenv("METRICS_LOOP_LAG_INTERVAL", "1.0"))  # 초
+
+# ----------------------------------------------
+# 엔드포인트
+# ----------------------------------------------
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "라우트별 요청 처리 시간",
+    ["service", "route", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+# SSE(text/event-stream) 연결은 수 분씩 열려 있어 요청 처리 시간 분포(p95/p99)를 왜곡하므로 따로 셉니다.
+HTTP_OPEN_STREAMS = Gauge(
+    "http_open_streams",
+    "라우트별 열려 있는 스트리밍(SSE) 응답 수",
+    ["service", "route"],
+)
+
+# ----------------------------------------------
+# 외부 API (KMA / AIR / MID / ITS)
+# ----------------------------------------------
+UPSTREAM_DURATION = Histogram(
+    "upstream_request_duration_seconds",
+    "외부 API 오퍼레이션별 호출 시간",
+    ["api", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_REQUESTS = Counter(
+    "upstream_requests_total",
+    "외부 API 오퍼레이션별 호출 결과(HTTP 상태 코드 또는 error)",
+    ["api", "operation", "status"],
+)
+UPSTREAM_INFLIGHT = Gauge(
+    "upstream_inflight_requests",
+    "진행 중인 외부 API 호출 수",
+    ["api", "operation"],
+)
+CIRCUIT_STATE = Gauge(
+    "upstream_circuit_state",
+    "서킷 브레이커 상태 (0=closed, 1=half_open, 2=open)",
+    ["breaker"],
+)
+UPSTREAM_TIMEOUT = Gauge(
+    "upstream_timeout_seconds",
+    "관측 지연으로 계산된 현재 외부 API 타임아웃",
+    ["breaker"],
+)
+
+QUOTA_REMAINING = Gauge(
+    "upstream_quota_remaining",
+    "오퍼레이션별 오늘 남은 외부 API 호출 수 (클러스터 공용)",
+    ["operation"],
+)
+QUOTA_TOKENS = Gauge(
+    "upstream_quota_bucket_tokens",
+    "오퍼레이션별 토큰 버킷 잔량",
+    ["operation"],
+)
+QUOTA_REJECTIONS = Counter(
+    "upstream_quota_rejections_total",
+    "쿼터 부족으로 건너뛴 외부 API 호출 수",
+    ["operation", "priority"],
+)
+UPSTREAM_HEDGES = Counter(
+    "upstream_hedged_requests_total",
+    "지연 백분위수를 넘겨 보낸 두 번째(헤지) 요청 (sent / won / skipped)",
+    ["operation", "result"],
+)
+
+# ----------------------------------------------
+# 요청 수락 제어
+# ----------------------------------------------
+ADMISSION_INFLIGHT = Gauge(
+    "admission_inflight_requests",
+    "라우트별 수락되어 처리 중인 요청 수",
+    ["route"],
+)
+ADMISSION_QUEUED = Gauge(
+    "admission_queued_requests",
+    "라우트별 수락 대기 중인 요청 수",
+    ["route"],
+)
+ADMISSION_SHED = Counter(
+    "admission_shed_requests_total",
+    "수락하지 못한 요청 (cache-only: 캐시 전용 응답 / rejected: 503)",
+    ["route", "result"],
+)
+
+# ----------------------------------------------
+# 클라이언트별 요청 제한
+# ----------------------------------------------
+RATE_LIMIT_REQUESTS = Counter(
+    "ratelimit_requests_total",
+    "예산(cache / upstream)별 요청 제한 확인 결과 (allowed / limited / error)",
+    ["budget", "result"],
+)
+RATE_LIMIT_USAGE = Histogram(
+    "ratelimit_usage_ratio",
+    "확인 시점의 클라이언트 사용량 / 한도",
+    ["budget"],
+    buckets=(0.1, 0.25, 0.5, 0.75, 0.9, 1.0, 1.5),
+)
+RATE_LIMIT_LIMITED_CLIENTS = Gauge(
+    "ratelimit_limited_clients",
+    "최근 한 창 안에 제한된 클라이언트 수 (레플리카별)",
+    ["budget"],
+)
+
+# ----------------------------------------------
+# 캐시
+# ----------------------------------------------
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "캐시 키 패밀리별 조회 결과(hit / miss / stale / negative / local)",
+    ["family", "result"],
+)
+
+REDIS_AVAILABLE = Gauge(
+    "redis_available",
+    "Redis 헬스 트래커 상태 (1: 정상, 0: 장애 감지로 호출 차단 중)",
+)
+
+# ----------------------------------------------
+# 이벤트 루프
+# ----------------------------------------------
+EVENT_LOOP_LAG = Gauge(
+    "event_loop_lag_seconds",
+    "마지막으로 측정된 이벤트 루프 지연",
+)
+
+# ----------------------------------------------
+# 시작 / 준비 상태
+# ----------------------------------------------
+STARTUP_SECONDS = Gauge(
+    "startup_seconds",
+    "프로세스 시작 단계별 소요 시간 (imports, 준비 단계별, total)",
+    ["service", "phase"],
+)
+READY = Gauge(
+    "ready",
+    "준비 완료 여부 (1: /ready 200)",
+    ["service"],
+)
+
+
+def cache_family(cache_key: str) -> str:
+    """
+    캐시 키에서 좌표/구역 코드를 제외한 패밀리 이름을 반환합니다.
+    예: "weather:sky:60:127" -> "weather:sky", "week:mid:ta:11B10101" -> "week:mid:ta"
+    """
+    parts = []
+    for part in cache_key.split(":"):
+        if not part.isalpha():
+            break
+        parts.append(part)
+    return ":".join(parts) or "unknown"
+
+
+def record_cache(cache_key: str, result: str):
+    CACHE_REQUESTS.labels(cache_family(cache_key), result).inc()
+
+
+class UpstreamCall:
+    """observe_upstream() 안에서 응답 상태를 기록하기 위한 객체"""
+    __slots__ = ("status",)
+
+    def __init__(self):
+        self.status = "error"
+
+
+@contextmanager
+def observe_upstream(api: str, operation: str):
+    """
+    외부 API 호출 한 번의 지연 시간, 결과 상태, 진행 중 호출 수를 기록합니다.
+    동기(requests)와 비동기(httpx) 코드 모두에서 with 문으로 사용합니다.
+    """
+    call = UpstreamCall()
+    inflight = UPSTREAM_INFLIGHT.labels(api, operation)
+    inflight.inc()
+    start = time.perf_counter()
+    try:
+        yield call
+    except Exception as e:
+        if "Timeout" in type(e).__name__:
+            call.status = "timeout"
+        raise
+    finally:
+        UPSTREAM_DURATION.labels(api, operation).observe(time.perf_counter() - start)
+        UPSTREAM_REQUESTS.labels(api, operation, str(call.status)).inc()
+        inflight.dec()
+
+
+class MetricsMiddleware:
+    """
+    라우트 템플릿(/api/weather/current 등) 단위로 요청 처리 시간을 기록하는 ASGI 미들웨어.
+    BaseHTTPMiddleware보다 오버헤드가 적어 순수 ASGI로 구현했습니다.
+    text/event-stream 응답은 처리 시간 대신 열려 있는 스트림 수(HTTP_OPEN_STREAMS)로 기록합니다.
+    """
+
+    def __init__(self, app, service: str):
+        self.app = app
+        self.service = service
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = {"code": 500}
+        stream = None  # 스트리밍 응답이면 열린 스트림 게이지
+
+        async def send_wrapper(message):
+            nonlocal stream
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+                if content_type.startswith(b"text/event-stream"):
+                    stream = HTTP_OPEN_STREAMS.labels(self.service, _route_path(scope))
+                    stream.inc()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if stream is not None:
+                stream.dec()
+            else:
+                HTTP_REQUEST_DURATION.labels(
+                    self.service, _route_path(scope), scope["method"], str(status["code"])
+                ).observe(time.perf_counter() - start)
+
+
+def _route_path(scope) -> str:
+    # 매칭되지 않은 경로는 라벨 수가 늘어나지 않도록 하나로 묶습니다.
+    return getattr(scope.get("route"), "path", "unmatched")
+
+
+async def monitor_event_loop_lag(interval: float = LOOP_LAG_INTERVAL):
+    """interval마다 깨어나 예정 시각보다 늦어진 만큼을 이벤트 루프 지연으로 기록합니다."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.set(max(0.0, loop.time() - start - interval))
+
+
+def metrics_endpoint():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+def setup_metrics(app, service: str):
+    """FastAPI 앱에 /metrics 엔드포인트, 요청 지연 미들웨어, 이벤트 루프 지연 측정을 등록합니다."""
+    app.add_middleware(MetricsMiddleware, service=service)
+    app.add_api_route("/metrics", metrics_endpoint, include_in_schema=False)
+
+    @app.on_event("startup")
+    async def start_loop_lag_monitor():
+        app.state.loop_lag_task = asyncio.create_task(monitor_event_loop_lag())
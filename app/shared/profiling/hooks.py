@@ -0,0 +1,273 @@
+import asyncio
+import hmac
+import linecache
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter, OrderedDict
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+# ----------------------------------------------
+# 운영 파드 온디맨드 프로파일링
+# ----------------------------------------------
+# PROFILING_TOKEN이 설정된 경우에만 켜집니다. 비어 있으면 미들웨어와 /debug/profile 라우트를
+# 아예 등록하지 않으므로 요청 경로에 추가되는 비용이 없습니다.
+# 모든 요청에 X-Profile-Token 헤더로 토큰이 필요합니다. 레플리카별 결과이므로 파드에 직접 붙어서 사용합니다.
+#
+#   CPU (시간 구간)   GET  /debug/profile/cpu?seconds=10        -> collapsed stack (flamegraph.pl, speedscope)
+#   CPU (요청 하나)   요청에 X-Profile: cpu 헤더 -> 응답의 X-Profile-Id로
+#                     GET  /debug/profile/requests/{id}          -> collapsed stack
+#   메모리           POST /debug/profile/heap/start?frames=1 -> GET /debug/profile/heap?diff=true (이전 스냅샷 대비 상위 할당 위치)
+#                     -> POST /debug/profile/heap/stop
+#   asyncio 태스크   GET  /debug/profile/tasks
+#
+# CPU 프로파일은 별도 스레드가 PROFILE_SAMPLE_INTERVAL마다 모든 스레드의 스택을 채집합니다.
+# 요청 하나를 측정해도 같은 이벤트 루프에서 동시에 처리된 다른 요청의 스택이 함께 들어갑니다.
+
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.01"))  # 초 (100Hz)
+PROFILE_MAX_SECONDS = 60          # 시간 구간 프로파일 최대 길이
+PROFILE_MAX_SESSIONS = 2          # 동시에 실행할 수 있는 CPU 프로파일 수
+PROFILE_KEEP_RESULTS = 20         # 보관할 요청 단위 프로파일 수
+PROFILE_STACK_DEPTH = 20          # 태스크 덤프의 태스크당 최대 프레임 수
+
+
+class StackSampler:
+    """주기적으로 sys._current_frames()를 채집해 collapsed stack 형식으로 집계합니다."""
+
+    def __init__(self, interval: float = PROFILE_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.counts = Counter()
+        self.samples = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self) -> str:
+        self.stopped.set()
+        self.thread.join()
+        return self.collapsed()
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        # 짧은 요청도 결과가 비지 않도록 시작하자마자 한 번 채집합니다.
+        while True:
+            frames = sys._current_frames()
+            if frames.keys() - names.keys():
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in frames.items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.counts[";".join(reversed(stack))] += 1
+            self.samples += 1
+            if self.stopped.wait(self.interval):
+                return
+
+    def collapsed(self) -> str:
+        """'스레드;바깥 함수;...;안쪽 함수 횟수' 한 줄씩 (Brendan Gregg collapsed 형식)"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+_sessions = threading.BoundedSemaphore(PROFILE_MAX_SESSIONS)
+_results = OrderedDict()  # 프로파일 ID -> collapsed stack
+
+
+def start_sampler() -> Optional[StackSampler]:
+    """동시 실행 한도를 넘으면 None"""
+    if not _sessions.acquire(blocking=False):
+        return None
+    sampler = StackSampler()
+    sampler.start()
+    return sampler
+
+
+def stop_sampler(sampler: StackSampler) -> str:
+    try:
+        return sampler.stop()
+    finally:
+        _sessions.release()
+
+
+def keep_result(profile_id: str, collapsed: str):
+    _results[profile_id] = collapsed
+    while len(_results) > PROFILE_KEEP_RESULTS:
+        _results.popitem(last=False)
+
+
+def token_matches(token: Optional[str]) -> bool:
+    return bool(PROFILING_TOKEN) and token is not None and hmac.compare_digest(token, PROFILING_TOKEN)
+
+
+class RequestProfilerMiddleware:
+    """
+    X-Profile: cpu + 올바른 X-Profile-Token 헤더가 있는 요청만 응답 헤더 전송 시점까지 CPU 프로파일을 채집하고
+    결과 ID를 X-Profile-Id 헤더로 돌려주는 ASGI 미들웨어.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        if headers.get(b"x-profile") != b"cpu" or not token_matches(headers.get(b"x-profile-token", b"").decode("latin-1")):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = start_sampler()
+        profile_id = uuid.uuid4().hex[:12] if sampler is not None else "busy"
+
+        async def send_wrapper(message):
+            nonlocal sampler
+            if message["type"] == "http.response.start" and sampler is not None:
+                keep_result(profile_id, stop_sampler(sampler))
+                sampler = None
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if sampler is not None:
+                keep_result(profile_id, stop_sampler(sampler))
+
+
+def require_token(x_profile_token: Optional[str] = Header(None)):
+    if not token_matches(x_profile_token):
+        raise HTTPException(status_code=403, detail="프로파일링 토큰이 올바르지 않습니다")
+
+
+router = APIRouter(prefix="/debug/profile", dependencies=[Depends(require_token)], include_in_schema=False)
+
+
+@router.get("/cpu", response_class=PlainTextResponse)
+async def profile_cpu(seconds: float = Query(10, gt=0, le=PROFILE_MAX_SECONDS)):
+    sampler = start_sampler()
+    if sampler is None:
+        raise HTTPException(status_code=409, detail="이미 실행 중인 프로파일이 있습니다")
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        collapsed = await asyncio.to_thread(stop_sampler, sampler)
+    return PlainTextResponse(collapsed)
+
+
+@router.get("/requests/{profile_id}", response_class=PlainTextResponse)
+async def profile_request(profile_id: str):
+    collapsed = _results.get(profile_id)
+    if collapsed is None:
+        raise HTTPException(status_code=404, detail="프로파일 결과가 없습니다")
+    return PlainTextResponse(collapsed)
+
+
+# ----------------------------------------------
+# tracemalloc 스냅샷 / 비교
+# ----------------------------------------------
+
+_heap = {"previous": None}
+# 추적 도구 자신(결과 포맷팅의 소스 줄 캐시 포함)의 할당은 결과에서 제외합니다.
+_HEAP_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, linecache.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+)
+
+
+@router.post("/heap/start")
+def heap_start(frames: int = Query(1, ge=1, le=25)):
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+    _heap["previous"] = None
+    return {"tracing": True, "frames": tracemalloc.get_traceback_limit()}
+
+
+@router.post("/heap/stop")
+def heap_stop():
+    tracemalloc.stop()
+    _heap["previous"] = None
+    return {"tracing": False}
+
+
+@router.get("/heap")
+def heap_snapshot(limit: int = Query(20, ge=1, le=200), diff: bool = False,
+                  group: str = Query("lineno", pattern="^(lineno|filename|traceback)$")):
+    """상위 할당 위치. diff=true면 직전 스냅샷 대비 증가분 순서입니다."""
+    if not tracemalloc.is_tracing():
+        raise HTTPException(status_code=409, detail="먼저 /debug/profile/heap/start로 추적을 시작하세요")
+
+    snapshot = tracemalloc.take_snapshot().filter_traces(_HEAP_FILTERS)
+    previous = _heap["previous"]
+    _heap["previous"] = snapshot
+
+    if diff and previous is not None:
+        stats = snapshot.compare_to(previous, group)[:limit]
+        top = [{
+            "location": stat.traceback.format(),
+            "size_kb": round(stat.size / 1024, 1),
+            "size_diff_kb": round(stat.size_diff / 1024, 1),
+            "count": stat.count,
+            "count_diff": stat.count_diff,
+        } for stat in stats]
+    else:
+        stats = snapshot.statistics(group)[:limit]
+        top = [{
+            "location": stat.traceback.format(),
+            "size_kb": round(stat.size / 1024, 1),
+            "count": stat.count,
+        } for stat in stats]
+
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        "traced_kb": round(current / 1024, 1),
+        "peak_kb": round(peak / 1024, 1),
+        "diff": diff and previous is not None,
+        "top": top,
+    }
+
+
+# ----------------------------------------------
+# asyncio 태스크 덤프
+# ----------------------------------------------
+
+@router.get("/tasks")
+async def dump_tasks():
+    """실행 중인 태스크와 각 태스크가 대기 중인 위치 (오래 걸리는 요청/멈춘 태스크 확인용)"""
+    current = asyncio.current_task()
+    tasks = []
+    for task in asyncio.all_tasks():
+        if task is current:
+            continue
+        stack = [
+            f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno} {frame.f_code.co_name}"
+            for frame in task.get_stack(limit=PROFILE_STACK_DEPTH)
+        ]
+        tasks.append({"name": task.get_name(), "coro": getattr(task.get_coro(), "__qualname__", repr(task.get_coro())), "stack": stack})
+    tasks.sort(key=lambda entry: entry["name"])
+    return {"count": len(tasks), "at": time.time(), "tasks": tasks}
+
+
+def setup_profiling(app):
+    """PROFILING_TOKEN이 있을 때만 요청 단위 프로파일 미들웨어와 /debug/profile 라우트를 등록합니다."""
+    if not PROFILING_TOKEN:
+        return
+    app.add_middleware(RequestProfilerMiddleware)
+    app.include_router(router)
@@ -1,8 +1,115 @@
+import logging
 import os
+import threading
+import time
 from redis import Redis
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+from shared.metrics.registry import REDIS_AVAILABLE
 
-redis = Redis(
-    host="redis-service", # 수정
-    port=6379,
-    decode_responses=True
-)
+# ----------------------------------------------
+# Redis 장애 감지 (캐시 계층 헬스 트래커)
+# ----------------------------------------------
+# Redis 파드가 재시작되는 동안 요청마다 연결 타임아웃을 기다리지 않도록,
+# 연결 오류가 나면 REDIS_RETRY_SECONDS 동안 Redis 호출을 바로 CacheUnavailable로 실패시킵니다.
+# 그 시간이 지나면 다음 호출이 다시 연결을 시도하고, 성공하면 정상 상태로 돌아옵니다.
+
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "0.5"))  # 초
+REDIS_RETRY_SECONDS = float(os.getenv("REDIS_RETRY_SECONDS", "5"))      # 장애 감지 후 재연결 시도까지 (초)
+
+
+class CacheUnavailable(RedisConnectionError):
+    """Redis 장애로 차단된 상태에서의 호출"""
+
+
+class RedisHealth:
+    def __init__(self):
+        self.tripped_until = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.tripped_until
+
+    def check(self):
+        if not self.available:
+            raise CacheUnavailable("Redis 장애 감지: 재연결 대기 중")
+
+    def record_failure(self, error: Exception):
+        with self.lock:
+            if self.tripped_until == 0.0:
+                logging.error(f"Redis 연결 실패, {REDIS_RETRY_SECONDS}초 동안 Redis 호출 차단: {error}")
+            self.tripped_until = time.monotonic() + REDIS_RETRY_SECONDS
+            REDIS_AVAILABLE.set(0)
+
+    def record_success(self):
+        if self.tripped_until == 0.0:
+            return
+        with self.lock:
+            if self.tripped_until != 0.0:
+                logging.info("Redis 연결 복구")
+                self.tripped_until = 0.0
+                REDIS_AVAILABLE.set(1)
+
+
+health = RedisHealth()
+REDIS_AVAILABLE.set(1)
+
+
+class _Guarded:
+    """Redis 클라이언트/파이프라인 호출을 헬스 트래커로 감싸는 프록시"""
+
+    # 자체 연결을 쓰거나 네트워크 호출이 없는 메서드
+    PASSTHROUGH = {"pubsub", "get_connection_kwargs", "close"}
+
+    def __init__(self, target, health: RedisHealth):
+        self._target = target
+        self._health = health
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name in self.PASSTHROUGH or not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            self._health.check()
+            try:
+                result = attr(*args, **kwargs)
+            except (RedisConnectionError, RedisTimeoutError) as e:
+                self._health.record_failure(e)
+                raise
+            self._health.record_success()
+            return result
+        return call
+
+
+class GuardedPipeline(_Guarded):
+    # 명령은 버퍼에만 쌓이고 execute()에서 한 번에 전송됩니다.
+    def __getattr__(self, name):
+        if name == "execute":
+            return super().__getattr__(name)
+        return getattr(self._target, name)
+
+
+class GuardedRedis(_Guarded):
+    def pipeline(self, *args, **kwargs):
+        return GuardedPipeline(self._target.pipeline(*args, **kwargs), self._health)
+
+
+def _connect(decode_responses: bool) -> Redis:
+    return Redis(
+        host=os.getenv("REDIS_HOST", "redis-service"), # 수정
+        port=int(os.getenv("REDIS_PORT", "6379")),
+        decode_responses=decode_responses,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+        # 클라이언트 자체 재시도(백오프 포함 수 초)를 끄고 헬스 트래커로 빠르게 실패시킵니다.
+        retry=Retry(NoBackoff(), 0),
+    )
+
+
+redis = GuardedRedis(_connect(decode_responses=True), health)
+
+# 압축된 응답 등 바이너리 값을 저장할 때 사용 (decode_responses=False)
+redis_binary = GuardedRedis(_connect(decode_responses=False), health)
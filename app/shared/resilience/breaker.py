@@ -0,0 +1,173 @@
+import logging
+import os
+import time
+from collections import deque
+
+from redis.exceptions import RedisError
+
+from shared.metrics.registry import CIRCUIT_STATE, UPSTREAM_TIMEOUT
+from shared.redis import client as redis_client
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------
+# 외부 API 오퍼레이션별 서킷 브레이커
+# ----------------------------------------------
+# 상태는 Redis에 두어 여러 레플리카가 공유합니다.
+#   breaker:{name}:open      열림 시각. TTL(OPEN_SECONDS)이 지나면 반열림(half-open)으로 전환
+#   breaker:{name}:failures  첫 실패부터 FAILURE_WINDOW초 동안 모든 레플리카에서 합산한 실패 수
+#   breaker:{name}:probe     반열림 상태에서 복구 확인 요청을 보낼 레플리카 1개를 고르는 잠금
+# Redis에 접근할 수 없으면 프로세스 내부 상태만으로 동작합니다.
+#
+# 열림 조건은 "연속 실패"가 아니라 창(window) 안의 실패 수입니다. 닫힌 상태에서는 성공해도 실패 수를 줄이지 않으므로
+# 일부 요청만 실패하는 부분 장애에서도 열립니다. (성공마다 초기화하면 레플리카 중 하나만 성공해도 계속 닫혀 있음)
+# 창 안의 실패 수가 FAILURE_THRESHOLD 이상이면 열립니다. 레플리카 수와 호출량에 맞춰 조정하세요.
+
+FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "10"))
+FAILURE_WINDOW = int(os.getenv("BREAKER_FAILURE_WINDOW", "60"))      # 초
+OPEN_SECONDS = int(os.getenv("BREAKER_OPEN_SECONDS", "30"))          # 초
+
+# 타임아웃 = 관측 지연 p99 x 배수 (최소/최대 범위 안에서)
+TIMEOUT_PERCENTILE = float(os.getenv("BREAKER_TIMEOUT_PERCENTILE", "99"))
+TIMEOUT_MULTIPLIER = float(os.getenv("BREAKER_TIMEOUT_MULTIPLIER", "2.0"))
+MIN_TIMEOUT = float(os.getenv("BREAKER_MIN_TIMEOUT", "1.0"))
+MAX_TIMEOUT = float(os.getenv("BREAKER_MAX_TIMEOUT", "10.0"))
+DEFAULT_TIMEOUT = float(os.getenv("BREAKER_DEFAULT_TIMEOUT", "5.0"))  # 표본이 부족할 때
+MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+
+# KEYS[1]=실패 수, ARGV[1]=FAILURE_WINDOW
+# INCR와 EXPIRE를 한 번에 실행합니다. (따로 보내다 EXPIRE가 빠지면 실패 수가 만료되지 않아 브레이커가 계속 열림)
+# TTL이 없는 키(-1)도 다시 창 길이로 만료를 겁니다.
+RECORD_FAILURE_LUA = """
+local failures = redis.call('INCR', KEYS[1])
+if failures == 1 or redis.call('TTL', KEYS[1]) == -1 then
+    redis.call('EXPIRE', KEYS[1], tonumber(ARGV[1]))
+end
+return failures
+"""
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """브레이커가 열려 있어 외부 API 호출을 건너뛴 경우"""
+
+    def __init__(self, name: str):
+        super().__init__(f"서킷 브레이커 열림: {name}")
+        self.name = name
+
+
+class CircuitBreaker:
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self._timeout = DEFAULT_TIMEOUT
+        self._samples_since_update = 0
+        # Redis 장애 시 사용하는 로컬 상태 (FAILURE_WINDOW 안의 실패 시각)
+        self._local_failures = deque()
+        self._local_opened_at = None
+        self.state = CLOSED
+        self._set_state(CLOSED)
+
+    # ---------------- 상태 ----------------
+    def _key(self, suffix: str) -> str:
+        return f"breaker:{self.name}:{suffix}"
+
+    def _set_state(self, state: str):
+        if state != self.state:
+            logger.warning(f"서킷 브레이커 상태 변경: {self.name} {self.state} -> {state}")
+        self.state = state
+        CIRCUIT_STATE.labels(self.name).set(STATE_VALUES[state])
+
+    def before_call(self):
+        """호출 가능 여부 확인. 열려 있으면 CircuitOpenError를 발생시킵니다."""
+        redis = redis_client.redis
+        try:
+            if redis.exists(self._key("open")):
+                self._set_state(OPEN)
+                raise CircuitOpenError(self.name)
+            if self.state == CLOSED:
+                return
+            # 열림 TTL이 지났으면 반열림: 한 레플리카만 복구 확인 요청을 보냅니다.
+            if redis.set(self._key("probe"), "1", nx=True, ex=max(1, int(self.timeout()) + 1)):
+                self._set_state(HALF_OPEN)
+                return
+            raise CircuitOpenError(self.name)
+        except RedisError:
+            self._before_call_local()
+
+    def _before_call_local(self):
+        if self._local_opened_at is None:
+            return
+        if time.monotonic() - self._local_opened_at < OPEN_SECONDS:
+            self._set_state(OPEN)
+            raise CircuitOpenError(self.name)
+        # 반열림: 다음 실패 전까지 한 번 열어 둡니다.
+        self._local_opened_at = None
+        self._set_state(HALF_OPEN)
+
+    def record_success(self, latency: float = None):
+        if latency is not None:
+            self._observe(latency)
+        # 닫힌 상태에서는 실패 수를 그대로 둡니다. (창 안의 실패 수 기준)
+        if self.state == CLOSED:
+            return
+        self._local_failures.clear()
+        try:
+            redis_client.redis.delete(self._key("failures"), self._key("probe"))
+        except RedisError:
+            pass
+        self._set_state(CLOSED)
+
+    def record_failure(self):
+        now = time.monotonic()
+        self._local_failures.append(now)
+        while self._local_failures and now - self._local_failures[0] > FAILURE_WINDOW:
+            self._local_failures.popleft()
+        try:
+            redis = redis_client.redis
+            failures = int(redis.eval(RECORD_FAILURE_LUA, 1, self._key("failures"), FAILURE_WINDOW))
+            if self.state == HALF_OPEN or failures >= FAILURE_THRESHOLD:
+                redis.set(self._key("open"), int(time.time()), ex=OPEN_SECONDS)
+                redis.delete(self._key("failures"), self._key("probe"))
+                self._set_state(OPEN)
+        except RedisError:
+            if self.state == HALF_OPEN or len(self._local_failures) >= FAILURE_THRESHOLD:
+                self._local_opened_at = now
+                self._local_failures.clear()
+                self._set_state(OPEN)
+
+    # ---------------- 적응형 타임아웃 ----------------
+    def _observe(self, latency: float):
+        self.latencies.append(latency)
+        self._samples_since_update += 1
+        # 정렬 비용을 줄이기 위해 표본 10개마다 타임아웃을 다시 계산합니다.
+        if len(self.latencies) >= MIN_SAMPLES and self._samples_since_update >= 10:
+            self._samples_since_update = 0
+            self._timeout = min(MAX_TIMEOUT, max(MIN_TIMEOUT, self.percentile(TIMEOUT_PERCENTILE) * TIMEOUT_MULTIPLIER))
+            UPSTREAM_TIMEOUT.labels(self.name).set(self._timeout)
+
+    def percentile(self, pct: float):
+        """관측된 성공 지연의 백분위수(초). 표본이 부족하면 None"""
+        if len(self.latencies) < MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+        return ordered[index]
+
+    def timeout(self) -> float:
+        return self._timeout
+
+
+_breakers = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """이름별 브레이커 (프로세스 내 싱글턴)"""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = _breakers[name] = CircuitBreaker(name)
+        UPSTREAM_TIMEOUT.labels(name).set(breaker.timeout())
+    return breaker
@@ -0,0 +1,93 @@
+import sys
+import threading
+import time
+from typing import Optional
+
+# ----------------------------------------------
+# 시작 시간 측정: 모듈별 import 시간
+# ----------------------------------------------
+# 앱 모듈 맨 앞에서 install()하면 그 뒤에 처음 로드되는 모듈마다 실행(exec_module) 시간을 기록합니다.
+# (python -X importtime과 같은 기준: total은 하위 import 포함, self는 제외)
+# 준비 완료 시 finish()로 훅을 제거하므로 이후 요청 처리에는 영향이 없습니다.
+# 이 모듈은 측정 대상보다 먼저 import되므로 표준 라이브러리만 사용합니다.
+
+
+class _TimingFinder:
+    """다른 finder가 찾은 spec의 로더 인스턴스에 시간 측정을 덧씌우는 meta path finder"""
+
+    def __init__(self, timer: "ImportTimer"):
+        self.timer = timer
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        loader = spec.loader
+        # 내장/frozen 모듈은 로더가 클래스 자체(모든 모듈 공용)라 건드리지 않습니다.
+        if loader is not None and not isinstance(loader, type) and hasattr(loader, "exec_module"):
+            loader.exec_module = self.timer.wrap(fullname, loader.exec_module)
+        return spec
+
+
+class ImportTimer:
+    def __init__(self):
+        self.started: Optional[float] = None
+        self.imports = {}   # 모듈 -> (total 초, self 초)
+        self.phases = {}    # 단계 -> 초
+        self.stack = []     # 실행 중인 import별 하위 import 누적 시간
+        self.finder = _TimingFinder(self)
+        self.main_thread = threading.main_thread()
+
+    def install(self):
+        if self.started is not None:
+            return
+        self.started = time.perf_counter()
+        sys.meta_path.insert(0, self.finder)
+
+    def wrap(self, name: str, exec_module):
+        def timed_exec_module(module):
+            # 시작 중 import는 메인 스레드에서 일어납니다. 다른 스레드의 import는 측정하지 않습니다.
+            if threading.current_thread() is not self.main_thread:
+                return exec_module(module)
+            start = time.perf_counter()
+            self.stack.append(0.0)
+            try:
+                return exec_module(module)
+            finally:
+                elapsed = time.perf_counter() - start
+                children = self.stack.pop()
+                if self.stack:
+                    self.stack[-1] += elapsed
+                self.imports[name] = (elapsed, elapsed - children)
+        return timed_exec_module
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started if self.started is not None else 0.0
+
+    def mark(self, phase: str):
+        """install() 이후 지금까지를 한 단계로 기록합니다. (예: 앱 모듈 import 완료)"""
+        self.phases[phase] = self.elapsed()
+
+    def finish(self):
+        if self.finder in sys.meta_path:
+            sys.meta_path.remove(self.finder)
+
+    def top(self, limit: int = 20) -> list:
+        """self 시간이 긴 모듈 순서"""
+        ranked = sorted(self.imports.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return [
+            {"module": name, "self_ms": round(own * 1000, 1), "total_ms": round(total * 1000, 1)}
+            for name, (total, own) in ranked
+        ]
+
+
+import_timer = ImportTimer()
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import os
+import time
+
+from fastapi.responses import JSONResponse
+
+from shared.metrics.registry import READY, STARTUP_SECONDS
+from shared.redis.client import health
+from .imports import import_timer
+
+# ----------------------------------------------
+# 준비 상태 (/ready)
+# ----------------------------------------------
+# 시작 후 백그라운드에서 준비 단계(Redis 연결, 외부 API 연결 풀, 자주 조회되는 격자 캐시 채우기 등)를
+# 순서대로 실행하고, 모두 끝난 뒤에만 /ready가 200을 반환합니다. (그 전에는 503, readinessProbe용)
+#   필수 단계(retry=True: Redis, 외부 API 연결)  성공할 때까지 재시도하며 그동안 /ready는 503
+#   선택 단계(캐시 채우기 등)                     실패하면 degraded로 기록하고 다음 단계로 넘어감
+# READY_ALLOW_DEGRADED=true면 필수 단계도 READY_WAIT_SECONDS 안에 성공하지 못할 때 degraded로 기록하고 준비 완료로 넘어갑니다.
+# Redis/외부 API 장애 때문에 모든 레플리카가 트래픽을 받지 못하는 일이 없도록, 한 번 준비된 뒤에는
+# 장애가 나도 준비 상태를 유지합니다. (장애 대응은 캐시 계층의 폴백이 담당)
+
+READY_WAIT_SECONDS = float(os.getenv("READY_WAIT_SECONDS", "30"))  # 단계별 최대 대기 / 필수 단계 경고 간격 (초)
+READY_ALLOW_DEGRADED = os.getenv("READY_ALLOW_DEGRADED", "false").lower() == "true"
+READY_RETRY_SECONDS = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    def __init__(self, service: str):
+        self.service = service
+        self.ready = False
+        self.steps = {}      # 단계 -> {"ms", "ok"}
+        self.degraded = []   # 시간 안에 성공하지 못한 단계
+        self.waiting = None  # 재시도 중인 필수 단계
+        self.failed = False  # 준비 단계 실행 중 예외 (READY_ALLOW_DEGRADED가 아니면 준비 완료로 넘어가지 않음)
+        READY.labels(service).set(0)
+
+    async def step(self, name: str, check, retry: bool = False):
+        """
+        check()(코루틴 함수)를 실행하고 소요 시간을 기록합니다.
+        retry=True(필수 단계)면 성공할 때까지 다시 시도합니다.
+        (READY_ALLOW_DEGRADED=true일 때만 READY_WAIT_SECONDS가 지나면 포기)
+        """
+        start = time.perf_counter()
+        deadline = start + READY_WAIT_SECONDS
+        ok = False
+        if retry:
+            self.waiting = name
+        while True:
+            try:
+                await asyncio.wait_for(check(), timeout=max(0.1, deadline - time.perf_counter()))
+                ok = True
+                break
+            except Exception as e:
+                if not retry or (READY_ALLOW_DEGRADED and time.perf_counter() + READY_RETRY_SECONDS >= deadline):
+                    logger.warning(f"준비 단계 실패 ({name}): {e!r}")
+                    break
+                if time.perf_counter() + READY_RETRY_SECONDS >= deadline:
+                    # READY_WAIT_SECONDS마다 경고만 남기고 계속 재시도합니다. (그동안 /ready는 503)
+                    logger.warning(f"필수 준비 단계 재시도 중 ({name}, {time.perf_counter() - start:.0f}초): {e!r}")
+                    deadline = time.perf_counter() + READY_WAIT_SECONDS
+                await asyncio.sleep(READY_RETRY_SECONDS)
+
+        self.waiting = None
+        elapsed = time.perf_counter() - start
+        self.steps[name] = {"ms": round(elapsed * 1000, 1), "ok": ok}
+        if not ok:
+            self.degraded.append(name)
+        STARTUP_SECONDS.labels(self.service, name).set(elapsed)
+
+    async def run(self, warm_up):
+        try:
+            await warm_up(self)
+        except Exception:
+            logger.exception("준비 단계 실행 중 오류")
+            self.degraded.append("warm_up")
+            self.failed = True
+        finally:
+            import_timer.finish()
+            total = import_timer.elapsed()
+            for phase, seconds in import_timer.phases.items():
+                STARTUP_SECONDS.labels(self.service, phase).set(seconds)
+            STARTUP_SECONDS.labels(self.service, "total").set(total)
+            self.ready = READY_ALLOW_DEGRADED or not self.failed
+            READY.labels(self.service).set(1 if self.ready else 0)
+            logger.info("준비 완료" if self.ready else "준비 실패 (READY_ALLOW_DEGRADED=false)", extra={
+                "total_ms": round(total * 1000, 1),
+                "phases": {phase: round(seconds * 1000, 1) for phase, seconds in import_timer.phases.items()},
+                "steps": self.steps,
+                "degraded": self.degraded,
+                "slowest_imports": import_timer.top(10),
+            })
+
+    async def endpoint(self, verbose: bool = False):
+        """준비 완료 전 503. verbose=true면 모듈별 import 시간 포함"""
+        body = {
+            "ready": self.ready,
+            "steps": self.steps,
+            "degraded": self.degraded,
+            "waiting": self.waiting,
+            "redis": health.available,
+        }
+        if verbose:
+            body["phases"] = {phase: round(seconds * 1000, 1) for phase, seconds in import_timer.phases.items()}
+            body["imports"] = import_timer.top(50)
+        return JSONResponse(body, status_code=200 if self.ready else 503)
+
+
+def setup_readiness(app, service: str, warm_up):
+    """
+    /ready 엔드포인트를 등록하고, 시작 시 warm_up(readiness)을 백그라운드로 실행합니다.
+    warm_up 안에서 readiness.step(...)으로 준비 단계를 실행합니다.
+    """
+    import_timer.mark("imports")
+    readiness = Readiness(service)
+    app.state.readiness = readiness
+    app.add_api_route("/ready", readiness.endpoint, include_in_schema=False)
+
+    @app.on_event("startup")
+    async def start_warm_up():
+        app.state.warm_up_task = asyncio.create_task(readiness.run(warm_up))
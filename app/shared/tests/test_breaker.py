@@ -0,0 +1,150 @@
+import pytest
+
+from shared.resilience import breaker as breaker_module
+from shared.resilience.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+THRESHOLD = breaker_module.FAILURE_THRESHOLD
+
+
+def fail(breaker, times):
+    for _ in range(times):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def expire_open(fake_redis, name):
+    """열림 TTL(OPEN_SECONDS)이 지난 상태"""
+    fake_redis.delete(f"breaker:{name}:open")
+
+
+def test_opens_at_threshold():
+    breaker = CircuitBreaker("open-at-threshold")
+    fail(breaker, THRESHOLD - 1)
+    assert breaker.state == CLOSED
+
+    fail(breaker, 1)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_success_while_closed_keeps_window_count():
+    breaker = CircuitBreaker("partial-outage")
+    for _ in range(THRESHOLD - 1):
+        breaker.record_failure()
+        breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+
+def test_failures_summed_across_replicas(fake_redis):
+    first, second = CircuitBreaker("shared"), CircuitBreaker("shared")
+    fail(first, THRESHOLD // 2)
+    fail(second, THRESHOLD - THRESHOLD // 2)
+
+    assert second.state == OPEN
+    # 다른 레플리카도 Redis의 열림 키를 보고 호출을 막습니다.
+    with pytest.raises(CircuitOpenError):
+        first.before_call()
+    assert first.state == OPEN
+    assert 0 < fake_redis.ttl("breaker:shared:open") <= breaker_module.OPEN_SECONDS
+
+
+def test_failure_count_expires_with_window(fake_redis):
+    breaker = CircuitBreaker("failure-ttl")
+    breaker.record_failure()
+    breaker.record_failure()
+    assert fake_redis.get("breaker:failure-ttl:failures") == "2"
+    assert 0 < fake_redis.ttl("breaker:failure-ttl:failures") <= breaker_module.FAILURE_WINDOW
+
+
+def test_failure_count_without_ttl_repaired(fake_redis):
+    # 예전 INCR/EXPIRE 분리 호출에서 EXPIRE가 빠져 TTL 없이 남은 키
+    fake_redis.set("breaker:no-ttl:failures", 3)
+    CircuitBreaker("no-ttl").record_failure()
+    assert 0 < fake_redis.ttl("breaker:no-ttl:failures") <= breaker_module.FAILURE_WINDOW
+
+
+def test_half_open_lets_one_probe_through(fake_redis):
+    first, second = CircuitBreaker("probe"), CircuitBreaker("probe")
+    fail(first, THRESHOLD)
+    with pytest.raises(CircuitOpenError):
+        second.before_call()
+    expire_open(fake_redis, "probe")
+
+    first.before_call()
+    assert first.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        second.before_call()
+
+
+def test_half_open_success_closes(fake_redis):
+    breaker = CircuitBreaker("recover")
+    fail(breaker, THRESHOLD)
+    expire_open(fake_redis, "recover")
+
+    breaker.before_call()
+    breaker.record_success(0.1)
+
+    assert breaker.state == CLOSED
+    assert fake_redis.get("breaker:recover:failures") is None
+    assert fake_redis.get("breaker:recover:probe") is None
+    breaker.before_call()
+
+
+def test_half_open_failure_reopens(fake_redis):
+    breaker = CircuitBreaker("relapse")
+    fail(breaker, THRESHOLD)
+    expire_open(fake_redis, "relapse")
+
+    fail(breaker, 1)
+
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_local_state_when_redis_down(monkeypatch, redis_server):
+    redis_server.connected = False
+    clock = [1000.0]
+    monkeypatch.setattr(breaker_module.time, "monotonic", lambda: clock[0])
+
+    breaker = CircuitBreaker("redis-down")
+    fail(breaker, THRESHOLD)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock[0] += breaker_module.OPEN_SECONDS
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+
+
+def test_local_failures_outside_window_dropped(monkeypatch, redis_server):
+    redis_server.connected = False
+    clock = [1000.0]
+    monkeypatch.setattr(breaker_module.time, "monotonic", lambda: clock[0])
+
+    breaker = CircuitBreaker("redis-down-window")
+    fail(breaker, THRESHOLD - 1)
+    clock[0] += breaker_module.FAILURE_WINDOW + 1
+    fail(breaker, 1)
+
+    assert breaker.state == CLOSED
+
+
+def test_adaptive_timeout():
+    breaker = CircuitBreaker("timeout")
+    assert breaker.timeout() == breaker_module.DEFAULT_TIMEOUT
+
+    for _ in range(breaker_module.MIN_SAMPLES):
+        breaker.record_success(1.5)
+    assert breaker.timeout() == pytest.approx(1.5 * breaker_module.TIMEOUT_MULTIPLIER)
+
+    for _ in range(breaker_module.MIN_SAMPLES * 10):
+        breaker.record_success(0.01)
+    assert breaker.timeout() == breaker_module.MIN_TIMEOUT
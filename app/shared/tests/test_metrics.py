@@ -0,0 +1,50 @@
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from shared.metrics.registry import HTTP_OPEN_STREAMS, MetricsMiddleware
+
+SERVICE = "metrics-test"
+
+
+def make_app(seen: list) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, service=SERVICE)
+
+    @app.get("/plain")
+    async def plain():
+        return {"ok": True}
+
+    @app.get("/events")
+    async def events():
+        async def body():
+            # 스트림이 열려 있는 동안의 게이지 값
+            seen.append(HTTP_OPEN_STREAMS.labels(SERVICE, "/events")._value.get())
+            yield "data: 1\n\n"
+
+        return StreamingResponse(body(), media_type="text/event-stream")
+
+    return app
+
+
+def request_count(route: str):
+    return REGISTRY.get_sample_value("http_request_duration_seconds_count",
+                                     {"service": SERVICE, "route": route, "method": "GET", "status": "200"})
+
+
+def test_plain_request_observed():
+    client = TestClient(make_app([]))
+    before = request_count("/plain") or 0
+    assert client.get("/plain").status_code == 200
+    assert request_count("/plain") == before + 1
+
+
+def test_stream_counted_as_open_stream():
+    seen = []
+    client = TestClient(make_app(seen))
+    assert client.get("/events").text == "data: 1\n\n"
+
+    assert seen == [1]
+    assert HTTP_OPEN_STREAMS.labels(SERVICE, "/events")._value.get() == 0
+    assert request_count("/events") is None
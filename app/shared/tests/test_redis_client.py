@@ -0,0 +1,95 @@
+import fakeredis
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from shared.metrics.registry import REDIS_AVAILABLE
+from shared.redis import client as redis_client
+from shared.redis.client import CacheUnavailable, GuardedRedis, RedisHealth
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(redis_client.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def health(clock):
+    health = RedisHealth()
+    yield health
+    REDIS_AVAILABLE.set(1)
+
+
+@pytest.fixture
+def guarded(redis_server, health):
+    return GuardedRedis(fakeredis.FakeRedis(server=redis_server, decode_responses=True), health)
+
+
+def gauge() -> float:
+    return REDIS_AVAILABLE._value.get()
+
+
+def test_passes_calls_through(guarded, health):
+    guarded.set("key", "value")
+    assert guarded.get("key") == "value"
+    assert health.available
+
+
+def test_connection_error_trips(redis_server, guarded, health):
+    redis_server.connected = False
+    with pytest.raises(RedisConnectionError):
+        guarded.get("key")
+    assert not health.available
+    assert gauge() == 0
+
+
+def test_skips_redis_while_tripped(redis_server, guarded, health, clock):
+    redis_server.connected = False
+    with pytest.raises(RedisConnectionError):
+        guarded.get("key")
+    redis_server.connected = True
+
+    # 재연결 대기 중에는 Redis가 살아나도 호출하지 않고 바로 실패
+    clock[0] += redis_client.REDIS_RETRY_SECONDS - 0.1
+    with pytest.raises(CacheUnavailable):
+        guarded.set("key", "value")
+    assert redis_server.connected and guarded._target.get("key") is None
+
+
+def test_recovers_after_cool_down(redis_server, guarded, health, clock):
+    redis_server.connected = False
+    with pytest.raises(RedisConnectionError):
+        guarded.get("key")
+    redis_server.connected = True
+
+    clock[0] += redis_client.REDIS_RETRY_SECONDS
+    guarded.set("key", "value")
+    assert health.available
+    assert gauge() == 1
+    assert guarded.get("key") == "value"
+
+
+def test_still_down_after_cool_down_trips_again(redis_server, guarded, health, clock):
+    redis_server.connected = False
+    with pytest.raises(RedisConnectionError):
+        guarded.get("key")
+
+    clock[0] += redis_client.REDIS_RETRY_SECONDS
+    with pytest.raises(RedisConnectionError) as error:
+        guarded.get("key")
+    assert not isinstance(error.value, CacheUnavailable)
+    assert health.tripped_until == clock[0] + redis_client.REDIS_RETRY_SECONDS
+
+
+def test_pipeline_checked_on_execute(redis_server, guarded, health):
+    redis_server.connected = False
+    pipe = guarded.pipeline(transaction=False)
+    pipe.set("key", "value")  # 버퍼에만 쌓임
+    assert health.available
+    with pytest.raises(RedisConnectionError):
+        pipe.execute()
+    assert not health.available
+
+    with pytest.raises(CacheUnavailable):
+        guarded.pipeline().execute()
@@ -0,0 +1,136 @@
+import asyncio
+import os
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from fastapi import HTTPException
+
+from shared.metrics.registry import ADMISSION_INFLIGHT, ADMISSION_QUEUED, ADMISSION_SHED
+from . import ratelimit
+
+# ----------------------------------------------
+# 요청 수락 제어 (부하 차단)
+# ----------------------------------------------
+# CPU 한도가 작은 단일 워커에서 요청이 한꺼번에 밀리면 모두 함께 타임아웃됩니다.
+# 응답 캐시로 바로 처리할 수 있는 요청은 이 제어를 거치지 않고(우선 처리),
+# 외부 API 호출이 필요할 수 있는 요청만 라우트별 동시 처리 수/대기열/대기 시간을 제한합니다.
+# 수락하지 못한 요청은 외부 API를 호출하지 않는 캐시 전용 모드로 처리하고,
+# 그래도 줄 데이터가 없으면 바로 503 + Retry-After로 응답합니다.
+# 외부 API 호출 예산(ratelimit upstream)을 다 쓴 클라이언트의 요청도 캐시 전용 모드로 처리합니다. (없으면 429)
+
+ADMISSION_MAX_INFLIGHT = int(os.getenv("ADMISSION_MAX_INFLIGHT", "4"))      # 라우트별 동시 처리 수
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "16"))           # 라우트별 대기열 길이
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "1.0"))  # 대기 시간 한도 (초)
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "2"))         # 초
+
+# 라우트별 동시 처리 수 (지정하지 않으면 ADMISSION_MAX_INFLIGHT)
+ROUTE_LIMITS = {
+    "region": int(os.getenv("ADMISSION_MAX_INFLIGHT_REGION", "1")),  # 격자 수십 개를 채우는 무거운 요청
+}
+
+_cache_only = ContextVar("cache_only", default=False)
+
+
+@contextmanager
+def cache_only():
+    """이 블록 안의 조회는 외부 API를 호출하지 않고 캐시/만료된 복사본만 사용합니다."""
+    token = _cache_only.set(True)
+    try:
+        yield
+    finally:
+        _cache_only.reset(token)
+
+
+def is_cache_only() -> bool:
+    return _cache_only.get()
+
+
+class RouteGate:
+    """라우트 하나의 동시 처리 수 + FIFO 대기열"""
+
+    def __init__(self, route: str, limit: int, max_queue: int):
+        self.route = route
+        self.limit = limit
+        self.max_queue = max_queue
+        self.inflight = 0
+        self.waiters = deque()
+
+    async def acquire(self, timeout: float) -> bool:
+        """자리가 나면 True, 대기열이 가득 찼거나 대기 시간을 넘기면 False"""
+        if self.inflight < self.limit and not self.waiters:
+            self._enter()
+            return True
+        if len(self.waiters) >= self.max_queue:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        ADMISSION_QUEUED.labels(self.route).set(len(self.waiters))
+        try:
+            await asyncio.wait({waiter}, timeout=timeout)
+        except asyncio.CancelledError:
+            # 자리를 넘겨받은 직후 취소되면 다음 대기자에게 넘깁니다.
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if not waiter.done():
+                waiter.cancel()
+                self.waiters.remove(waiter)
+            ADMISSION_QUEUED.labels(self.route).set(len(self.waiters))
+        return not waiter.cancelled()
+
+    def release(self):
+        # 대기자가 있으면 자리를 그대로 넘깁니다.
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.inflight -= 1
+        ADMISSION_INFLIGHT.labels(self.route).set(self.inflight)
+
+    def _enter(self):
+        self.inflight += 1
+        ADMISSION_INFLIGHT.labels(self.route).set(self.inflight)
+
+
+_gates = {}
+
+
+def get_gate(route: str) -> RouteGate:
+    gate = _gates.get(route)
+    if gate is None:
+        gate = _gates[route] = RouteGate(route, ROUTE_LIMITS.get(route, ADMISSION_MAX_INFLIGHT), ADMISSION_MAX_QUEUE)
+    return gate
+
+
+async def admit(route: str, fetch, has_data=bool):
+    """
+    fetch()를 라우트 제한 안에서 실행합니다. (데이터, 부하 차단 여부)를 반환하며,
+    수락되지 않으면 캐시 전용 모드로 실행하고 그래도 데이터가 없으면(has_data가 거짓) 503을 던집니다.
+    클라이언트가 외부 API 호출 예산을 다 썼으면 라우트 제한 없이 캐시 전용 모드로 실행합니다. (데이터가 없으면 429)
+    """
+    if ratelimit.upstream_exhausted():
+        with cache_only():
+            data = await fetch()
+        if has_data(data):
+            return data, True
+        raise ratelimit.limited_error()
+
+    gate = get_gate(route)
+    if await gate.acquire(ADMISSION_QUEUE_TIMEOUT):
+        try:
+            return await fetch(), False
+        finally:
+            gate.release()
+
+    with cache_only():
+        data = await fetch()
+    if has_data(data):
+        ADMISSION_SHED.labels(route, "cache-only").inc()
+        return data, True
+    ADMISSION_SHED.labels(route, "rejected").inc()
+    raise HTTPException(status_code=503, detail="요청이 많아 잠시 후 다시 시도하세요",
+                        headers={"Retry-After": str(ADMISSION_RETRY_AFTER)})
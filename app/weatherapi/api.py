@@ -1,35 +1,225 @@
-from fastapi import APIRouter, HTTPException, Query
-from .service import get_current_data, get_hourly_forecast_data, get_weekly_forecast_data
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from .service import (
+    CURRENT_SECTIONS, FORECAST_FIELDS, REGION_MAX_CELLS, WEEK_FIELDS,
+    get_all_data, get_current_data, get_hourly_forecast_data, input_products, product_versions, response_max_age, seconds_until_update, view_window, get_region_cells, get_region_live, get_weekly_forecast_data,
+)
+from .admission import admit
+from .history import HISTORY_DAYS, HISTORY_HOURLY_DAYS, get_history
+from .compact import COMPACTORS, compact_region
+from .push import PUSH_PRODUCTS, parse_cells, stream_updates
+from .ratelimit import rate_limit
+from .render import (
+    cached_response, matching_etag, negotiate_encoding, not_modified, render_response, version_tag,
+    with_cache_headers,
+)
+from .timing import current_tree
 
-router = APIRouter()
+# 모든 날씨 라우트에 클라이언트별 요청 제한 적용
+router = APIRouter(dependencies=[Depends(rate_limit)])
+
+DEBUG_QUERY = Query(False, description="true이면 응답에 구간별 처리 시간(Span 트리)을 포함")
+FORMAT_QUERY = Query("full", pattern="^(full|compact)$",
+                     description="compact: 짧은 ASCII 키 + 숫자 코드 + 열 배열 (모바일용)")
+
+# route별 선택 가능한 필드
+ROUTE_FIELDS = {
+    "current": CURRENT_SECTIONS,
+    "forecast": tuple(FORECAST_FIELDS),
+    "week": tuple(WEEK_FIELDS),
+}
+
+def fields_query(route: str):
+    return Query(None, description=f"쉼표로 구분한 필드 목록 ({', '.join(ROUTE_FIELDS[route])}). 생략하면 전체")
+
+# fields 파라미터 파싱: 알 수 없는 필드는 422, 전체를 요청하면 None
+def parse_fields(route: str, fields: Optional[str]):
+    if fields is None:
+        return None
+    allowed = ROUTE_FIELDS[route]
+    selected = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = selected - set(allowed)
+    if unknown or not selected:
+        raise HTTPException(status_code=422, detail=f"fields는 {', '.join(allowed)} 중에서 선택하세요: {fields}")
+    if selected == set(allowed):
+        return None
+    return tuple(field for field in allowed if field in selected)
+
+# 부하 차단으로 캐시만 사용한 응답 표시
+def shed_response(response):
+    response.headers["X-Load-Shed"] = "cache-only"
+    return response
+
+# 응답 생성: ETag(입력 자료 버전 + 본문 시각 구간) 비교 -> 응답 캐시(압축본 포함) 확인 -> 데이터 조회 -> 직렬화/압축 -> 응답 캐시 저장
+async def weather_response(request: Request, route: str, nx: int, ny: int, fetch, fmt: str, debug: bool,
+                           fields: Optional[str] = None):
+    selected = parse_fields(route, fields)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    cache_key = f"resp:{route}:{nx}:{ny}:{fmt}:{','.join(selected) if selected else 'all'}"
+    products = input_products(route, nx, ny, selected)
+    product_keys = [key for key, _ in products]
+    now = datetime.now()
+    window, _ = view_window(route, now)
+
+    if not debug:
+        # 입력 자료가 모두 캐시에 있으면 버전 태그로 304 / 응답 캐시 확인
+        versions = product_versions(product_keys)
+        if versions is not None:
+            tag = version_tag(cache_key, versions, window)
+            max_age = response_max_age(route, products, now)
+            matched = matching_etag(request.headers.get("if-none-match", ""), tag)
+            if matched is not None:
+                return not_modified(matched, max_age)
+            cached = cached_response(f"{cache_key}:{tag}", encoding)
+            if cached is not None:
+                return with_cache_headers(cached, tag, max_age)
+
+    # 요청한 필드에 필요한 외부 API만 조회합니다. (응답 캐시 미스만 수락 제어를 거침)
+    parsed_data, shed = await admit(route, lambda: fetch(nx, ny, selected))
+
+    if fmt == "compact":
+        content = COMPACTORS[route](nx, ny, parsed_data)
+    else:
+        content = {
+            "위치좌표": {"nx": nx, "ny": ny},
+            "날씨": parsed_data
+        }
+
+    if debug:
+        content["timing"] = current_tree()
+        return with_cache_headers(render_response(content, encoding), None, None)
+
+    # 외부 API 실패로 비어 있는 응답이나 부하 차단 중 캐시로만 만든 응답은 캐시하지 않습니다.
+    if shed:
+        return with_cache_headers(shed_response(render_response(content, encoding)), None, None)
+    # 만료된 복사본으로 응답한 자료가 있으면 버전이 없어 ETag 없이 no-store로 응답합니다.
+    # 조회 중에 시각 구간(정시/자정)이 바뀌었으면 본문이 어느 구간 것인지 알 수 없어 캐시하지 않습니다.
+    versions = product_versions(product_keys) if parsed_data else None
+    now = datetime.now()
+    if versions is None or view_window(route, now)[0] != window:
+        return with_cache_headers(render_response(content, encoding), None, None)
+    tag = version_tag(cache_key, versions, window)
+    response = render_response(content, encoding, f"{cache_key}:{tag}")
+    return with_cache_headers(response, tag, response_max_age(route, products, now))
 
 @router.get("/current", summary="현재 날씨 및 상세 날씨 조회", tags=["날씨"])
 async def get_current_weather(
+    request: Request,
     nx: int = Query(60, description="예보지점 X 좌표"),
-    ny: int = Query(127, description="예보지점 Y 좌표")
+    ny: int = Query(127, description="예보지점 Y 좌표"),
+    format: str = FORMAT_QUERY,
+    fields: Optional[str] = fields_query("current"),
+    debug: bool = DEBUG_QUERY
 ):
-    parsed_data = await get_current_data(nx, ny)
-    return {
-        "위치좌표": {"nx": nx, "ny": ny},
-        "날씨": parsed_data
-    }
+    return await weather_response(request, "current", nx, ny, get_current_data, format, debug, fields)
 @router.get("/forecast", summary="시간별 날씨 조회", tags=["날씨"])
 async def get_forecast_weather(
+    request: Request,
     nx: int = Query(60, description="예보지점 X 좌표"),
-    ny: int = Query(127, description="예보지점 Y 좌표")
+    ny: int = Query(127, description="예보지점 Y 좌표"),
+    format: str = FORMAT_QUERY,
+    fields: Optional[str] = fields_query("forecast"),
+    debug: bool = DEBUG_QUERY
 ):
-    parsed_data = await get_hourly_forecast_data(nx, ny)
-    return {
-        "위치좌표": {"nx": nx, "ny": ny},
-        "날씨": parsed_data
-    }
+    return await weather_response(request, "forecast", nx, ny, get_hourly_forecast_data, format, debug, fields)
 @router.get("/week", summary="주간 날씨 조회", tags=["날씨"])
 async def get_forecast_weather(
+    request: Request,
+    nx: int = Query(60, description="예보지점 X 좌표"),
+    ny: int = Query(127, description="예보지점 Y 좌표"),
+    format: str = FORMAT_QUERY,
+    fields: Optional[str] = fields_query("week"),
+    debug: bool = DEBUG_QUERY
+):
+    return await weather_response(request, "week", nx, ny, get_weekly_forecast_data, format, debug, fields)
+@router.get("/all", summary="현재 + 시간별 + 주간 날씨 한 번에 조회", tags=["날씨"])
+async def get_all_weather(
+    request: Request,
+    nx: int = Query(60, description="예보지점 X 좌표"),
+    ny: int = Query(127, description="예보지점 Y 좌표"),
+    format: str = FORMAT_QUERY,
+    debug: bool = DEBUG_QUERY
+):
+    return await weather_response(request, "all", nx, ny, get_all_data, format, debug)
+@router.get("/region", summary="지역 일괄 현재 날씨 조회 (지도용)", tags=["날씨"])
+async def get_region_weather(
+    request: Request,
+    land: Optional[str] = Query(None, pattern="^[0-9A-Z]{8}$", description="중기 육상예보 구역 코드 (예: 11B00000)"),
+    bbox: Optional[str] = Query(None, description="격자 범위 nx_min,ny_min,nx_max,ny_max"),
+    debug: bool = DEBUG_QUERY
+):
+    if (land is None) == (bbox is None):
+        raise HTTPException(status_code=422, detail="land 또는 bbox 중 하나를 지정하세요")
+    box = None
+    if bbox is not None:
+        try:
+            box = tuple(int(v) for v in bbox.split(","))
+        except ValueError:
+            box = ()
+        if len(box) != 4 or box[0] > box[2] or box[1] > box[3]:
+            raise HTTPException(status_code=422, detail=f"bbox 형식 오류: {bbox}")
+
+    cells = get_region_cells(land=land, bbox=box)
+    if len(cells) > REGION_MAX_CELLS:
+        raise HTTPException(status_code=422, detail=f"격자가 너무 많습니다 ({len(cells)}개, 최대 {REGION_MAX_CELLS}개)")
+
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    cache_key = f"resp:region:{land or bbox}"
+    if not debug:
+        cached = cached_response(cache_key, encoding)
+        if cached is not None:
+            return with_cache_headers(cached, None, seconds_until_update([(None, "live")]))
+
+    results, shed = await admit("region", lambda: get_region_live(cells),
+                                has_data=lambda rows: any(row is not None for row in rows))
+    missing = sum(1 for data in results if data is None)
+    content = {"region": {"land": land, "bbox": box}, "count": len(cells), "missing": missing,
+               **compact_region(cells, results)}
+
+    if debug:
+        content["timing"] = current_tree()
+        return with_cache_headers(render_response(content, encoding), None, None)
+    if shed:
+        return with_cache_headers(shed_response(render_response(content, encoding)), None, None)
+    # 비어 있는 격자가 있으면 다음 요청에서 마저 채우도록 응답 캐시에 저장하지 않습니다.
+    if missing:
+        return with_cache_headers(render_response(content, encoding), None, None)
+    return with_cache_headers(render_response(content, encoding, cache_key), None,
+                              seconds_until_update([(None, "live")]))
+
+@router.get("/history", summary="관측 이력 조회 (시간별/일별, 어제 대비)", tags=["날씨"])
+async def get_weather_history(
+    request: Request,
     nx: int = Query(60, description="예보지점 X 좌표"),
-    ny: int = Query(127, description="예보지점 Y 좌표")
+    ny: int = Query(127, description="예보지점 Y 좌표"),
+    hours: int = Query(24, ge=1, le=HISTORY_HOURLY_DAYS * 24, description="시간별 관측 범위 (시간)"),
+    days: int = Query(7, ge=0, le=HISTORY_DAYS, description="일별 요약 범위 (일, 오늘 포함)"),
 ):
-    parsed_data = await get_weekly_forecast_data(nx, ny)
-    return {
-        "위치좌표": {"nx": nx, "ny": ny},
-        "날씨": parsed_data
-    }
\ No newline at end of file
+    # 이미 받아 둔 실황만 사용합니다. (외부 API를 호출하지 않으므로 수락 제어를 거치지 않음)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    content = {"위치좌표": {"nx": nx, "ny": ny}, **get_history(nx, ny, hours, days)}
+    return with_cache_headers(render_response(content, encoding), None, seconds_until_update([(None, "live")]))
+
+@router.get("/stream", summary="새 발표 푸시 구독 (SSE)", tags=["날씨"])
+async def stream_weather(
+    request: Request,
+    cells: str = Query("60,127", description="구독할 격자 목록 (nx,ny;nx,ny;...)"),
+    products: str = Query(",".join(PUSH_PRODUCTS.values()),
+                          description=f"받을 자료 ({', '.join(PUSH_PRODUCTS.values())})"),
+):
+    try:
+        cell_list = parse_cells(cells)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"cells 형식 오류: {e}")
+    selected = tuple(p.strip() for p in products.split(",") if p.strip())
+    if not selected or set(selected) - set(PUSH_PRODUCTS.values()):
+        raise HTTPException(status_code=422, detail=f"products는 {', '.join(PUSH_PRODUCTS.values())} 중에서 선택하세요")
+
+    return StreamingResponse(
+        stream_updates(request.is_disconnected, cell_list, selected),
+        media_type="text/event-stream",
+        # 프록시(nginx/cloudflared) 버퍼링 없이 바로 전달
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
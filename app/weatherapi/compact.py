@@ -0,0 +1,164 @@
+# ----------------------------------------------
+# format=compact 응답 (모바일용)
+# ----------------------------------------------
+# 한글 키 대신 짧은 ASCII 키, 번역된 문자열 대신 숫자 코드를 사용하고
+# 시간별/주간 목록은 행 배열 대신 열(column) 배열로 보냅니다.
+#
+# 코드표
+#   sky : 1 맑음, 3 구름많음, 4 흐림 (기상청 SKY 코드), 0 정보없음
+#   pty : 0 없음, 1 비, 2 비/눈, 3 눈, 4 소나기, 5 빗방울, 6 빗방울눈날림, 7 눈날림 (기상청 PTY 코드)
+#   air : 1 좋음, 2 보통, 3 나쁨, 4 매우나쁨, 0 정보없음
+#   wf  : 하늘(sky) x 10 + 강수(pty). 예) 31 "구름많고 비", 43 "흐리고 눈", 10 "맑음" (주간 예보)
+# 코드표에 없는 값은 원래 문자열을 그대로 보냅니다.
+
+SKY_CODES = {"맑음": 1, "구름많음": 3, "흐림": 4, "정보없음": 0}
+PTY_CODES = {"없음": 0, "비": 1, "비/눈": 2, "눈": 3, "소나기": 4, "빗방울": 5, "빗방울눈날림": 6, "눈날림": 7}
+AIR_CODES = {"좋음": 1, "보통": 2, "나쁨": 3, "매우나쁨": 4, "정보없음": 0}
+
+# 중기예보 하늘상태 문자열 ("구름많고 비" 등)
+WF_SKY_PREFIX = (("맑", 1), ("구름많", 3), ("흐", 4))
+WF_PTY_SUFFIX = (("비/눈", 2), ("빗방울", 5), ("소나기", 4), ("비", 1), ("눈", 3))
+
+# /current 키 매핑
+CURRENT_KEYS = {
+    "기온(°C)": "t",
+    "습도(%)": "reh",
+    "1시간 강수량(mm)": "rn1",
+    "강수형태": "pty",
+    "풍속(m/s)": "wsd",
+    "풍향(deg)": "vec",
+    "일 최저기온(°C)": "tmn",
+    "일 최고기온(°C)": "tmx",
+    "하늘상태": "sky",
+    "미세먼지": "pm10",
+    "초미세먼지": "pm25",
+    "미세먼지농도": "pm10v",
+    "초미세먼지농도": "pm25v",
+    "측정시간": "at",
+}
+CURRENT_CODES = {"pty": PTY_CODES, "sky": SKY_CODES, "pm10": AIR_CODES, "pm25": AIR_CODES}
+
+
+def _code(table: dict, value):
+    return table.get(value, value)
+
+
+def _number(value):
+    # "73", "-" 같은 문자열 수치는 숫자 또는 None으로
+    if isinstance(value, (int, float)) or value is None:
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _rain(value):
+    # 강수량: 숫자는 그대로, "-"/"강수없음"은 0, "1mm 미만"/"약한 비" 등 구간 표현은 문자열 유지
+    if isinstance(value, (int, float)):
+        return value
+    if value in ("-", "강수없음", "없음", None):
+        return 0
+    return value
+
+
+def wf_code(value):
+    """중기예보 하늘상태 문자열 -> sky x 10 + pty 코드"""
+    if not isinstance(value, str):
+        return 0 if value is None else value
+    sky = next((code for prefix, code in WF_SKY_PREFIX if value.startswith(prefix)), None)
+    if sky is None:
+        return value
+    rest = value.replace("구름많", "").replace("흐리", "")
+    pty = next((code for suffix, code in WF_PTY_SUFFIX if suffix in rest), 0)
+    return sky * 10 + pty
+
+
+def compact_current(nx: int, ny: int, data: dict) -> dict:
+    w = {}
+    for label, value in data.items():
+        key = CURRENT_KEYS.get(label)
+        if key is None:
+            continue
+        if key in CURRENT_CODES:
+            value = _code(CURRENT_CODES[key], value)
+        elif key in ("pm10v", "pm25v"):
+            value = _number(value)
+        w[key] = value
+    return {"p": [nx, ny], "w": w}
+
+
+# 열 매핑: (응답 항목 키, compact 키, 변환 함수)
+# fields로 일부 필드만 요청한 경우 항목에 있는 키의 열만 보냅니다.
+HOURLY_COLUMNS = (
+    ("temp", "t", None),
+    ("sky", "sky", lambda v: _code(SKY_CODES, v)),
+    ("pty", "pty", lambda v: _code(PTY_CODES, v)),
+    ("rain_amount", "rn", _rain),
+    ("pop", "pop", None),
+)
+WEEKLY_COLUMNS = (
+    ("min_temp", "min", None),
+    ("max_temp", "max", None),
+    ("sky_am", "am", wf_code),
+    ("sky_pm", "pm", wf_code),
+    ("pop", "pop", None),
+)
+
+
+def _columns(items: list, columns: tuple) -> dict:
+    present = items[0].keys() if items else [key for key, _, _ in columns]
+    w = {}
+    for key, short, convert in columns:
+        if key not in present:
+            continue
+        w[short] = [item[key] if convert is None else convert(item[key]) for item in items]
+    return w
+
+
+def compact_hourly(nx: int, ny: int, items: list) -> dict:
+    # YYYYMMDDHH 정수
+    w = {"ts": [int(item["date"] + item["time"][:2]) for item in items]}
+    w.update(_columns(items, HOURLY_COLUMNS))
+    return {"p": [nx, ny], "w": w}
+
+
+def compact_weekly(nx: int, ny: int, items: list) -> dict:
+    w = {"d": [int(item["date"]) for item in items]}
+    w.update(_columns(items, WEEKLY_COLUMNS))
+    return {"p": [nx, ny], "w": w}
+
+
+# /region: 격자별 초단기실황을 열 배열로 (조회하지 못한 격자는 null)
+REGION_KEYS = ("t", "reh", "rn1", "pty", "wsd", "vec")
+
+
+def compact_region(cells: list, results: list) -> dict:
+    w = {key: [] for key in REGION_KEYS}
+    for data in results:
+        row = compact_current(0, 0, data or {})["w"]
+        for key in REGION_KEYS:
+            w[key].append(row.get(key))
+    return {
+        "nx": [nx for nx, _, _ in cells],
+        "ny": [ny for _, ny, _ in cells],
+        "desc": [info["desc"] for _, _, info in cells],
+        "w": w,
+    }
+
+
+def compact_all(nx: int, ny: int, data: dict) -> dict:
+    return {
+        "p": [nx, ny],
+        "current": compact_current(nx, ny, data.get("current", {}))["w"],
+        "forecast": compact_hourly(nx, ny, data.get("forecast", []))["w"],
+        "week": compact_weekly(nx, ny, data.get("week", []))["w"],
+    }
+
+
+COMPACTORS = {
+    "current": compact_current,
+    "forecast": compact_hourly,
+    "week": compact_weekly,
+    "all": compact_all,
+}
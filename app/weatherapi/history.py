@@ -0,0 +1,138 @@
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from redis.exceptions import RedisError
+
+from shared.redis import client as redis_client
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------
+# 관측 이력 (초단기실황 시계열, 외부 API 추가 호출 없음)
+# ----------------------------------------------
+# get_live_weather가 외부 API에서 새로 받은 실황만 격자별로 쌓아 두고, /history가 이것만으로 응답합니다.
+#   hist:hourly:{nx}:{ny}  ZSET (score=관측 시각 epoch, member={"time","T1H",...}) 최근 HISTORY_HOURLY_DAYS일
+#   hist:daily:{nx}:{ny}   ZSET (score=날짜 0시 epoch, member=일별 요약) 최근 HISTORY_DAYS일
+# 같은 관측 시각을 다시 받으면 덮어쓰고, 보관 기간이 지난 항목은 추가할 때 잘라냅니다. (격자별 크기 고정)
+# 일별 요약(최저/최고/평균 기온, 평균 습도, 강수량 합계)은 그날 쌓인 시간별 관측만으로 계산하며,
+# count가 그날 관측된 시간 수입니다. 아무도 조회하지 않은 격자/시간은 비어 있습니다.
+
+HISTORY_HOURLY_DAYS = int(os.getenv("HISTORY_HOURLY_DAYS", "3"))
+HISTORY_DAYS = int(os.getenv("HISTORY_DAYS", "30"))
+# 저장하는 초단기실황 항목: 기온, 습도, 1시간 강수량, 강수형태 코드, 풍속, 풍향
+HISTORY_CATEGORIES = ("T1H", "REH", "RN1", "PTY", "WSD", "VEC")
+
+DAY_SECONDS = 24 * 60 * 60
+
+
+def observation(data: dict) -> dict:
+    """초단기실황 응답에서 저장할 항목만 숫자로 꺼냅니다."""
+    try:
+        items = data["response"]["body"]["items"]["item"]
+    except (KeyError, TypeError):
+        return {}
+    values = {}
+    for item in items:
+        category = item.get("category")
+        if category not in HISTORY_CATEGORIES:
+            continue
+        try:
+            values[category] = float(item["obsrValue"])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return values
+
+
+def downsample(date: str, entries: list) -> dict:
+    """하루치 시간별 관측 -> 일별 요약"""
+    summary = {"date": date, "count": len(entries)}
+    temps = [entry["T1H"] for entry in entries if "T1H" in entry]
+    if temps:
+        summary["T1H_min"] = min(temps)
+        summary["T1H_max"] = max(temps)
+        summary["T1H_mean"] = round(sum(temps) / len(temps), 1)
+    humidity = [entry["REH"] for entry in entries if "REH" in entry]
+    if humidity:
+        summary["REH_mean"] = round(sum(humidity) / len(humidity), 1)
+    rain = [entry["RN1"] for entry in entries if "RN1" in entry]
+    if rain:
+        summary["RN1_sum"] = round(sum(rain), 1)
+    return summary
+
+
+def append(nx: int, ny: int, base_date: str, base_time: str, data: dict):
+    """외부 API에서 받은 초단기실황 한 건을 시간별 이력에 추가하고 그날 일별 요약을 갱신합니다."""
+    values = observation(data)
+    if not values:
+        return
+    observed = datetime.strptime(base_date + base_time, "%Y%m%d%H%M")
+    score = int(observed.timestamp())
+    day = int(observed.replace(hour=0, minute=0).timestamp())
+    now = time.time()
+    hourly_key = f"hist:hourly:{nx}:{ny}"
+    daily_key = f"hist:daily:{nx}:{ny}"
+
+    try:
+        pipe = redis_client.redis.pipeline(transaction=True)
+        pipe.zremrangebyscore(hourly_key, score, score)
+        pipe.zadd(hourly_key, {json.dumps({"time": base_date + base_time, **values}, separators=(",", ":")): score})
+        pipe.zremrangebyscore(hourly_key, "-inf", f"({now - HISTORY_HOURLY_DAYS * DAY_SECONDS}")
+        pipe.expire(hourly_key, HISTORY_HOURLY_DAYS * DAY_SECONDS)
+        pipe.zrangebyscore(hourly_key, day, day + DAY_SECONDS - 1)
+        entries = [json.loads(value) for value in pipe.execute()[-1]]
+
+        summary = downsample(base_date, entries)
+        pipe = redis_client.redis.pipeline(transaction=True)
+        pipe.zremrangebyscore(daily_key, day, day)
+        pipe.zadd(daily_key, {json.dumps(summary, separators=(",", ":")): day})
+        pipe.zremrangebyscore(daily_key, "-inf", f"({now - HISTORY_DAYS * DAY_SECONDS}")
+        pipe.expire(daily_key, HISTORY_DAYS * DAY_SECONDS)
+        pipe.execute()
+    except (RedisError, json.JSONDecodeError) as e:
+        logger.warning(f"관측 이력 저장 실패 ({nx},{ny} {base_date}{base_time}): {e}")
+
+
+def get_history(nx: int, ny: int, hours: int, days: int, now: datetime = None) -> dict:
+    """
+    최근 hours시간의 시간별 관측, 최근 days일의 일별 요약,
+    가장 최근 관측과 24시간 전 같은 시각 관측의 차이(vs_yesterday, 둘 중 하나라도 없으면 None)
+    """
+    now = now or datetime.now()
+    now_ts = now.timestamp()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    # 어제 같은 시각과 비교하려면 최소 25시간 범위가 필요합니다.
+    since = now_ts - max(hours, 25) * 3600
+
+    try:
+        pipe = redis_client.redis.pipeline(transaction=False)
+        pipe.zrangebyscore(f"hist:hourly:{nx}:{ny}", since, "+inf", withscores=True)
+        pipe.zrangebyscore(f"hist:daily:{nx}:{ny}", (today - timedelta(days=max(days - 1, 0))).timestamp(), "+inf")
+        hourly, daily = pipe.execute()
+    except RedisError as e:
+        raise HTTPException(status_code=503, detail=f"관측 이력 저장소를 사용할 수 없습니다: {e}")
+
+    by_time = {int(score): json.loads(value) for value, score in hourly}
+    vs_yesterday = None
+    if by_time:
+        latest = max(by_time)
+        previous = by_time.get(latest - DAY_SECONDS)
+        if previous is not None:
+            vs_yesterday = {
+                "time": by_time[latest]["time"],
+                **{
+                    category: round(by_time[latest][category] - previous[category], 1)
+                    for category in ("T1H", "REH", "RN1", "WSD")
+                    if category in by_time[latest] and category in previous
+                },
+            }
+
+    cutoff = now_ts - hours * 3600
+    return {
+        "hourly": [entry for score, entry in sorted(by_time.items()) if score >= cutoff],
+        "daily": [json.loads(value) for value in daily] if days else [],
+        "vs_yesterday": vs_yesterday,
+    }
@@ -0,0 +1,38 @@
+import os
+import time
+from collections import OrderedDict
+
+# ----------------------------------------------
+# 프로세스 내 캐시 (Redis 장애 시 대체)
+# ----------------------------------------------
+# Redis 헬스 트래커가 장애를 감지한 동안 get_cached/set_cached가 대신 사용합니다.
+# 항목 수를 LOCAL_CACHE_SIZE로 제한하고 가장 오래 쓰지 않은 항목부터 버립니다(LRU).
+# 파싱된 객체를 그대로 보관하므로 꺼낸 값을 수정하지 않아야 합니다.
+
+LOCAL_CACHE_SIZE = int(os.getenv("LOCAL_CACHE_SIZE", "256"))
+
+
+class LocalCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (만료 시각, 값)
+
+    def get(self, key: str):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if time.monotonic() >= expires:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value, expire: int):
+        self.entries[key] = (time.monotonic() + expire, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+local_cache = LocalCache(LOCAL_CACHE_SIZE)
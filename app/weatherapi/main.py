@@ -1,3 +1,7 @@
+# 시작 시간 측정: 이후 처음 로드되는 모듈별 import 시간을 기록 (가장 먼저 실행, /ready?verbose=true)
+from shared.startup.imports import import_timer
+import_timer.install()
+
 from fastapi import FastAPI
 from dotenv import load_dotenv
 import os
@@ -5,7 +9,18 @@ import os
 env_path = os.path.join(os.path.dirname(__file__), '.env')
 load_dotenv(dotenv_path=env_path)
 
+# 큐 기반 JSON 로깅 (요청 경로에서는 큐에 넣기만 함)
+from shared.logs.structured import setup_logging
+setup_logging(service="weatherapi")
+
+from shared.metrics.registry import setup_metrics
+from shared.profiling.hooks import setup_profiling
+from shared.startup.readiness import setup_readiness
 from .api import router as weather_router
+from .readiness import warm_up
+from .refresh import setup_refresh
+from .service import close_clients
+from .timing import ServerTimingMiddleware
 
 app = FastAPI(
     title="날씨 앱 API",
@@ -13,12 +28,29 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# /metrics 엔드포인트 + 요청/외부 API/캐시/이벤트 루프 메트릭
+setup_metrics(app, service="weatherapi")
+# 응답마다 Server-Timing 헤더(구간별 처리 시간, 캐시 hit/miss) 추가
+app.add_middleware(ServerTimingMiddleware)
+# PROFILING_TOKEN이 있을 때만 /debug/profile + 요청 단위 CPU 프로파일 (X-Profile: cpu)
+setup_profiling(app)
+
 app.include_router(
     weather_router,
     prefix="/api/weather",
     tags=["날씨"]
 )
 
+# /ready: Redis, 외부 API 연결 풀, WARM_CELLS 캐시가 준비된 뒤에만 200 (readinessProbe)
+setup_readiness(app, service="weatherapi", warm_up=warm_up)
+
+# /stream 구독 격자를 발표 시각마다 백그라운드 쿼터로 갱신 (사용자 요청 없이도 새 발표 푸시)
+setup_refresh(app)
+
+@app.on_event("shutdown")
+async def shutdown_clients():
+    await close_clients()
+
 @app.get("/", tags=["Root"])
 def read_root():
     return {"message": "서버가 실행 중입니다."}# Re-trigger build for arm64
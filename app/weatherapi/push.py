@@ -0,0 +1,223 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from shared.redis import client as redis_client
+
+# ----------------------------------------------
+# 새 발표(base_time) 푸시 (Server-Sent Events)
+# ----------------------------------------------
+# 기상청 자료는 발표 시각(초단기 매시 40/45분, 단기 1일 8회)에만 바뀌므로
+# 클라이언트가 /current, /forecast를 주기적으로 조회하는 대신 /stream을 구독하면
+# 구독한 격자의 새 발표가 캐시에 저장될 때만 변경분을 받습니다.
+#
+#   fetch_with_cache -> notify_cached(): pushbase:{캐시 키}에 기록한 base_date+base_time이 바뀌면
+#                       PUBLISH weather:updates {"product", "nx", "ny", "base", "key"}
+#   레플리카마다 구독 스레드 1개 -> 로컬 구독자가 있는 격자만 캐시를 읽어 SSE 연결별 큐로 전달
+
+PUSH_CHANNEL = os.getenv("PUSH_CHANNEL", "weather:updates")
+PUSH_BASE_EXPIRE = 24 * 60 * 60  # 1일
+PUSH_HEARTBEAT_SECONDS = int(os.getenv("PUSH_HEARTBEAT_SECONDS", "15"))
+PUSH_MAX_CELLS = int(os.getenv("PUSH_MAX_CELLS", "20"))
+PUSH_QUEUE_SIZE = 100
+PUSH_RECONNECT_SECONDS = 1
+
+# 캐시 키 접두어 -> 이벤트 이름 (발표 시각이 있는 기상청 자료만)
+PUSH_PRODUCTS = {
+    "weather": "live",            # 초단기실황
+    "weather:sky": "sky",         # 초단기예보 하늘상태
+    "forecast:ultra": "ultra",    # 초단기예보 (시간별)
+    "forecast:short": "short",    # 단기예보 (시간별/주간)
+    "forecast": "daily",          # 일 최저/최고기온
+}
+PRODUCT_KEYS = {product: prefix for prefix, product in PUSH_PRODUCTS.items()}
+
+
+def notify_cached(cache_key: str, params: dict):
+    """캐시에 저장한 자료의 발표 시각이 이전과 다르면 업데이트 채널에 알림"""
+    prefix, _, _ = cache_key.rsplit(":", 2)
+    product = PUSH_PRODUCTS.get(prefix)
+    if product is None or "base_time" not in params:
+        return
+    base = f"{params['base_date']}{params['base_time']}"
+    try:
+        previous = redis_client.redis.set(f"pushbase:{cache_key}", base, ex=PUSH_BASE_EXPIRE, get=True)
+        if previous == base:
+            return
+        redis_client.redis.publish(PUSH_CHANNEL, json.dumps({
+            "product": product,
+            "nx": int(params["nx"]),
+            "ny": int(params["ny"]),
+            "base": base,
+            "key": cache_key,
+        }))
+    except RedisError as e:
+        logging.warning(f"업데이트 알림 실패 ({cache_key}): {e}")
+
+
+def is_current(cache_key: str, params: dict) -> bool:
+    """캐시에 있는 자료가 params의 발표 시각 것인지 (마지막으로 알린 발표 시각 기준, 모르면 False)"""
+    try:
+        return redis_client.redis.get(f"pushbase:{cache_key}") == f"{params['base_date']}{params['base_time']}"
+    except (RedisError, KeyError):
+        return False
+
+
+def diff(previous: Optional[dict], current: dict) -> dict:
+    """최상위 키 기준 변경분 (이전 값이 없으면 전체)"""
+    if previous is None:
+        return {"full": current}
+    changed = {k: v for k, v in current.items() if previous.get(k) != v}
+    removed = [k for k in previous if k not in current]
+    return {"changed": changed, "removed": removed}
+
+
+class UpdateHub:
+    """
+    프로세스당 하나. Redis pub/sub 구독 스레드에서 받은 알림을
+    해당 격자를 구독 중인 SSE 연결의 asyncio 큐로 전달합니다.
+    """
+
+    def __init__(self):
+        self.subscribers = {}  # (nx, ny) -> {asyncio.Queue, ...}
+        self.loop = None
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def subscribe(self, cells: list) -> asyncio.Queue:
+        self.loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=PUSH_QUEUE_SIZE)
+        for cell in cells:
+            self.subscribers.setdefault(cell, set()).add(queue)
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._listen, name="push-listener", daemon=True)
+                self.thread.start()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue, cells: list):
+        for cell in cells:
+            queues = self.subscribers.get(cell)
+            if queues is None:
+                continue
+            queues.discard(queue)
+            if not queues:
+                del self.subscribers[cell]
+
+    def _listen(self):
+        # Redis 연결이 끊기면 잠시 후 다시 구독합니다.
+        while True:
+            try:
+                pubsub = redis_client.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(PUSH_CHANNEL)
+                # listen()은 소켓 타임아웃(REDIS_SOCKET_TIMEOUT)에 걸리므로 대기 시간을 직접 줍니다.
+                while True:
+                    message = pubsub.get_message(timeout=PUSH_HEARTBEAT_SECONDS)
+                    if message is not None:
+                        self._dispatch(message["data"])
+            except RedisError as e:
+                logging.warning(f"업데이트 채널 구독 끊김, 재연결: {e}")
+                time.sleep(PUSH_RECONNECT_SECONDS)
+
+    def _dispatch(self, raw):
+        try:
+            update = json.loads(raw)
+            cell = (update["nx"], update["ny"])
+        except (ValueError, KeyError, TypeError):
+            return
+        if cell not in self.subscribers:
+            return
+        # 격자당 한 번만 캐시를 읽어 로컬 구독자 모두에게 보냅니다.
+        cached = redis_client.redis.get(update["key"])
+        if not cached:
+            return
+        try:
+            update["data"] = json.loads(cached)
+        except json.JSONDecodeError:
+            return
+        self.loop.call_soon_threadsafe(self._deliver, cell, update)
+
+    def _deliver(self, cell, update):
+        for queue in list(self.subscribers.get(cell, ())):
+            if queue.full():
+                # 느린 클라이언트는 가장 오래된 알림을 버립니다 (다음 알림의 변경분은 마지막으로 보낸 값 기준).
+                queue.get_nowait()
+            queue.put_nowait(update)
+
+
+hub = UpdateHub()
+
+
+def parse_cells(cells: str) -> list:
+    """격자 목록 파싱: "60,127;61,128" -> [(60, 127), (61, 128)]"""
+    parsed = []
+    for part in cells.split(";"):
+        if not part.strip():
+            continue
+        nx, _, ny = part.partition(",")
+        parsed.append((int(nx), int(ny)))
+    if not parsed or len(parsed) > PUSH_MAX_CELLS:
+        raise ValueError(f"격자는 1~{PUSH_MAX_CELLS}개까지 구독할 수 있습니다")
+    return list(dict.fromkeys(parsed))
+
+
+def sse_event(event: str, data: dict, event_id: Optional[str] = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append("data: " + json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+    return "\n".join(lines) + "\n\n"
+
+
+def snapshot(cells: list, products: tuple) -> list:
+    """구독 시작 시 캐시에 있는 자료를 기준값으로 보냅니다."""
+    keys = [(cell, product, f"{PRODUCT_KEYS[product]}:{cell[0]}:{cell[1]}") for cell in cells for product in products]
+    try:
+        values = redis_client.redis.mget([key for _, _, key in keys])
+    except RedisError:
+        return []
+    found = []
+    for (cell, product, _), value in zip(keys, values):
+        if not value:
+            continue
+        try:
+            found.append((cell, product, json.loads(value)))
+        except json.JSONDecodeError:
+            continue
+    return found
+
+
+async def stream_updates(is_disconnected, cells: list, products: tuple):
+    """SSE 스트림: 스냅샷 -> 새 발표마다 변경분 -> 주기적 heartbeat"""
+    queue = hub.subscribe(cells)
+    last_sent = {}  # (nx, ny, product) -> 마지막으로 보낸 자료
+    try:
+        for (nx, ny), product, data in snapshot(cells, products):
+            last_sent[(nx, ny, product)] = data
+            yield sse_event(product, {"nx": nx, "ny": ny, "full": data})
+
+        while True:
+            try:
+                update = await asyncio.wait_for(queue.get(), timeout=PUSH_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if await is_disconnected():
+                    break
+                yield ": ping\n\n"
+                continue
+
+            product = update["product"]
+            if product not in products:
+                continue
+            nx, ny = update["nx"], update["ny"]
+            previous = last_sent.get((nx, ny, product))
+            last_sent[(nx, ny, product)] = update["data"]
+            payload = {"nx": nx, "ny": ny, "base": update["base"], **diff(previous, update["data"])}
+            yield sse_event(product, payload, f"{nx}:{ny}:{product}:{update['base']}")
+    finally:
+        hub.unsubscribe(queue, cells)
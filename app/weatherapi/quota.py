@@ -0,0 +1,121 @@
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+from redis.exceptions import RedisError
+
+from shared.metrics.registry import QUOTA_REJECTIONS, QUOTA_REMAINING, QUOTA_TOKENS
+from shared.redis import client as redis_client
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------
+# data.go.kr 호출 쿼터 (클러스터 공용)
+# ----------------------------------------------
+# 모든 레플리카가 하나의 KMA_SERVICE_KEY를 공유하므로 사용량을 Redis에 기록합니다.
+#   quota:daily:{operation}:{YYYYMMDD}  오퍼레이션별 일일 호출 수 (자정 초기화)
+#   quota:bucket:{operation}            토큰 버킷 (하루 한도를 고르게 나눠 순간 폭주를 제한)
+# 백그라운드 호출(캐시 워밍 등)은 일일 한도의 일부를 사용자 요청용으로 남겨 두고 멈춥니다.
+
+USER = "user"
+BACKGROUND = "background"
+
+DAILY_LIMIT = int(os.getenv("QUOTA_DAILY_LIMIT", "10000"))           # 오퍼레이션별 일일 한도
+BURST_SECONDS = int(os.getenv("QUOTA_BURST_SECONDS", "3600"))         # 버킷 용량 = 이 시간만큼의 평균 사용량
+BACKGROUND_RESERVE = float(os.getenv("QUOTA_BACKGROUND_RESERVE", "0.3"))  # 백그라운드가 건드리지 않는 일일 잔여 비율
+
+# 오퍼레이션별 한도를 따로 줄 때: QUOTA_DAILY_LIMIT_getVilageFcst=20000
+def daily_limit(operation: str) -> int:
+    return int(os.getenv(f"QUOTA_DAILY_LIMIT_{operation}", DAILY_LIMIT))
+
+# KEYS[1]=bucket, KEYS[2]=daily
+# ARGV: now, rate(토큰/초), capacity, daily_limit, min_tokens, min_remaining, daily_ttl
+TOKEN_BUCKET_LUA = """
+local now = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local capacity = tonumber(ARGV[3])
+local limit = tonumber(ARGV[4])
+local min_tokens = tonumber(ARGV[5])
+local min_remaining = tonumber(ARGV[6])
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local used = tonumber(redis.call('GET', KEYS[2]) or '0')
+local allowed = 0
+if tokens >= min_tokens and (limit - used) > min_remaining then
+    tokens = tokens - 1
+    used = redis.call('INCR', KEYS[2])
+    if used == 1 then
+        redis.call('EXPIRE', KEYS[2], tonumber(ARGV[7]))
+    end
+    allowed = 1
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], 86400)
+return {allowed, limit - used, tostring(tokens)}
+"""
+
+_priority: ContextVar[str] = ContextVar("quota_priority", default=USER)
+
+
+class QuotaExceededError(Exception):
+    """쿼터가 부족해 외부 API 호출을 건너뛴 경우"""
+
+    def __init__(self, operation: str, remaining: int):
+        super().__init__(f"쿼터 부족: {operation} (일일 잔여 {remaining})")
+        self.operation = operation
+        self.remaining = remaining
+
+
+@contextmanager
+def priority(level: str):
+    """with 블록 안의 외부 API 호출 우선순위를 지정합니다. (기본: USER)"""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+def acquire(operation: str):
+    """외부 API 호출 1회분 쿼터를 차감합니다. 부족하면 QuotaExceededError"""
+    level = _priority.get()
+    limit = daily_limit(operation)
+    rate = limit / 86400
+    capacity = max(1.0, rate * BURST_SECONDS)
+
+    if level == BACKGROUND:
+        # 백그라운드는 버킷 절반과 일일 잔여 BACKGROUND_RESERVE 비율을 남겨 둡니다.
+        min_tokens, min_remaining = capacity / 2, int(limit * BACKGROUND_RESERVE)
+    else:
+        # 사용자 요청은 버킷 절반만큼 앞당겨 쓸 수 있습니다. (일일 한도는 넘지 않음)
+        min_tokens, min_remaining = 1 - capacity / 2, 0
+
+    day = datetime.now().strftime("%Y%m%d")
+    try:
+        allowed, remaining, tokens = redis_client.redis.eval(
+            TOKEN_BUCKET_LUA, 2,
+            f"quota:bucket:{operation}", f"quota:daily:{operation}:{day}",
+            time.time(), rate, capacity, limit, min_tokens, min_remaining, 2 * 86400,
+        )
+    except RedisError as e:
+        # 쿼터 저장소 장애로 서비스를 멈추지 않도록 허용합니다.
+        logger.warning(f"쿼터 확인 실패, 호출 허용: {e}")
+        return
+
+    QUOTA_REMAINING.labels(operation).set(int(remaining))
+    QUOTA_TOKENS.labels(operation).set(float(tokens))
+    if not int(allowed):
+        QUOTA_REJECTIONS.labels(operation, level).inc()
+        raise QuotaExceededError(operation, int(remaining))
@@ -0,0 +1,148 @@
+import hashlib
+import logging
+import math
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import HTTPException, Request
+from redis.exceptions import RedisError
+
+from shared.metrics.registry import RATE_LIMIT_LIMITED_CLIENTS, RATE_LIMIT_REQUESTS, RATE_LIMIT_USAGE
+from shared.redis import client as redis_client
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------
+# 클라이언트별 요청 제한 (Redis 슬라이딩 윈도 카운터, 클러스터 공용)
+# ----------------------------------------------
+# 클라이언트: RATE_LIMIT_API_KEYS에 등록된 X-API-Key, 없으면 Cloudflare Tunnel이 넘겨주는 IP
+#            (CF-Connecting-IP -> X-Forwarded-For 첫 번째 -> 연결 주소)
+# 예산 두 가지 (RATE_LIMIT_WINDOW초 슬라이딩 윈도):
+#   cache     모든 요청 (캐시로 응답하는 요청도 포함). 넘으면 429
+#   upstream  클라이언트 요청 때문에 실제로 외부 API를 호출한 횟수.
+#             다 쓰면 그 클라이언트의 요청은 캐시 전용 모드로 처리하고(만료된 복사본 포함), 줄 데이터가 없으면 429
+#
+#   ratelimit:{예산}:{클라이언트}:{창 번호}  고정 창 카운터. 이전 창 값을 지난 비율만큼 줄여 더한 값이 슬라이딩 윈도 추정치
+# Redis 장애 시에는 제한하지 않습니다.
+
+CACHE = "cache"
+UPSTREAM = "upstream"
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_WINDOW = int(os.getenv("RATE_LIMIT_WINDOW", "60"))  # 초
+BUDGETS = {
+    CACHE: int(os.getenv("RATE_LIMIT_CACHE", "300")),        # 창당 요청 수
+    UPSTREAM: int(os.getenv("RATE_LIMIT_UPSTREAM", "30")),   # 창당 외부 API 호출 수
+}
+# 클라이언트 식별에 쓰는 API 키 (쉼표 구분). 등록되지 않은 키는 무시하고 IP로 식별합니다.
+RATE_LIMIT_API_KEYS = {key.strip() for key in os.getenv("RATE_LIMIT_API_KEYS", "").split(",") if key.strip()}
+
+# KEYS[1]=현재 창, KEYS[2]=이전 창
+# ARGV: limit, weight(이전 창 반영 비율), ttl, mode
+#   check  한도 안이면 1 더하고 허용, 넘으면 거부
+#   peek   한도 확인만 (1 더했을 때 넘으면 거부)
+#   charge 한도와 관계없이 1 더함
+SLIDING_WINDOW_LUA = """
+local limit = tonumber(ARGV[1])
+local mode = ARGV[4]
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local count = previous * tonumber(ARGV[2]) + current
+
+if mode ~= 'charge' and count + 1 > limit then
+    return {0, tostring(count)}
+end
+if mode ~= 'peek' then
+    redis.call('INCR', KEYS[1])
+    redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+    count = count + 1
+end
+return {1, tostring(count)}
+"""
+
+_client: ContextVar[Optional[str]] = ContextVar("ratelimit_client", default=None)
+_limited = {}  # (예산, 클라이언트) -> 마지막으로 제한된 시각 (레플리카별, 메트릭용)
+
+
+def client_id(request: Request) -> str:
+    api_key = request.headers.get("x-api-key")
+    if api_key and api_key in RATE_LIMIT_API_KEYS:
+        return "key:" + hashlib.sha1(api_key.encode()).hexdigest()[:16]
+    ip = request.headers.get("cf-connecting-ip")
+    if not ip:
+        forwarded = request.headers.get("x-forwarded-for", "")
+        ip = forwarded.split(",")[0].strip()
+    if not ip:
+        ip = request.client.host if request.client else "unknown"
+    return f"ip:{ip}"
+
+
+def retry_after(now: float) -> int:
+    """다음 창이 시작될 때까지 (초)"""
+    return max(1, math.ceil(RATE_LIMIT_WINDOW - now % RATE_LIMIT_WINDOW))
+
+
+def _count(budget: str, client: str, mode: str) -> bool:
+    now = time.time()
+    window = int(now // RATE_LIMIT_WINDOW)
+    weight = 1 - (now % RATE_LIMIT_WINDOW) / RATE_LIMIT_WINDOW
+    limit = BUDGETS[budget]
+    try:
+        allowed, count = redis_client.redis.eval(
+            SLIDING_WINDOW_LUA, 2,
+            f"ratelimit:{budget}:{client}:{window}", f"ratelimit:{budget}:{client}:{window - 1}",
+            limit, weight, 2 * RATE_LIMIT_WINDOW, mode,
+        )
+    except RedisError as e:
+        logger.warning(f"요청 제한 확인 실패, 허용: {e}")
+        RATE_LIMIT_REQUESTS.labels(budget, "error").inc()
+        return True
+
+    allowed = bool(int(allowed))
+    if mode != "charge":
+        RATE_LIMIT_REQUESTS.labels(budget, "allowed" if allowed else "limited").inc()
+        RATE_LIMIT_USAGE.labels(budget).observe(float(count) / limit)
+    if not allowed:
+        _limited[(budget, client)] = now
+    _update_limited_clients(now)
+    return allowed
+
+
+def _update_limited_clients(now: float):
+    # 최근 한 창 안에 제한된 클라이언트 수
+    for key, limited_at in list(_limited.items()):
+        if now - limited_at > RATE_LIMIT_WINDOW:
+            del _limited[key]
+    for budget in BUDGETS:
+        RATE_LIMIT_LIMITED_CLIENTS.labels(budget).set(sum(1 for b, _ in _limited if b == budget))
+
+
+async def rate_limit(request: Request):
+    """라우터 의존성: 클라이언트를 식별하고 cache 예산을 확인합니다. (넘으면 429)"""
+    if not RATE_LIMIT_ENABLED:
+        return
+    client = client_id(request)
+    _client.set(client)
+    if not _count(CACHE, client, "check"):
+        raise HTTPException(status_code=429, detail="요청이 너무 많습니다. 잠시 후 다시 시도하세요",
+                            headers={"Retry-After": str(retry_after(time.time()))})
+
+
+def upstream_exhausted() -> bool:
+    """현재 요청의 클라이언트가 upstream 예산을 다 썼는지 (차감하지 않음)"""
+    client = _client.get()
+    return client is not None and not _count(UPSTREAM, client, "peek")
+
+
+def charge_upstream():
+    """현재 요청의 클라이언트 때문에 외부 API를 호출할 때 upstream 예산 1 차감"""
+    client = _client.get()
+    if client is not None:
+        _count(UPSTREAM, client, "charge")
+
+
+def limited_error() -> HTTPException:
+    return HTTPException(status_code=429, detail="외부 API 호출 한도를 넘었고 캐시된 데이터가 없습니다",
+                         headers={"Retry-After": str(retry_after(time.time()))})
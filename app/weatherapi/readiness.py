@@ -0,0 +1,56 @@
+import asyncio
+import logging
+import os
+
+from shared.redis import client as redis_client
+from . import quota, service
+from .push import parse_cells
+
+# ----------------------------------------------
+# 준비 단계 (weatherapi)
+# ----------------------------------------------
+#   station   측정소/구역 매핑(station.json) 로드
+#   redis     Redis 연결 (PING 성공까지 재시도)
+#   upstream  외부 API(KMA/AIR/MID)별 연결 풀에 연결을 미리 맺음
+#   warm      WARM_CELLS 격자의 현재/시간별/주간 자료를 캐시에 채움
+#             (사용자 요청 몫의 쿼터를 쓰지 않도록 BACKGROUND 우선순위, 이미 캐시에 있으면 외부 API 호출 없음)
+#             get_all_data는 외부 API 오류를 삼키고 빈 항목으로 응답하므로, 조회 후 입력 자료가 모두 캐시에
+#             들어갔는지(내용 버전 ver:*)로 성공 여부를 판단합니다.
+
+WARM_CELLS = os.getenv("WARM_CELLS", "60,127")  # "nx,ny;nx,ny" (기본: 서울)
+
+logger = logging.getLogger(__name__)
+
+
+async def load_station():
+    service.get_location_map()
+
+
+async def ping_redis():
+    await asyncio.to_thread(redis_client.redis.ping)
+
+
+async def prime_cells():
+    cells = parse_cells(WARM_CELLS) if WARM_CELLS.strip() else []
+    failed = []
+    with quota.priority(quota.BACKGROUND):
+        for nx, ny in cells:
+            try:
+                await service.get_all_data(nx, ny)
+            except Exception as e:
+                logger.warning(f"격자 캐시 채우기 실패 ({nx},{ny}): {e!r}")
+                failed.append(f"{nx},{ny}")
+                continue
+            keys = [key for key, _ in service.input_products("all", nx, ny)]
+            if service.product_versions(keys) is None:
+                logger.warning(f"격자 캐시 채우기 실패 ({nx},{ny}): 캐시에 없는 자료가 있음")
+                failed.append(f"{nx},{ny}")
+    if failed:
+        raise RuntimeError(f"캐시를 채우지 못한 격자: {', '.join(failed)}")
+
+
+async def warm_up(readiness):
+    await readiness.step("station", load_station)
+    await readiness.step("redis", ping_redis, retry=True)
+    await readiness.step("upstream", service.connect_upstreams, retry=True)
+    await readiness.step("warm", prime_cells)
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+
+from redis.exceptions import RedisError
+
+from shared.redis import client as redis_client
+from . import quota, service
+from .push import hub
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------
+# /stream 구독 격자 백그라운드 갱신
+# ----------------------------------------------
+# 자료 캐시는 TTL이 끝날 때까지 이전 발표를 돌려주므로, 사용자 요청이 없으면 새 발표가 나와도
+# notify_cached가 불리지 않아 구독자는 한참 뒤에야 변경분을 받습니다.
+# 발표 시각(next_publication)마다 이 레플리카에 구독자가 있는 격자만 다시 조회합니다. (구독자가 없으면 호출 없음)
+#   - 사용자 요청 몫의 쿼터를 쓰지 않도록 BACKGROUND 우선순위
+#   - 캐시에 있어도 pushbase:{캐시 키}가 현재 발표가 아니면 외부 API에서 다시 받음 (service.refreshing)
+#   - 새로 받은 자료는 fetch_with_cache -> notify_cached 경로 그대로 변경분이 발행됨
+#   - 여러 레플리카가 같은 격자를 구독하면 pushrefresh:{자료}:{nx}:{ny}:{발표 시각}을 먼저 잡은 쪽만 조회
+
+PUSH_REFRESH_ENABLED = os.getenv("PUSH_REFRESH_ENABLED", "true").lower() == "true"
+PUSH_REFRESH_DELAY_SECONDS = int(os.getenv("PUSH_REFRESH_DELAY_SECONDS", "30"))  # 발표 시각 후 조회까지 (초)
+PUSH_REFRESH_CONCURRENCY = int(os.getenv("PUSH_REFRESH_CONCURRENCY", "4"))
+PUSH_REFRESH_CLAIM_EXPIRE = 60 * 60  # 1시간
+
+# 이벤트 이름 -> (발표 일정, 조회 함수)
+# 일 최저/최고기온(daily)은 02시 단기예보에 들어 있으므로 단기예보 발표 때 확인합니다. (이미 최신이면 호출 없음)
+REFRESH_PRODUCTS = {
+    "live": ("live", service.get_live_weather),
+    "sky": ("ultra", service.get_sky_state),
+    "ultra": ("ultra", service.get_ultra_forecast_data),
+    "short": ("short", service.get_forecast_data),
+    "daily": ("short", service.get_daily_forecast),
+}
+
+
+def due_products(due: datetime) -> list:
+    """due 시각에 새 발표가 나오는 자료"""
+    before = due - timedelta(seconds=1)
+    return [
+        product for product, (schedule, _) in REFRESH_PRODUCTS.items()
+        if service.next_publication(schedule, before) == due
+    ]
+
+
+def next_due(now: datetime) -> datetime:
+    return min(service.next_publication(schedule, now) for schedule, _ in REFRESH_PRODUCTS.values())
+
+
+def claim(product: str, nx: int, ny: int, due: datetime) -> bool:
+    """레플리카 중 하나만 조회하도록 선점 (Redis 장애 시에는 각자 조회)"""
+    try:
+        return bool(redis_client.redis.set(f"pushrefresh:{product}:{nx}:{ny}:{due:%Y%m%d%H%M}", 1,
+                                           nx=True, ex=PUSH_REFRESH_CLAIM_EXPIRE))
+    except RedisError:
+        return True
+
+
+async def refresh_cells(cells: list, products: list, due: datetime):
+    semaphore = asyncio.Semaphore(PUSH_REFRESH_CONCURRENCY)
+
+    async def refresh(nx: int, ny: int, product: str):
+        async with semaphore:
+            if not claim(product, nx, ny, due):
+                return
+            try:
+                with quota.priority(quota.BACKGROUND), service.refreshing():
+                    await REFRESH_PRODUCTS[product][1](nx, ny)
+            except Exception as e:
+                logger.warning(f"구독 격자 갱신 실패 ({product} {nx},{ny}): {e!r}")
+
+    await asyncio.gather(*(refresh(nx, ny, product) for nx, ny in cells for product in products))
+
+
+async def refresh_loop():
+    while True:
+        now = datetime.now()
+        due = next_due(now)
+        await asyncio.sleep((due - now).total_seconds() + PUSH_REFRESH_DELAY_SECONDS)
+        cells = list(hub.subscribers)
+        if cells:
+            await refresh_cells(cells, due_products(due), due)
+
+
+def setup_refresh(app):
+    """시작 시 갱신 루프를 백그라운드로 실행하고 종료 시 멈춥니다."""
+    if not PUSH_REFRESH_ENABLED:
+        return
+
+    @app.on_event("startup")
+    async def start_refresh():
+        app.state.refresh_task = asyncio.create_task(refresh_loop())
+
+    @app.on_event("shutdown")
+    async def stop_refresh():
+        app.state.refresh_task.cancel()
@@ -0,0 +1,163 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+from typing import Optional
+
+from fastapi import Response
+from redis.exceptions import RedisError
+
+from shared.metrics.registry import record_cache
+from shared.redis import client as redis_client
+from .timing import mark, span
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 gzip만 협상합니다.
+    brotli = None
+
+# ----------------------------------------------
+# 응답 직렬화 / 압축 / 응답 캐시
+# ----------------------------------------------
+# 직렬화한 응답 본문과 압축본(gzip, br)을 Redis 해시 하나(resp:*)에 함께 저장해
+# 같은 응답을 요청마다 다시 직렬화/압축하지 않습니다.
+#   resp:{route}:{nx}:{ny}:{format}:{fields}:{버전 태그} -> {identity, gzip, br}
+#
+# 버전 태그는 응답을 만든 입력 자료들의 내용 버전(ver:*)으로 계산하며, 그대로 강한 ETag로 씁니다.
+# If-None-Match가 같으면 Redis 응답 캐시도 읽지 않고 304로 응답합니다.
+# Cache-Control max-age는 입력 자료의 다음 발표 시각까지로 잡아 Cloudflare/Traefik이 재요청을 흡수하게 합니다.
+
+RESPONSE_CACHE_EXPIRE = int(os.getenv("RESPONSE_CACHE_EXPIRE", "60"))  # 1분
+MIN_COMPRESS_SIZE = 512  # 이보다 작은 본문은 압축하지 않음
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+CACHE_MAX_AGE = int(os.getenv("CACHE_MAX_AGE", "1800"))                              # max-age 상한 (30분)
+CACHE_STALE_WHILE_REVALIDATE = int(os.getenv("CACHE_STALE_WHILE_REVALIDATE", "60"))  # 1분
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def negotiate_encoding(accept_encoding: str) -> str:
+    """Accept-Encoding에서 사용할 인코딩 선택 (br > gzip > identity)"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip())
+    if brotli is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return "identity"
+
+
+def encode_variants(body: bytes) -> dict:
+    variants = {"identity": body}
+    if len(body) < MIN_COMPRESS_SIZE:
+        return variants
+    with span("compress"):
+        variants["gzip"] = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+        if brotli is not None:
+            variants["br"] = brotli.compress(body, quality=BROTLI_QUALITY)
+    return variants
+
+
+def make_response(variants: dict, encoding: str) -> Response:
+    if encoding not in variants:
+        encoding = "identity"
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=variants[encoding], media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+def version_tag(cache_key: str, versions: list, window: Optional[str] = None) -> str:
+    """
+    응답 캐시 키 + 입력 자료 버전 (+ 본문이 시각에 따라 달라지면 그 구간) -> 버전 태그 (ETag 값)
+    같은 자료라도 시간별 예보는 정시마다, 주간 예보는 자정마다 본문이 바뀌므로 구간을 함께 넣습니다.
+    """
+    parts = [cache_key, *versions]
+    if window is not None:
+        parts.append(window)
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def etag(tag: str, encoding: str) -> str:
+    """강한 ETag는 표현(압축 방식)마다 달라야 하므로 압축본에는 인코딩을 붙입니다."""
+    return f'"{tag}"' if encoding == "identity" else f'"{tag}-{encoding}"'
+
+
+def matching_etag(if_none_match: str, tag: str) -> Optional[str]:
+    """If-None-Match 중 버전 태그가 같은 ETag (없으면 None)"""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip().removeprefix("W/")
+        if candidate == f'"{tag}"' or candidate.startswith(f'"{tag}-'):
+            return candidate
+    return None
+
+
+def cache_control(max_age: int) -> str:
+    max_age = max(0, min(CACHE_MAX_AGE, max_age))
+    return f"public, max-age={max_age}, stale-while-revalidate={CACHE_STALE_WHILE_REVALIDATE}"
+
+
+def with_cache_headers(response: Response, tag: Optional[str], max_age: Optional[int]) -> Response:
+    """ETag/Cache-Control 추가. max_age가 None이면 공유 캐시에 저장하지 않도록 no-store"""
+    if max_age is None:
+        response.headers["Cache-Control"] = "no-store"
+        return response
+    response.headers["Cache-Control"] = cache_control(max_age)
+    if tag is not None:
+        response.headers["ETag"] = etag(tag, response.headers.get("content-encoding", "identity"))
+    return response
+
+
+def not_modified(matched_etag: str, max_age: int) -> Response:
+    return Response(status_code=304, headers={
+        "ETag": matched_etag,
+        "Cache-Control": cache_control(max_age),
+        "Vary": "Accept-Encoding",
+    })
+
+
+def cached_response(cache_key: str, encoding: str) -> Optional[Response]:
+    """응답 캐시에서 협상된 인코딩의 본문을 꺼냅니다. 없으면 None"""
+    try:
+        with span("redis-resp"):
+            body, identity = redis_client.redis_binary.hmget(cache_key, encoding, "identity")
+    except RedisError as e:
+        logging.warning(f"응답 캐시 조회 실패: {e}")
+        return None
+
+    if identity is None:
+        record_cache(cache_key, "miss")
+        mark("cache-resp", "miss")
+        return None
+    record_cache(cache_key, "hit")
+    mark("cache-resp", "hit")
+    if body is None:
+        # 작은 본문은 압축본 없이 저장됩니다.
+        return make_response({"identity": identity}, "identity")
+    return make_response({encoding: body}, encoding)
+
+
+def render_response(content, encoding: str, cache_key: str = None) -> Response:
+    """본문 직렬화 + 압축. cache_key가 있으면 모든 압축본을 응답 캐시에 저장합니다."""
+    with span("serialize"):
+        body = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    variants = encode_variants(body)
+
+    if cache_key is not None:
+        try:
+            with span("redis-resp-set"):
+                pipe = redis_client.redis_binary.pipeline(transaction=False)
+                pipe.delete(cache_key)
+                pipe.hset(cache_key, mapping=variants)
+                pipe.expire(cache_key, RESPONSE_CACHE_EXPIRE)
+                pipe.execute()
+        except RedisError as e:
+            logging.warning(f"응답 캐시 저장 실패: {e}")
+
+    return make_response(variants, encoding)
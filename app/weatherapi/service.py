@@ -1,23 +1,428 @@
 import os
 import json
+import hashlib
 import logging
+import time
 import httpx
 from fastapi import HTTPException
 from datetime import datetime, timedelta
-from shared.redis.client import redis
-from . import parsers
+from redis.exceptions import RedisError
+from shared.redis import client as redis_client
+from shared.metrics.registry import UPSTREAM_HEDGES, cache_family, observe_upstream, record_cache
+from shared.logs.structured import DEBUG_PAYLOADS
+from shared.resilience.breaker import CircuitOpenError, get_breaker
+from . import admission, history, parsers, push, quota, ratelimit
+from .local_cache import local_cache
+from .quota import QuotaExceededError
+from .timing import mark, span, traced
 import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
-KMA_API_BASE_URL = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0"   #날씨
-AIR_API_BASE_URL = "https://apis.data.go.kr/B552584/ArpltnInforInqireSvc"   #대기오염정보
-KMA_API_MID_URL = "https://apis.data.go.kr/1360000/MidFcstInfoService"  #중기예보
+# 벤치마크 등에서 로컬 대역 서버로 바꿀 수 있도록 환경 변수로 덮어쓸 수 있습니다.
+KMA_API_BASE_URL = os.getenv("KMA_API_BASE_URL", "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0")   #날씨
+AIR_API_BASE_URL = os.getenv("AIR_API_BASE_URL", "https://apis.data.go.kr/B552584/ArpltnInforInqireSvc")   #대기오염정보
+KMA_API_MID_URL = os.getenv("KMA_API_MID_URL", "https://apis.data.go.kr/1360000/MidFcstInfoService")  #중기예보
 KMA_SERVICE_KEY = os.getenv("KMA_SERVICE_KEY")
 
 CASHE_EXPIRE = 300  # 5분
 MID_TERM_CACHE_EXPIRE = 6 * 60 * 60 # 6시간
+# 외부 API 장애 시 대신 응답할 만료된 복사본(stale:*) 보관 시간 (원래 TTL에 더해짐)
+STALE_CACHE_GRACE = int(os.getenv("STALE_CACHE_GRACE", str(6 * 60 * 60)))  # 6시간
+# 네거티브 캐시(neg:*): 오류 응답/빈 결과를 짧게 기억해 같은 발표 시각에 대한 재호출을 막습니다.
+NEGATIVE_CACHE_EXPIRE = int(os.getenv("NEGATIVE_CACHE_EXPIRE", "60"))              # 빈 결과, NO_DATA (1분)
+NEGATIVE_ERROR_CACHE_EXPIRE = int(os.getenv("NEGATIVE_ERROR_CACHE_EXPIRE", "30"))  # 그 밖의 오류 응답 (30초)
+
+#------------------------------------------------------
+# 공통: 캐시 조회 / 외부 API 호출
+#------------------------------------------------------
+# 메트릭 라벨용 API 구분
+UPSTREAM_API_NAMES = {
+    KMA_API_BASE_URL: "KMA",
+    AIR_API_BASE_URL: "AIR",
+    KMA_API_MID_URL: "MID",
+}
+
+# 오퍼레이션별 서킷 브레이커 (초단기실황/초단기예보는 같은 초단기 서비스로 묶음)
+UPSTREAM_BREAKERS = {
+    "getUltraSrtNcst": get_breaker("ultra-short"),
+    "getUltraSrtFcst": get_breaker("ultra-short"),
+    "getVilageFcst": get_breaker("village"),
+    "getMsrstnAcctoRltmMesureDnsty": get_breaker("air"),
+    "getMidTa": get_breaker("mid-ta"),
+    "getMidLandFcst": get_breaker("mid-land"),
+}
+
+# Redis 장애(연결 실패, 헬스 트래커 차단) 시에는 프로세스 내 캐시(local_cache)로 대신합니다.
+# 캐시 조회 (없거나 손상된 경우 None)
+def get_cached(cache_key: str):
+    marker = "cache-" + cache_family(cache_key).replace(":", "-")  # Server-Timing 이름에는 ':' 불가
+    try:
+        with span("redis"):
+            cached = redis_client.redis.get(cache_key)
+    except RedisError:
+        data = local_cache.get(cache_key)
+        result = "miss" if data is None else "local"
+        record_cache(cache_key, result)
+        mark(marker, result)
+        return data
+    if cached:
+        logger.info("캐시된 날씨 데이터 사용", extra={"log_class": "cache", "key": cache_key})
+        try:
+            data = json.loads(cached)
+            record_cache(cache_key, "hit")
+            mark(marker, "hit")
+            return data
+        except json.JSONDecodeError:
+            logging.warning("캐시된 JSON 파싱 오류. API 재호출")
+    record_cache(cache_key, "miss")
+    mark(marker, "miss")
+    return None
+
+# 캐시 저장 (장애 대비용 stale 복사본, ETag용 내용 버전 ver:*도 함께 저장)
+def set_cached(cache_key: str, data, expire: int):
+    encoded = json.dumps(data)
+    try:
+        with span("redis-set"):
+            pipe = redis_client.redis.pipeline(transaction=False)
+            pipe.set(cache_key, encoded, ex=expire)
+            pipe.set(f"stale:{cache_key}", encoded, ex=expire + STALE_CACHE_GRACE)
+            pipe.set(f"ver:{cache_key}", hashlib.sha1(encoded.encode("utf-8")).hexdigest()[:12], ex=expire)
+            pipe.execute()
+    except RedisError:
+        local_cache.set(cache_key, data, expire)
+
+# 만료된 복사본 조회 (외부 API 장애 시)
+def get_stale(cache_key: str):
+    try:
+        with span("redis-stale"):
+            cached = redis_client.redis.get(f"stale:{cache_key}")
+    except RedisError:
+        return None
+    if not cached:
+        return None
+    try:
+        data = json.loads(cached)
+    except json.JSONDecodeError:
+        return None
+    record_cache(cache_key, "stale")
+    mark("cache-" + cache_family(cache_key).replace(":", "-"), "stale")
+    return data
+
+# 헤지 요청: 첫 요청이 오퍼레이션의 지연 백분위수(HEDGE_PERCENTILE)를 넘기면 같은 GET을 한 번 더 보내
+# 먼저 도착한 응답을 쓰고 나머지는 취소합니다. 추가 호출도 쿼터를 사용하며,
+# 프로세스별로 일반 요청 수의 HEDGE_BUDGET_RATIO 비율까지만 보냅니다.
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "false").lower() == "true"
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "95"))
+HEDGE_MIN_DELAY = float(os.getenv("HEDGE_MIN_DELAY", "0.05"))      # 초
+HEDGE_BUDGET_RATIO = float(os.getenv("HEDGE_BUDGET_RATIO", "0.1"))  # 일반 요청 대비 헤지 비율 상한
+HEDGE_BUDGET_BURST = 5.0
+_hedge_budget = {}  # operation -> 남은 헤지 횟수
+
+# 헤지 예산: 요청마다 HEDGE_BUDGET_RATIO만큼 쌓이고 헤지 한 번에 1 사용
+def earn_hedge_budget(operation: str):
+    _hedge_budget[operation] = min(HEDGE_BUDGET_BURST, _hedge_budget.get(operation, 0.0) + HEDGE_BUDGET_RATIO)
+
+def spend_hedge_budget(operation: str) -> bool:
+    if _hedge_budget.get(operation, 0.0) < 1.0:
+        return False
+    _hedge_budget[operation] -= 1.0
+    return True
+
+# GET (헤지 사용 시 지연 백분위수를 넘기면 두 번째 요청을 보내고 먼저 온 응답 사용)
+async def hedged_get(client: httpx.AsyncClient, breaker, operation: str, params: dict):
+    timeout = breaker.timeout()
+    delay = breaker.percentile(HEDGE_PERCENTILE) if HEDGE_ENABLED else None
+    if delay is None:  # 꺼져 있거나 지연 표본이 아직 부족함
+        return await client.get(f"/{operation}", params=params, timeout=timeout)
+    earn_hedge_budget(operation)
+
+    primary = asyncio.ensure_future(client.get(f"/{operation}", params=params, timeout=timeout))
+    tasks = [primary]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=max(HEDGE_MIN_DELAY, delay))
+        if done:
+            return primary.result()
+        if not spend_hedge_budget(operation):
+            UPSTREAM_HEDGES.labels(operation, "skipped").inc()
+            return await primary
+        try:
+            quota.acquire(operation)
+        except QuotaExceededError:
+            UPSTREAM_HEDGES.labels(operation, "skipped").inc()
+            return await primary
+
+        UPSTREAM_HEDGES.labels(operation, "sent").inc()
+        mark("hedge", operation)
+        hedge = asyncio.ensure_future(client.get(f"/{operation}", params=params, timeout=timeout))
+        tasks.append(hedge)
+        # 먼저 성공한 응답 사용 (둘 다 실패하면 첫 요청의 오류)
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        UPSTREAM_HEDGES.labels(operation, "won").inc()
+                    return task.result()
+        return primary.result()
+    finally:
+        # 늦은 쪽(또는 요청이 취소된 경우 모두) 취소
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+# data.go.kr 오류 응답 (HTTP 200 + header.resultCode != "00")
+RESULT_OK = "00"
+RESULT_NO_DATA = "03"  # 아직 발표되지 않았거나 자료 없음
+# 서비스 장애로 보고 브레이커 실패로 기록하는 결과 코드 (나머지는 요청/인증키 문제)
+RESULT_SERVER_ERRORS = {"01", "02", "04", "05"}  # APPLICATION_ERROR, DB_ERROR, HTTP_ERROR, SERVICETIMEOUT_ERROR
+
+class UpstreamResultError(HTTPException):
+    """외부 API가 오류 결과 코드를 응답한 경우"""
+
+    def __init__(self, operation: str, result_code: str, result_msg: str):
+        self.result_code = result_code
+        super().__init__(status_code=502, detail=f"외부 API 오류 응답 ({operation}): {result_code} {result_msg}")
+
+# 응답 헤더의 결과 코드 (헤더가 없으면 None)
+def result_code(data) -> tuple:
+    try:
+        header = data["response"]["header"]
+        return str(header["resultCode"]), header.get("resultMsg", "")
+    except (KeyError, TypeError):
+        return None, ""
+
+# 외부 API별 공유 클라이언트: 요청마다 TCP/TLS 연결을 새로 맺지 않고 연결 풀을 재사용합니다.
+# 타임아웃은 요청마다 브레이커의 관측 지연 기반 값을 넘깁니다.
+UPSTREAM_POOL_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "10")),
+    max_keepalive_connections=int(os.getenv("UPSTREAM_MAX_KEEPALIVE", "4")),
+    keepalive_expiry=30,
+)
+_clients = {}  # base_url -> httpx.AsyncClient
+
+def get_client(base_url: str) -> httpx.AsyncClient:
+    client = _clients.get(base_url)
+    if client is None:
+        client = _clients[base_url] = httpx.AsyncClient(base_url=base_url, limits=UPSTREAM_POOL_LIMITS)
+    return client
+
+# 준비 단계용: 외부 API마다 연결을 미리 맺어 풀에 넣습니다. (응답 상태는 보지 않음)
+async def connect_upstreams(timeout: float = 5.0):
+    await asyncio.gather(*(get_client(base_url).head("/", timeout=timeout) for base_url in UPSTREAM_API_NAMES))
+
+async def close_clients():
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
+
+# 요청 단위 중복 제거: request_scope() 안에서는 같은 캐시 키/같은 외부 API 요청을 한 번만 실행하고
+# 결과(또는 예외)를 나눠 씁니다. (/all 에서 /current, /forecast, /week가 같은 단기예보를 공유)
+_request_scope = ContextVar("request_scope", default=None)
+
+@contextmanager
+def request_scope():
+    token = _request_scope.set({})
+    try:
+        yield
+    finally:
+        _request_scope.reset(token)
+
+async def shared(key: tuple, factory):
+    scope = _request_scope.get()
+    if scope is None:
+        return await factory()
+    task = scope.get(key)
+    if task is None:
+        task = scope[key] = asyncio.ensure_future(factory())
+    # 기다리던 쪽 하나가 취소되어도 공유 작업은 계속되도록 shield
+    return await asyncio.shield(task)
+
+# 프로세스 단위 요청 병합 (singleflight): 진행 중인 같은 키의 작업이 있으면 그 결과를 기다립니다.
+_inflight = {}
+
+async def coalesce(key: tuple, factory):
+    task = _inflight.get(key)
+    if task is None:
+        task = _inflight[key] = asyncio.ensure_future(factory())
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+# 외부 API 호출 -> JSON 응답 반환
+# 브레이커가 열려 있으면 CircuitOpenError, 쿼터 부족은 QuotaExceededError, 호출 실패는 HTTPException
+async def request_upstream(base_url: str, operation: str, params: dict):
+    key = ("upstream", operation, tuple(sorted((k, str(v)) for k, v in params.items())))
+    return await shared(key, lambda: _request_upstream(base_url, operation, params))
+
+async def _request_upstream(base_url: str, operation: str, params: dict):
+    api = UPSTREAM_API_NAMES[base_url]
+    breaker = UPSTREAM_BREAKERS[operation]
+    breaker.before_call()
+    quota.acquire(operation)
+
+    start = time.perf_counter()
+    try:
+        with span(f"{api.lower()}-{operation}"), observe_upstream(api, operation) as call:
+            response = await hedged_get(get_client(base_url), breaker, operation, params)
+            call.status = response.status_code
+        logger.info("외부 API 응답", extra={
+            "log_class": "upstream", "operation": operation, "status": response.status_code,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        })
+        if DEBUG_PAYLOADS:
+            # 응답 헤더/본문 덤프는 LOG_DEBUG_PAYLOADS=true일 때만
+            logger.info("외부 API 응답 내용", extra={
+                "log_class": "payload", "operation": operation,
+                "headers": dict(response.headers), "body": response.text[:500],
+            })
+        response.raise_for_status()
+
+        data = response.json()
+
+    except httpx.HTTPStatusError as e:
+        # 4xx는 설정/요청 문제이므로 외부 API 장애로 보지 않습니다.
+        if e.response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        if e.response.status_code == 401:
+            raise HTTPException(status_code=401, detail="[401] 기상청 API 인증 실패. 서비스 키를 확인")
+        logging.error(f"기상청 API 호출 실패: {e.response.text}")
+        raise HTTPException(status_code=e.response.status_code, detail=f"기상청 API 호출 오류: {e.response.text}")
+
+    except Exception as e:
+        # 타임아웃, 연결 오류, JSON이 아닌 응답(XML 오류 등)
+        breaker.record_failure()
+        logging.error(f"서버 내부 오류: {e!r}")
+        raise HTTPException(status_code=500, detail=f"서버 내부 오류: {e!r}")
+
+    code, message = result_code(data)
+    if code is not None and code != RESULT_OK:
+        if code in RESULT_SERVER_ERRORS:
+            breaker.record_failure()
+        else:
+            breaker.record_success(time.perf_counter() - start)
+        logging.warning(f"외부 API 오류 응답 ({operation}): {code} {message}")
+        raise UpstreamResultError(operation, code, message)
+
+    breaker.record_success(time.perf_counter() - start)
+    return data
+
+# 발표 시각 (네거티브 캐시 키용): 단기/초단기는 base_date+base_time, 중기는 tmFc
+def base_version(params: dict) -> str:
+    if "base_time" in params:
+        return f"{params['base_date']}{params['base_time']}"
+    return str(params.get("tmFc", ""))
+
+# 네거티브 캐시 조회 (없으면 None, 있으면 {"status", "detail"})
+def get_negative(cache_key: str, version: str):
+    try:
+        with span("redis-neg"):
+            cached = redis_client.redis.get(f"neg:{cache_key}:{version}")
+    except RedisError:
+        cached = local_cache.get(f"neg:{cache_key}:{version}")
+    if not cached:
+        return None
+    try:
+        entry = json.loads(cached)
+    except json.JSONDecodeError:
+        return None
+    record_cache(cache_key, "negative")
+    mark("cache-" + cache_family(cache_key).replace(":", "-"), "negative")
+    return entry
+
+# 네거티브 캐시 저장 (정상 캐시와 별도 키, 짧은 TTL)
+def set_negative(cache_key: str, version: str, status: int, detail: str, expire: int):
+    entry = json.dumps({"status": status, "detail": detail})
+    try:
+        pipe = redis_client.redis.pipeline(transaction=False)
+        pipe.set(f"neg:{cache_key}:{version}", entry, ex=expire)
+        if status == 200:
+            # 빈 결과도 하나의 내용 버전 (응답 ETag 계산용)
+            pipe.set(f"ver:{cache_key}", f"empty-{version}", ex=expire)
+        pipe.execute()
+    except RedisError:
+        local_cache.set(f"neg:{cache_key}:{version}", entry, expire)
+
+# 발표 시각 갱신 모드 (/stream 구독 격자 백그라운드 갱신): 캐시에 있어도 이전 발표 자료면 외부 API에서 다시 받습니다.
+_refresh = ContextVar("refresh", default=False)
+
+@contextmanager
+def refreshing():
+    token = _refresh.set(True)
+    try:
+        yield
+    finally:
+        _refresh.reset(token)
+
+# 캐시 조회 -> (미스) 외부 API 호출 + 파싱 + 캐시 저장
+# 외부 API가 실패하거나 브레이커가 열려 있거나 쿼터가 부족하면 만료된 복사본으로 대신 응답합니다.
+# 오류 결과 코드/빈 결과는 정상 캐시에 저장하지 않고 네거티브 캐시에 짧게 저장해
+# 같은 발표 시각에 대해서는 창(window)마다 한 번만 외부 API를 호출합니다.
+# 같은 키를 동시에 조회하는 요청들은 외부 API 호출 한 번을 나눠 씁니다. (Redis 장애 중 캐시 미스 폭주 방지)
+async def fetch_with_cache(cache_key: str, expire: int, base_url: str, operation: str, params: dict, parse):
+    # 캐시 전용 모드/쿼터 우선순위/갱신 모드가 다른 요청끼리는 합치지 않습니다.
+    flight = (cache_key, admission.is_cache_only(), quota.current_priority(), _refresh.get())
+    return await shared(("cache", cache_key), lambda: coalesce(
+        flight, lambda: _fetch_with_cache(cache_key, expire, base_url, operation, params, parse)))
+
+async def _fetch_with_cache(cache_key: str, expire: int, base_url: str, operation: str, params: dict, parse):
+    cached = get_cached(cache_key)
+    if cached is not None and (not _refresh.get() or push.is_current(cache_key, params)):
+        return cached
+
+    version = base_version(params)
+    negative = get_negative(cache_key, version)
+    if negative is not None:
+        stale = get_stale(cache_key)
+        if stale is not None:
+            return stale
+        if negative["status"] == 200:  # 빈 결과 / NO_DATA
+            return {}
+        raise HTTPException(status_code=negative["status"], detail=negative["detail"])
+
+    if admission.is_cache_only():
+        # 부하 차단 중: 외부 API를 호출하지 않고 만료된 복사본만 사용
+        stale = get_stale(cache_key)
+        if stale is not None:
+            return stale
+        raise HTTPException(status_code=503, detail="부하 차단 중이며 캐시된 데이터 없음")
+
+    logger.info("기상청 API에서 날씨 데이터 조회", extra={"log_class": "upstream", "operation": operation, "key": cache_key})
+    # 요청한 클라이언트의 외부 API 호출 예산 차감 (/region 채우기 포함, 요청 밖의 준비 단계/구독 갱신은 클라이언트 없음)
+    ratelimit.charge_upstream()
+
+    try:
+        data = await request_upstream(base_url, operation, params)
+    except (CircuitOpenError, QuotaExceededError, HTTPException) as e:
+        if isinstance(e, UpstreamResultError):
+            no_data = e.result_code == RESULT_NO_DATA
+            set_negative(cache_key, version, 200 if no_data else e.status_code, e.detail,
+                         NEGATIVE_CACHE_EXPIRE if no_data else NEGATIVE_ERROR_CACHE_EXPIRE)
+        stale = get_stale(cache_key)
+        if stale is not None:
+            logging.warning(f"외부 API 실패, 만료된 캐시로 응답 ({cache_key}): {e}")
+            return stale
+        if isinstance(e, UpstreamResultError) and e.result_code == RESULT_NO_DATA:
+            return {}
+        raise
+
+    with span("parse"):
+        parsed = parse(data)
+
+    if parsed:
+        set_cached(cache_key, parsed, expire)
+        # 새 발표 시각이면 /stream 구독자에게 알림
+        push.notify_cached(cache_key, params)
+    else:
+        # 정상 응답이지만 자료가 없음 (예: 02시 발표 전 TMN/TMX)
+        set_negative(cache_key, version, 200, "empty", NEGATIVE_CACHE_EXPIRE)
+
+    return parsed
 
 #------------------------------------------------------
 # 초단기실황조회(현재날씨)
@@ -47,12 +452,19 @@ def get_params(nx: int, ny: int):
     return params
 
 
-async def get_current_data(nx: int, ny: int):
-    live, daily, sky, air = await asyncio.gather(
-        get_live_weather(nx, ny),
-        get_daily_forecast(nx, ny),
-        get_sky_state(nx, ny),
-        get_air_state(nx, ny),
+# /current 섹션별 조회 함수 (fields 파라미터로 필요한 섹션만 조회)
+CURRENT_SECTIONS = ("live", "daily", "sky", "air")
+
+async def get_current_data(nx: int, ny: int, sections=None):
+    fetchers = {
+        "live": get_live_weather,     # 초단기실황 (기온, 습도, 강수, 바람)
+        "daily": get_daily_forecast,  # 일 최저/최고기온
+        "sky": get_sky_state,         # 하늘상태
+        "air": get_air_state,         # 미세먼지
+    }
+    names = [name for name in CURRENT_SECTIONS if sections is None or name in sections]
+    results = await asyncio.gather(
+        *(traced(name, fetchers[name](nx, ny)) for name in names),
         return_exceptions=True
     )
     def safe(data):
@@ -62,12 +474,10 @@ async def get_current_data(nx: int, ny: int):
             return {}
         return data
 
-    live  = safe(live)
-    daily = safe(daily)
-    sky   = safe(sky)
-    air   = safe(air)
-
-    return {**live, **daily, **sky, **air}
+    merged = {}
+    for data in results:
+        merged.update(safe(data))
+    return merged
 
 #------------------------------------------------------
 # 단기예보조회
@@ -106,98 +516,30 @@ def get_forecast_params(nx: int, ny: int):
         "ny": ny,
     }
     return params
-    
+
 async def get_forecast_data(nx: int, ny: int):
     cache_key = f"forecast:short:{nx}:{ny}"
-    cached = redis.get(cache_key)
-    if cached:
-        logging.info("캐시된 날씨 데이터 사용")
-        try:
-            return json.loads(cached) 
-        except json.JSONDecodeError:
-            logging.warning("캐시된 JSON 파싱 오류. API 재호출") # 수정
-    logging.info("기상청 API에서 날씨 데이터 조회")
-
     params = get_forecast_params(nx, ny)
-    try:
-        transport = httpx.AsyncHTTPTransport(retries=3) # 수정
-
-        async with httpx.AsyncClient(base_url=KMA_API_BASE_URL) as client:
-            response = await client.get("/getVilageFcst", params=params)
-            logging.info(f"상태 코드: {response.status_code}")
-            logging.info(f"응답 헤더: {response.headers}")
-            logging.info(f"응답 내용: {response.text[:500]}")
-            response.raise_for_status()
-            
-            forecast_data = response.json()
-
-            parsed = parsers.parse_forecast_items(forecast_data)
-
-            redis.set(cache_key, json.dumps(parsed), ex=FORECAST_CASHE_EXPIRE) # 수정
-            
-            return parsed
-
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 401:
-            raise HTTPException(status_code=401, detail="[401] 기상청 API 인증 실패. 서비스 키를 확인")
-        logging.error(f"기상청 API 호출 실패: {e.response.text}")
-        raise HTTPException(status_code=e.response.status_code, detail=f"기상청 API 호출 오류: {e.response.text}")
-
-    except Exception as e:
-        logging.error(f"서버 내부 오류: {e}")
-        raise HTTPException(status_code=500, detail=f"서버 내부 오류: {e}")
+    return await fetch_with_cache(cache_key, FORECAST_CASHE_EXPIRE, KMA_API_BASE_URL, "getVilageFcst", params,
+                                  parsers.parse_forecast_items)
 
 # 초단기실황조회
 async def get_live_weather(nx: int, ny: int):
     cache_key = f"weather:{nx}:{ny}"
-    cached = redis.get(cache_key)
-    if cached:
-        logging.info("캐시된 날씨 데이터 사용")
-        try:
-            return json.loads(cached)
-        except json.JSONDecodeError:
-            logging.warning("캐시된 JSON 파싱 오류. API 재호출")
-    logging.info("기상청 API에서 날씨 데이터 조회")
-
     params = get_params(nx, ny) #api 파라미터 생성
-    try:
-        async with httpx.AsyncClient(base_url=KMA_API_BASE_URL) as client:
-            response = await client.get("/getUltraSrtNcst", params=params)  #테스트 필요
-            logging.info(f"상태 코드: {response.status_code}")
-            logging.info(f"응답 헤더: {response.headers}")
-            logging.info(f"응답 내용: {response.text[:500]}")
-            response.raise_for_status()
-            
-            weather_data = response.json()
-
-            parsed = parsers.parse_items(weather_data)  #데이터 파싱
 
-            redis.set(cache_key, json.dumps(parsed), ex=CASHE_EXPIRE)
-            
-            return parsed
+    # 외부 API에서 새로 받은 실황만 관측 이력(/history)에 추가합니다. (캐시 hit은 파싱하지 않음)
+    def parse(data: dict):
+        parsed = parsers.parse_items(data)
+        if parsed:
+            history.append(nx, ny, params["base_date"], params["base_time"], data)
+        return parsed
 
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 401:
-            raise HTTPException(status_code=401, detail="[401] 기상청 API 인증 실패. 서비스 키를 확인")
-        logging.error(f"기상청 API 호출 실패: {e.response.text}")
-        raise HTTPException(status_code=e.response.status_code, detail=f"기상청 API 호출 오류: {e.response.text}")
-
-    except Exception as e:
-        logging.error(f"서버 내부 오류: {e}")
-        raise HTTPException(status_code=500, detail=f"서버 내부 오류: {e}")
+    return await fetch_with_cache(cache_key, CASHE_EXPIRE, KMA_API_BASE_URL, "getUltraSrtNcst", params, parse)
 
 #단기예보(TMN/TMX)조회 -> 새벽 2시 기준
 async def get_daily_forecast(nx: int, ny: int):
     cache_key = f"forecast:{nx}:{ny}"
-    cached = redis.get(cache_key)
-    if cached:
-        logging.info("캐시된 날씨 데이터 사용")
-        try:
-            return json.loads(cached) 
-        except json.JSONDecodeError:
-            logging.warning("캐시된 JSON 파싱 오류. API 재호출") # 수정
-    logging.info("기상청 API에서 날씨 데이터 조회")
-
     params = {
         "serviceKey": KMA_SERVICE_KEY,
         "pageNo": 1,
@@ -208,36 +550,8 @@ async def get_daily_forecast(nx: int, ny: int):
         "nx": nx,
         "ny": ny,
     }
-
-    logging.info(f"기상청 API(단기예보 02:00 기준) 데이터 조회 시작")
-    try:
-        transport = httpx.AsyncHTTPTransport(retries=3) # 수정
-
-        async with httpx.AsyncClient(base_url=KMA_API_BASE_URL) as client:
-            response = await client.get("/getVilageFcst", params=params)
-            logging.info(f"상태 코드: {response.status_code}")
-            logging.info(f"응답 헤더: {response.headers}")
-            logging.info(f"응답 내용: {response.text[:500]}")
-            response.raise_for_status()
-            
-            forecast_data = response.json()
-
-            parsed = parsers.parse_tmn_tmx(forecast_data)
-
-            if parsed:
-                redis.set(cache_key, json.dumps(parsed), ex=FORECAST_CASHE_EXPIRE) # 수정
-            
-            return parsed
-
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 401:
-            raise HTTPException(status_code=401, detail="[401] 기상청 API 인증 실패. 서비스 키를 확인")
-        logging.error(f"기상청 API 호출 실패: {e.response.text}")
-        raise HTTPException(status_code=e.response.status_code, detail=f"기상청 API 호출 오류: {e.response.text}")
-
-    except Exception as e:
-        logging.error(f"서버 내부 오류: {e}")
-        raise HTTPException(status_code=500, detail=f"서버 내부 오류: {e}")
+    return await fetch_with_cache(cache_key, FORECAST_CASHE_EXPIRE, KMA_API_BASE_URL, "getVilageFcst", params,
+                                  parsers.parse_tmn_tmx)
 
 #초단기예보 - api 파라미터
 def get_ultra_params(nx: int, ny: int):
@@ -264,61 +578,34 @@ def get_ultra_params(nx: int, ny: int):
 
 async def get_sky_state(nx: int, ny: int):
     cache_key = f"weather:sky:{nx}:{ny}"
-    cached = redis.get(cache_key)
-    if cached:
-        logging.info("캐시된 날씨 데이터 사용")
-        try:
-            return json.loads(cached)
-        except json.JSONDecodeError:
-            logging.warning("캐시된 JSON 파싱 오류. API 재호출")
-    logging.info("기상청 API에서 날씨 데이터 조회")
-
     params = get_ultra_params(nx, ny) #api 파라미터 생성
-    try:
-        async with httpx.AsyncClient(base_url=KMA_API_BASE_URL) as client:
-            response = await client.get("/getUltraSrtFcst", params=params)  #테스트 필요
-            logging.info(f"상태 코드: {response.status_code}")
-            logging.info(f"응답 헤더: {response.headers}")
-            logging.info(f"응답 내용: {response.text[:500]}")
-            response.raise_for_status()
-            
-            weather_data = response.json()
-
-            parsed = parsers.parse_sky_state(weather_data)  #데이터 파싱
-
-            redis.set(cache_key, json.dumps(parsed), ex=CASHE_EXPIRE)
-            
-            return parsed
-
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 401:
-            raise HTTPException(status_code=401, detail="[401] 기상청 API 인증 실패. 서비스 키를 확인")
-        logging.error(f"기상청 API 호출 실패: {e.response.text}")
-        raise HTTPException(status_code=e.response.status_code, detail=f"기상청 API 호출 오류: {e.response.text}")
-
-    except Exception as e:
-        logging.error(f"서버 내부 오류: {e}")
-        raise HTTPException(status_code=500, detail=f"서버 내부 오류: {e}")
+    return await fetch_with_cache(cache_key, CASHE_EXPIRE, KMA_API_BASE_URL, "getUltraSrtFcst", params,
+                                  parsers.parse_sky_state)
 
 #------------------------------------------------------
 #대기오염정보조회
 #------------------------------------------------------
-#위치 JSON 파일 로드
+#위치 JSON 파일 로드 (import 시점이 아니라 처음 사용할 때 / 준비 단계에서 한 번)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 JSON_PATH = os.path.join(BASE_DIR, "station.json")
-LOCATION_MAP = {}
-try:
-    with open(JSON_PATH, "r", encoding="utf-8") as f:
-        LOCATION_MAP = json.load(f)
-    logger.info(f"측정소 매핑 테이블 로드 완료: {len(LOCATION_MAP)}개 지점")
-except FileNotFoundError:
-    LOCATION_MAP = {}
-    logger.warningf("파일을 찾을 수 없습니다: {JSON_PATH}. 기본값(종로구)만 사용됩니다.")
+_location_map = None
+
+def get_location_map() -> dict:
+    global _location_map
+    if _location_map is None:
+        try:
+            with open(JSON_PATH, "r", encoding="utf-8") as f:
+                _location_map = json.load(f)
+            logger.info(f"측정소 매핑 테이블 로드 완료: {len(_location_map)}개 지점")
+        except FileNotFoundError:
+            _location_map = {}
+            logger.warning(f"파일을 찾을 수 없습니다: {JSON_PATH}. 기본값(종로구)만 사용됩니다.")
+    return _location_map
 
 # API 요청 파라미터
 def get_air_params(nx: int, ny: int):
     key = f"{nx},{ny}"
-    info = LOCATION_MAP.get(key)
+    info = get_location_map().get(key)
     station_name = info["station"] if info else "서대문구"
 
     params = {
@@ -335,41 +622,9 @@ def get_air_params(nx: int, ny: int):
 # 대기오염정보조회
 async def get_air_state(nx: int, ny: int):
     cache_key = f"weather:air:{nx}:{ny}"
-    cached = redis.get(cache_key)
-    if cached:
-        logging.info("캐시된 날씨 데이터 사용(대기오염정보)")
-        try:
-            return json.loads(cached)
-        except json.JSONDecodeError:
-            logging.warning("캐시된 JSON 파싱 오류. API 재호출")
-    logging.info("기상청 API에서 날씨 데이터 조회 (대기오염정보)")
-
     params = get_air_params(nx, ny) #api 파라미터 생성
-    try:
-        async with httpx.AsyncClient(base_url=AIR_API_BASE_URL) as client:
-            response = await client.get("/getMsrstnAcctoRltmMesureDnsty", params=params)  #테스트 필요
-            logging.info(f"상태 코드: {response.status_code}")
-            logging.info(f"응답 헤더: {response.headers}")
-            logging.info(f"응답 내용: {response.text[:500]}")
-            response.raise_for_status()
-            
-            air_data = response.json()
-
-            parsed = parsers.parse_air_state(air_data)  #데이터 파싱
-
-            redis.set(cache_key, json.dumps(parsed), ex=CASHE_EXPIRE)
-            
-            return parsed
-
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 401:
-            raise HTTPException(status_code=401, detail="[401] 기상청 API 인증 실패. 서비스 키를 확인")
-        logging.error(f"기상청 API 호출 실패: {e.response.text}")
-        raise HTTPException(status_code=e.response.status_code, detail=f"기상청 API 호출 오류: {e.response.text}")
-
-    except Exception as e:
-        logging.error(f"서버 내부 오류: {e}")
-        raise HTTPException(status_code=500, detail=f"서버 내부 오류: {e}")
+    return await fetch_with_cache(cache_key, CASHE_EXPIRE, AIR_API_BASE_URL, "getMsrstnAcctoRltmMesureDnsty", params,
+                                  parsers.parse_air_state)
 
 #------------------------------------------------------
 #2. 시간별 날씨 기능
@@ -377,47 +632,30 @@ async def get_air_state(nx: int, ny: int):
 # 초단기예보 조회 (시간별)
 async def get_ultra_forecast_data(nx: int, ny: int):
     cache_key = f"forecast:ultra:{nx}:{ny}"
-    cached = redis.get(cache_key)
-    if cached:
-        logging.info("캐시된 날씨 데이터 사용")
-        try:
-            return json.loads(cached)
-        except json.JSONDecodeError:
-            logging.warning("캐시된 JSON 파싱 오류. API 재호출")
-    logging.info("기상청 API에서 날씨 데이터 조회 (초단기예보 - 시간별)")
-
     params = get_ultra_params(nx, ny) #api 파라미터 생성
-    try:
-        async with httpx.AsyncClient(base_url=KMA_API_BASE_URL) as client:
-            response = await client.get("/getUltraSrtFcst", params=params)  #테스트 필요
-            logging.info(f"상태 코드: {response.status_code}")
-            logging.info(f"응답 헤더: {response.headers}")
-            logging.info(f"응답 내용: {response.text[:500]}")
-            response.raise_for_status()
-            
-            forecast_data = response.json()
-
-            parsed = parsers.parse_ultr_forecast_items(forecast_data)  #데이터 파싱
-
-            redis.set(cache_key, json.dumps(parsed), ex=CASHE_EXPIRE)
-            
-            return parsed
-
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 401:
-            raise HTTPException(status_code=401, detail="[401] 기상청 API 인증 실패. 서비스 키를 확인")
-        logging.error(f"기상청 API 호출 실패: {e.response.text}")
-        raise HTTPException(status_code=e.response.status_code, detail=f"기상청 API 호출 오류: {e.response.text}")
-
-    except Exception as e:
-        logging.error(f"서버 내부 오류: {e}")
-        raise HTTPException(status_code=500, detail=f"서버 내부 오류: {e}")
+    return await fetch_with_cache(cache_key, CASHE_EXPIRE, KMA_API_BASE_URL, "getUltraSrtFcst", params,
+                                  parsers.parse_ultr_forecast_items)
 
 # 단기 + 초단기 예보 통합 조회 (시간별)
-async def get_hourly_forecast_data(nx: int, ny: int):
+# /forecast 필드 -> 응답 항목 키
+FORECAST_FIELDS = {
+    "temp": ("temp",),
+    "sky": ("sky",),
+    "pty": ("pty",),
+    "rain": ("rain_amount",),
+    "pop": ("pop",),
+}
+
+async def get_hourly_forecast_data(nx: int, ny: int, fields=None):
+    # 강수확률(POP)은 단기예보에만 있으므로 pop만 요청하면 초단기예보는 조회하지 않습니다.
+    need_ultra = fields is None or any(field != "pop" for field in fields)
+
+    async def skip():
+        return {}
+
     results = await asyncio.gather(
-        get_ultra_forecast_data(nx, ny),
-        get_forecast_data(nx, ny),
+        traced("ultra", get_ultra_forecast_data(nx, ny)) if need_ultra else skip(),
+        traced("short", get_forecast_data(nx, ny)),
         return_exceptions=True
     )
     def safe_get(data):
@@ -429,8 +667,24 @@ async def get_hourly_forecast_data(nx: int, ny: int):
     ultra = safe_get(results[0])
     short = safe_get(results[1])
 
+    with span("merge"):
+        hourly_list = merge_hourly_forecast(ultra, short)
+    return select_fields(hourly_list, FORECAST_FIELDS, fields, ("date", "time"))
+
+# 목록 항목에서 요청한 필드만 남김 (fields가 None이면 전체)
+def select_fields(items: list, field_map: dict, fields, always: tuple):
+    if fields is None:
+        return items
+    keys = set(always)
+    for field in fields:
+        keys.update(field_map[field])
+    return [{k: v for k, v in item.items() if k in keys} for item in items]
+
+# 단기 + 초단기 예보를 현재 시각부터 24시간 목록으로 병합
+def merge_hourly_forecast(ultra: dict, short: dict, current_time: datetime = None):
     hourly_list = []
-    current_time = datetime.now()
+    if current_time is None:
+        current_time = datetime.now()
 
     for i in range(24):
         target_time = current_time + timedelta(hours=i)
@@ -458,7 +712,7 @@ async def get_hourly_forecast_data(nx: int, ny: int):
 
         if ultra and t_date in ultra and t_time in ultra[t_date]:
             data = ultra[t_date][t_time]
-            
+
             # 초단기 예보에 있는 값으로 교체
             if "기온(°C)" in data:
                 weather_item["temp"] = data["기온(°C)"]
@@ -469,7 +723,7 @@ async def get_hourly_forecast_data(nx: int, ny: int):
             if "1시간 강수량(mm)" in data:
                 weather_item["rain_amount"] = data["1시간 강수량(mm)"]
             # 참고: 초단기예보에는 강수확률(POP)이 없으므로 단기예보 값을 그대로 유지
-            
+
         # 데이터가 유효한 경우에만 리스트에 추가 (과거 데이터 등 제외 로직이 필요하면 추가)
         if weather_item["temp"] is not None:
              hourly_list.append(weather_item)
@@ -482,7 +736,7 @@ async def get_hourly_forecast_data(nx: int, ny: int):
 # 좌표로 구역 코드
 def get_mid_reg_code(nx: int, ny: int):
     key = f"{nx},{ny}"
-    info = LOCATION_MAP.get(key)
+    info = get_location_map().get(key)
     if info:
         return info["land"], info["ta"]
     else:
@@ -491,7 +745,7 @@ def get_mid_reg_code(nx: int, ny: int):
 # 중기예보 API 파라미터 생성
 def get_mid_term_params(reg_id: str):
     now = datetime.now()
-    
+
     if now.hour < 6:
         target = now - timedelta(days=1)
         tmFc = target.strftime("%Y%m%d1800")
@@ -512,89 +766,38 @@ def get_mid_term_params(reg_id: str):
 #중기 기온 조회
 async def get_mid_ta(reg_id: str):
     cache_key = f"week:mid:ta:{reg_id}"
-    cached = redis.get(cache_key)
-    if cached:
-        logging.info("캐시된 날씨 데이터 사용")
-        try:
-            return json.loads(cached)
-        except json.JSONDecodeError:
-            logging.warning("캐시된 JSON 파싱 오류. API 재호출")
-    logging.info("기상청 API에서 날씨 데이터 조회 (중기 기온- 주간별)")
-
     params = get_mid_term_params(reg_id) #api 파라미터 생성
-    try:
-        async with httpx.AsyncClient(base_url=KMA_API_MID_URL) as client:
-            response = await client.get("/getMidTa", params=params)  #테스트 필요
-            logging.info(f"상태 코드: {response.status_code}")
-            logging.info(f"응답 헤더: {response.headers}")
-            logging.info(f"응답 내용: {response.text[:500]}")
-            response.raise_for_status()
-            
-            week_data = response.json()
-
-            parsed = parsers.parse_mid_ta(week_data)  #데이터 파싱
-
-            redis.set(cache_key, json.dumps(parsed), ex=MID_TERM_CACHE_EXPIRE)
-            
-            return parsed
-
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 401:
-            raise HTTPException(status_code=401, detail="[401] 기상청 API 인증 실패. 서비스 키를 확인")
-        logging.error(f"기상청 API 호출 실패: {e.response.text}")
-        raise HTTPException(status_code=e.response.status_code, detail=f"기상청 API 호출 오류: {e.response.text}")
-
-    except Exception as e:
-        logging.error(f"서버 내부 오류: {e}")
-        raise HTTPException(status_code=500, detail=f"서버 내부 오류: {e}")
+    return await fetch_with_cache(cache_key, MID_TERM_CACHE_EXPIRE, KMA_API_MID_URL, "getMidTa", params,
+                                  parsers.parse_mid_ta)
 
 #중기 육상 기온 조회
 async def get_mid_land(reg_id: str):
     cache_key = f"week:mid:land:{reg_id}"
-    cached = redis.get(cache_key)
-    if cached:
-        logging.info("캐시된 날씨 데이터 사용")
-        try:
-            return json.loads(cached)
-        except json.JSONDecodeError:
-            logging.warning("캐시된 JSON 파싱 오류. API 재호출")
-    logging.info("기상청 API에서 날씨 데이터 조회 (중기 육상 - 주간별)")
-
     params = get_mid_term_params(reg_id) #api 파라미터 생성
-    try:
-        async with httpx.AsyncClient(base_url=KMA_API_MID_URL) as client:
-            response = await client.get("/getMidLandFcst", params=params)  #테스트 필요
-            logging.info(f"상태 코드: {response.status_code}")
-            logging.info(f"응답 헤더: {response.headers}")
-            logging.info(f"응답 내용: {response.text[:500]}")
-            response.raise_for_status()
-            
-            week_data = response.json()
-
-            parsed = parsers.parse_mid_land(week_data)  #데이터 파싱
-
-            redis.set(cache_key, json.dumps(parsed), ex=MID_TERM_CACHE_EXPIRE)
-            
-            return parsed
-
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 401:
-            raise HTTPException(status_code=401, detail="[401] 기상청 API 인증 실패. 서비스 키를 확인")
-        logging.error(f"기상청 API 호출 실패: {e.response.text}")
-        raise HTTPException(status_code=e.response.status_code, detail=f"기상청 API 호출 오류: {e.response.text}")
-
-    except Exception as e:
-        logging.error(f"서버 내부 오류: {e}")
-        raise HTTPException(status_code=500, detail=f"서버 내부 오류: {e}")
+    return await fetch_with_cache(cache_key, MID_TERM_CACHE_EXPIRE, KMA_API_MID_URL, "getMidLandFcst", params,
+                                  parsers.parse_mid_land)
 
 #주간 날씨 조회 통합
-async def get_weekly_forecast_data(nx: int, ny: int):
+# /week 필드 -> 응답 항목 키
+WEEK_FIELDS = {
+    "temp": ("min_temp", "max_temp"),
+    "sky": ("sky_am", "sky_pm"),
+    "pop": ("pop",),
+}
+
+async def get_weekly_forecast_data(nx: int, ny: int, fields=None):
     land_code, ta_code = get_mid_reg_code(nx, ny)
+    # 중기 기온은 temp, 중기 육상(하늘상태/강수확률)은 sky/pop을 요청할 때만 조회합니다.
+    need_ta = fields is None or "temp" in fields
+    need_land = fields is None or "sky" in fields or "pop" in fields
+
+    async def skip():
+        return None
 
     results = await asyncio.gather(
-        get_forecast_data(nx, ny),
-        get_mid_ta(ta_code),
-        get_mid_land(land_code),
+        traced("short", get_forecast_data(nx, ny)),
+        traced("mid-ta", get_mid_ta(ta_code)) if need_ta else skip(),
+        traced("mid-land", get_mid_land(land_code)) if need_land else skip(),
         return_exceptions=True
     )
     def safe(d): return {} if isinstance(d, Exception) else d
@@ -602,6 +805,12 @@ async def get_weekly_forecast_data(nx: int, ny: int):
     mid_ta = safe(results[1])
     mid_land = safe(results[2])
 
+    with span("merge"):
+        weekly_list = merge_weekly_forecast(short_data, mid_ta, mid_land)
+    return select_fields(weekly_list, WEEK_FIELDS, fields, ("date",))
+
+# 단기예보 일별 요약 + 중기예보(3~7일)를 날짜순 목록으로 병합 (조회하지 않은 중기예보는 None)
+def merge_weekly_forecast(short_data: dict, mid_ta: dict, mid_land: dict, today: datetime = None):
     weekly_map = {}
 
     if short_data:
@@ -610,10 +819,11 @@ async def get_weekly_forecast_data(nx: int, ny: int):
             weekly_map[date] = info
 
     # 4. 중기예보(3~7일) 병합
-    today = datetime.now()
+    if today is None:
+        today = datetime.now()
     for day in range(3, 8): 
         target_date = (today + timedelta(days=day)).strftime("%Y%m%d")
-        
+
         item = {
             "date": target_date,
             "min_temp": None,
@@ -627,19 +837,219 @@ async def get_weekly_forecast_data(nx: int, ny: int):
         if mid_ta and target_date in mid_ta:
             item["min_temp"] = mid_ta[target_date]["min_temp"]
             item["max_temp"] = mid_ta[target_date]["max_temp"]
-        
+
         # 날씨 데이터 병합
         if mid_land and target_date in mid_land:
             item["sky_am"] = mid_land[target_date]["sky_am"]
             item["sky_pm"] = mid_land[target_date]["sky_pm"]
             item["pop"] = mid_land[target_date]["pop"]
 
-        # 데이터가 있으면 리스트에 추가
-        if item["min_temp"] is not None:
+        # 데이터가 있으면 리스트에 추가 (중기 기온을 조회하지 않은 경우 육상예보 기준)
+        if item["min_temp"] is not None or (mid_ta is None and mid_land and target_date in mid_land):
             weekly_map[target_date] = item
-            
+
     # 날짜순 정렬
     weekly_list = list(weekly_map.values())
     weekly_list.sort(key=lambda x: x["date"])
 
-    return weekly_list
\ No newline at end of file
+    return weekly_list
+#------------------------------------------------------
+# 현재 + 시간별 + 주간 한 번에 조회 (/all)
+#------------------------------------------------------
+# 세 화면이 함께 쓰는 단기예보(getVilageFcst)/초단기예보(getUltraSrtFcst)는 요청 안에서 한 번만 조회합니다.
+async def get_all_data(nx: int, ny: int, fields=None):
+    with request_scope():
+        current, hourly, weekly = await asyncio.gather(
+            traced("current", get_current_data(nx, ny)),
+            traced("forecast", get_hourly_forecast_data(nx, ny)),
+            traced("week", get_weekly_forecast_data(nx, ny)),
+        )
+    if not (current or hourly or weekly):
+        return {}
+    return {"current": current, "forecast": hourly, "week": weekly}
+
+#------------------------------------------------------
+# 응답 캐시 헤더용: 입력 자료 버전 / 다음 발표 시각
+#------------------------------------------------------
+# 응답마다 어떤 캐시 키(자료)로 만들어지는지와, 그 자료가 다음에 언제 바뀔 수 있는지 계산합니다.
+#   ver:{캐시 키}  set_cached가 저장한 내용 해시 (자료 캐시와 같은 TTL) -> ETag
+#   다음 발표 시각 -> Cache-Control max-age
+
+# 응답 하나를 만드는 데 쓰이는 (캐시 키, 자료 종류) 목록
+def input_products(route: str, nx: int, ny: int, fields=None):
+    if route == "current":
+        sections = {
+            "live": (f"weather:{nx}:{ny}", "live"),
+            "daily": (f"forecast:{nx}:{ny}", "daily"),
+            "sky": (f"weather:sky:{nx}:{ny}", "ultra"),
+            "air": (f"weather:air:{nx}:{ny}", "air"),
+        }
+        return [sections[name] for name in CURRENT_SECTIONS if fields is None or name in fields]
+    if route == "forecast":
+        products = [(f"forecast:short:{nx}:{ny}", "short")]
+        if fields is None or any(field != "pop" for field in fields):
+            products.append((f"forecast:ultra:{nx}:{ny}", "ultra"))
+        return products
+    if route == "week":
+        land_code, ta_code = get_mid_reg_code(nx, ny)
+        products = [(f"forecast:short:{nx}:{ny}", "short")]
+        if fields is None or "temp" in fields:
+            products.append((f"week:mid:ta:{ta_code}", "mid"))
+        if fields is None or "sky" in fields or "pop" in fields:
+            products.append((f"week:mid:land:{land_code}", "mid"))
+        return products
+    if route == "all":
+        return list(dict.fromkeys(input_products("current", nx, ny) + input_products("forecast", nx, ny)
+                                  + input_products("week", nx, ny)))
+    raise ValueError(f"알 수 없는 route: {route}")
+
+# 캐시 키별 내용 버전 (하나라도 없으면 None: 만료되어 다시 조회해야 하는 자료가 있음)
+def product_versions(cache_keys: list):
+    try:
+        with span("redis-ver"):
+            versions = redis_client.redis.mget([f"ver:{key}" for key in cache_keys])
+    except RedisError:
+        return None
+    if not versions or any(version is None for version in versions):
+        return None
+    return versions
+
+# 자료 종류별 다음 발표(조회 기준이 바뀌는) 시각. 발표 일정이 없는 대기오염정보는 캐시 TTL 기준
+def next_publication(product: str, now: datetime) -> datetime:
+    hour = now.replace(minute=0, second=0, microsecond=0)
+    if product == "live":     # 초단기실황: 매시 40분
+        candidate = hour + timedelta(minutes=40)
+        return candidate if candidate > now else candidate + timedelta(hours=1)
+    if product == "ultra":    # 초단기예보: 매시 45분
+        candidate = hour + timedelta(minutes=45)
+        return candidate if candidate > now else candidate + timedelta(hours=1)
+    if product == "short":    # 단기예보: 02, 05, ..., 23시 + 45분 (get_forecast_params 기준)
+        day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        for h in [2, 5, 8, 11, 14, 17, 20, 23, 26]:
+            candidate = day + timedelta(hours=h, minutes=45)
+            if candidate > now:
+                return candidate
+    if product == "daily":    # 일 최저/최고기온: 날짜가 바뀔 때
+        return now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    if product == "mid":      # 중기예보: 06시, 18시
+        day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        for h in (6, 18, 30):
+            candidate = day + timedelta(hours=h)
+            if candidate > now:
+                return candidate
+    return now + timedelta(seconds=CASHE_EXPIRE)
+
+# 입력 자료 중 가장 먼저 바뀔 수 있는 시각까지 남은 초
+def seconds_until_update(products: list, now: datetime = None) -> int:
+    if now is None:
+        now = datetime.now()
+    return int(min((next_publication(product, now) - now).total_seconds() for _, product in products))
+
+# 응답 본문이 현재 시각에 따라 달라지는 구간: (구간 이름, 구간이 끝나는 시각). 입력 자료만으로 정해지면 (None, None)
+#   forecast  현재 시각부터 24시간 -> 매 정시에 바뀜
+#   week      오늘+3 ~ 오늘+7일 -> 자정에 바뀜
+#   all       둘 다 포함 -> 매 정시
+def view_window(route: str, now: datetime):
+    if route in ("forecast", "all"):
+        hour = now.replace(minute=0, second=0, microsecond=0)
+        return hour.strftime("%Y%m%d%H"), hour + timedelta(hours=1)
+    if route == "week":
+        day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return day.strftime("%Y%m%d"), day + timedelta(days=1)
+    return None, None
+
+# Cache-Control max-age: 입력 자료의 다음 발표 시각과 본문 구간이 끝나는 시각 중 먼저 오는 때까지
+def response_max_age(route: str, products: list, now: datetime) -> int:
+    max_age = seconds_until_update(products, now)
+    _, window_end = view_window(route, now)
+    if window_end is not None:
+        max_age = min(max_age, int((window_end - now).total_seconds()))
+    return max_age
+
+# ------------------------------------------------------
+# 4. 지역 일괄 조회 (지도 오버레이)
+# ------------------------------------------------------
+# station.json의 격자 중 중기 육상예보 구역(land) 또는 격자 범위(bbox)에 속한 격자의 초단기실황을
+# 격자별 캐시(weather:{nx}:{ny})에서 MGET 한 번으로 모으고, 없는 격자만 동시 호출 수를 제한해 채웁니다.
+# 채우는 호출은 백그라운드 우선순위로 쿼터를 사용하므로 사용자 요청용 잔여량을 건드리지 않습니다.
+REGION_BACKFILL_CONCURRENCY = int(os.getenv("REGION_BACKFILL_CONCURRENCY", "8"))
+REGION_BACKFILL_LIMIT = int(os.getenv("REGION_BACKFILL_LIMIT", "50"))  # 요청당 외부 API로 채우는 최대 격자 수
+REGION_MAX_CELLS = int(os.getenv("REGION_MAX_CELLS", "500"))
+
+# 구역/범위에 속한 격자 목록 [(nx, ny, 위치 정보), ...]
+def get_region_cells(land: str = None, bbox: tuple = None):
+    cells = []
+    for key, info in get_location_map().items():
+        nx, ny = map(int, key.split(","))
+        if land is not None and info["land"] != land:
+            continue
+        if bbox is not None and not (bbox[0] <= nx <= bbox[2] and bbox[1] <= ny <= bbox[3]):
+            continue
+        cells.append((nx, ny, info))
+    cells.sort(key=lambda cell: (cell[0], cell[1]))
+    return cells
+
+def _load_json(value):
+    if not value:
+        return None
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return None
+
+# 격자별 초단기실황 (cells와 같은 순서, 조회하지 못한 격자는 None)
+async def get_region_live(cells: list):
+    keys = [f"weather:{nx}:{ny}" for nx, ny, _ in cells]
+    if not keys:
+        return []
+    try:
+        with span("redis"):
+            results = [_load_json(value) for value in redis_client.redis.mget(keys)]
+    except RedisError:
+        results = [local_cache.get(key) for key in keys]
+    missing = [i for i, data in enumerate(results) if data is None]
+    for i, key in enumerate(keys):
+        record_cache(key, "miss" if results[i] is None else "hit")
+    mark("cache-weather", f"hit {len(keys) - len(missing)}/{len(keys)}")
+
+    # 캐시에 없는 격자 채우기 (요청당 REGION_BACKFILL_LIMIT개, 동시 REGION_BACKFILL_CONCURRENCY개)
+    # 쿼터는 백그라운드 몫을 쓰지만 격자마다 요청한 클라이언트의 upstream 예산을 차감하고, 예산을 다 쓰면 멈춥니다.
+    backfill = [] if admission.is_cache_only() else missing[:REGION_BACKFILL_LIMIT]
+    if backfill:
+        semaphore = asyncio.Semaphore(REGION_BACKFILL_CONCURRENCY)
+        exhausted = asyncio.Event()  # 쿼터/브레이커로 막히면 남은 격자는 호출하지 않음
+
+        async def fill(i: int):
+            nx, ny, _ = cells[i]
+            async with semaphore:
+                if exhausted.is_set():
+                    return
+                if ratelimit.upstream_exhausted():
+                    exhausted.set()
+                    logging.warning("지역 조회 채우기 중단: 클라이언트 외부 API 호출 한도 초과")
+                    return
+                try:
+                    results[i] = await get_live_weather(nx, ny)
+                except (CircuitOpenError, QuotaExceededError) as e:
+                    exhausted.set()
+                    logging.warning(f"지역 조회 채우기 중단: {e}")
+                except HTTPException as e:
+                    logging.warning(f"지역 조회 격자 실패 ({nx},{ny}): {e.detail}")
+
+        with span("backfill"), quota.priority(quota.BACKGROUND):
+            await asyncio.gather(*(fill(i) for i in backfill))
+
+    # 그래도 없는 격자는 만료된 복사본으로
+    rest = [i for i in missing if results[i] is None]
+    if rest:
+        try:
+            with span("redis-stale"):
+                stale = redis_client.redis.mget([f"stale:{keys[i]}" for i in rest])
+        except RedisError:
+            stale = [None] * len(rest)
+        for i, value in zip(rest, stale):
+            results[i] = _load_json(value)
+            if results[i] is not None:
+                record_cache(keys[i], "stale")
+
+    return results
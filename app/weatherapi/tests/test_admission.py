@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from weatherapi import admission, ratelimit
+from weatherapi.admission import RouteGate
+
+
+@pytest.fixture(autouse=True)
+def fresh_gates(monkeypatch):
+    monkeypatch.setattr(admission, "_gates", {})
+    monkeypatch.setitem(admission.ROUTE_LIMITS, "test", 1)
+    monkeypatch.setattr(admission, "ADMISSION_MAX_QUEUE", 1)
+    monkeypatch.setattr(admission, "ADMISSION_QUEUE_TIMEOUT", 0.05)
+
+
+async def fetch_mode():
+    """조회 함수: 캐시 전용 모드였는지 돌려줍니다."""
+    return {"cache_only": admission.is_cache_only()}
+
+
+async def fetch_nothing():
+    return {}
+
+
+def test_gate_hands_slot_to_waiter():
+    async def scenario():
+        gate = RouteGate("t", limit=1, max_queue=1)
+        assert await gate.acquire(1.0)
+        waiting = asyncio.ensure_future(gate.acquire(1.0))
+        await asyncio.sleep(0)
+        assert not await gate.acquire(1.0)  # 대기열이 가득 참
+
+        gate.release()
+        assert await waiting
+        assert gate.inflight == 1
+        gate.release()
+        assert gate.inflight == 0
+
+    asyncio.run(scenario())
+
+
+def test_gate_wait_times_out():
+    async def scenario():
+        gate = RouteGate("t", limit=1, max_queue=4)
+        assert await gate.acquire(1.0)
+        assert not await gate.acquire(0.01)
+        assert not gate.waiters
+        gate.release()
+        assert gate.inflight == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_passes_slot_on():
+    async def scenario():
+        gate = RouteGate("t", limit=1, max_queue=4)
+        assert await gate.acquire(1.0)
+        cancelled = asyncio.ensure_future(gate.acquire(1.0))
+        following = asyncio.ensure_future(gate.acquire(1.0))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+
+        gate.release()
+        assert await following
+        assert gate.inflight == 1
+
+    asyncio.run(scenario())
+
+
+def test_admitted_request_may_call_upstream():
+    assert asyncio.run(admission.admit("test", fetch_mode)) == ({"cache_only": False}, False)
+
+
+def test_saturated_route_served_from_cache():
+    async def scenario():
+        gate = admission.get_gate("test")
+        assert await gate.acquire(1.0)
+        blocked = asyncio.ensure_future(gate.acquire(1.0))  # 대기열도 가득 참
+        await asyncio.sleep(0)
+        result = await admission.admit("test", fetch_mode)
+        gate.release()
+        await blocked
+        gate.release()
+        return result
+
+    assert asyncio.run(scenario()) == ({"cache_only": True}, True)
+
+
+def test_saturated_route_without_cache_rejected():
+    async def scenario():
+        gate = admission.get_gate("test")
+        assert await gate.acquire(1.0)
+        return await admission.admit("test", fetch_nothing)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(scenario())
+    assert error.value.status_code == 503
+    assert error.value.headers["Retry-After"] == str(admission.ADMISSION_RETRY_AFTER)
+
+
+def test_exhausted_client_served_from_cache(monkeypatch):
+    monkeypatch.setattr(ratelimit, "upstream_exhausted", lambda: True)
+    assert asyncio.run(admission.admit("test", fetch_mode)) == ({"cache_only": True}, True)
+
+
+def test_exhausted_client_without_cache_limited(monkeypatch):
+    monkeypatch.setattr(ratelimit, "upstream_exhausted", lambda: True)
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(admission.admit("test", fetch_nothing))
+    assert error.value.status_code == 429
+    assert "Retry-After" in error.value.headers
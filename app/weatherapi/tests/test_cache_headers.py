@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from weatherapi import api, render, service
+from weatherapi.main import app
+
+NX, NY = 60, 127
+
+
+@pytest.fixture
+def client():
+    # startup(준비 단계)은 실행하지 않습니다.
+    return TestClient(app)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """api 모듈이 보는 현재 시각 (ETag 시각 구간 계산용)"""
+    now = [datetime.now()]
+
+    class FixedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now[0]
+
+    monkeypatch.setattr(api, "datetime", FixedDatetime)
+    return now
+
+
+def cache_live(temperature: float):
+    service.set_cached(f"weather:{NX}:{NY}", {"기온(°C)": temperature, "강수형태": "없음"}, 600)
+
+
+def cache_forecast():
+    # 실제 현재 시각부터 24시간 단기예보 (본문 병합은 service가 datetime.now() 기준으로 합니다)
+    start = datetime.now().replace(minute=0, second=0, microsecond=0)
+    short = {}
+    for i in range(26):
+        t = start + timedelta(hours=i)
+        short.setdefault(t.strftime("%Y%m%d"), {})[t.strftime("%H00")] = {"기온(°C)": 10.0 + i, "강수확률(%)": 20}
+    service.set_cached(f"forecast:short:{NX}:{NY}", short, 600)
+
+
+def test_etag_and_304(client):
+    cache_live(8.5)
+    first = client.get("/api/weather/current", params={"nx": NX, "ny": NY, "fields": "live"})
+    assert first.status_code == 200
+    assert first.headers["etag"].startswith('"')
+    assert first.headers["cache-control"].startswith("public, max-age=")
+
+    again = client.get("/api/weather/current", params={"nx": NX, "ny": NY, "fields": "live"},
+                       headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == first.headers["etag"]
+
+
+def test_etag_changes_with_data(client):
+    cache_live(8.5)
+    first = client.get("/api/weather/current", params={"nx": NX, "ny": NY, "fields": "live"})
+    cache_live(9.0)
+
+    changed = client.get("/api/weather/current", params={"nx": NX, "ny": NY, "fields": "live"},
+                         headers={"If-None-Match": first.headers["etag"]})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != first.headers["etag"]
+    assert changed.json()["날씨"]["기온(°C)"] == 9.0
+
+
+def test_debug_response_not_stored(client):
+    cache_live(8.5)
+    response = client.get("/api/weather/current", params={"nx": NX, "ny": NY, "fields": "live", "debug": "true"})
+    assert response.headers["cache-control"] == "no-store"
+    assert "etag" not in response.headers
+
+
+def test_forecast_etag_changes_every_hour(client, clock):
+    cache_forecast()
+    clock[0] = datetime.now().replace(minute=59, second=30, microsecond=0)
+    params = {"nx": NX, "ny": NY, "fields": "pop"}  # 단기예보만 사용
+
+    first = client.get("/api/weather/forecast", params=params)
+    assert first.status_code == 200
+    assert first.headers["cache-control"].startswith("public, max-age=30,")
+    assert client.get("/api/weather/forecast", params=params,
+                      headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+
+    clock[0] += timedelta(minutes=1)
+    next_hour = client.get("/api/weather/forecast", params=params, headers={"If-None-Match": first.headers["etag"]})
+    assert next_hour.status_code == 200
+    assert next_hour.headers["etag"] != first.headers["etag"]
+
+
+def test_view_window():
+    now = datetime(2026, 10, 19, 14, 59, 30)
+    assert service.view_window("forecast", now) == ("2026101914", datetime(2026, 10, 19, 15))
+    assert service.view_window("all", now) == ("2026101914", datetime(2026, 10, 19, 15))
+    assert service.view_window("week", now) == ("20261019", datetime(2026, 10, 20))
+    assert service.view_window("current", now) == (None, None)
+
+
+def test_max_age_capped_at_window_end():
+    products = [("forecast:short:60:127", "short")]
+    assert service.response_max_age("forecast", products, datetime(2026, 10, 19, 14, 59, 30)) == 30
+    # 단기예보 다음 발표(14:45)가 정시보다 먼저
+    assert service.response_max_age("forecast", products, datetime(2026, 10, 19, 14, 40)) == 300
+
+    mid = [("week:mid:ta:11B10101", "mid")]
+    assert service.response_max_age("week", mid, datetime(2026, 10, 19, 23, 59)) == 60
+    assert service.response_max_age("current", [(None, "live")], datetime(2026, 10, 19, 14, 39)) == 60
+
+
+def test_version_tag_includes_window():
+    versions = ["abc", "def"]
+    assert render.version_tag("resp:forecast", versions, "2026101914") != \
+        render.version_tag("resp:forecast", versions, "2026101915")
+    assert render.version_tag("resp:current", versions) == render.version_tag("resp:current", versions, None)
+
+
+@pytest.mark.parametrize("header, expected", [
+    ('"abc"', '"abc"'),
+    ('W/"abc"', '"abc"'),
+    ('"xyz", "abc-br"', '"abc-br"'),
+    ('"abcd"', None),
+    ("", None),
+])
+def test_matching_etag(header, expected):
+    assert render.matching_etag(header, "abc") == expected
+
+
+def test_cache_control_capped():
+    assert render.cache_control(10 ** 6) == \
+        f"public, max-age={render.CACHE_MAX_AGE}, stale-while-revalidate={render.CACHE_STALE_WHILE_REVALIDATE}"
+    assert render.cache_control(-5).startswith("public, max-age=0,")
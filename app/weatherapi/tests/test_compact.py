@@ -0,0 +1,108 @@
+import gzip
+
+import pytest
+
+from weatherapi import compact, render
+
+
+@pytest.mark.parametrize("value, code", [
+    ("맑음", 10),
+    ("구름많음", 30),
+    ("흐림", 40),
+    ("구름많고 비", 31),
+    ("흐리고 눈", 43),
+    ("구름많고 비/눈", 32),
+    ("흐리고 소나기", 44),
+    ("흐리고 빗방울", 45),
+    (None, 0),
+    ("알수없음", "알수없음"),
+])
+def test_wf_code(value, code):
+    assert compact.wf_code(value) == code
+
+
+def test_compact_current_codes():
+    data = {
+        "기온(°C)": 8.5,
+        "강수형태": "비/눈",
+        "하늘상태": "구름많음",
+        "미세먼지": "나쁨",
+        "초미세먼지": "정보없음",
+        "미세먼지농도": "73",
+        "초미세먼지농도": "-",
+        "측정시간": "2026-10-19 14:00",
+        "모르는 항목": 1,
+    }
+    assert compact.compact_current(60, 127, data) == {
+        "p": [60, 127],
+        "w": {"t": 8.5, "pty": 2, "sky": 3, "pm10": 3, "pm25": 0, "pm10v": 73.0, "pm25v": None,
+              "at": "2026-10-19 14:00"},
+    }
+
+
+def test_unknown_code_passes_through():
+    assert compact.compact_current(1, 2, {"하늘상태": "황사"})["w"] == {"sky": "황사"}
+
+
+def test_compact_hourly_columns():
+    items = [
+        {"date": "20261019", "time": "1500", "temp": 12.0, "sky": "맑음", "pty": "없음", "rain_amount": "강수없음", "pop": 0},
+        {"date": "20261019", "time": "1600", "temp": 11.0, "sky": "흐림", "pty": "소나기", "rain_amount": "1mm 미만", "pop": 60},
+    ]
+    assert compact.compact_hourly(60, 127, items)["w"] == {
+        "ts": [2026101915, 2026101916],
+        "t": [12.0, 11.0],
+        "sky": [1, 4],
+        "pty": [0, 4],
+        "rn": [0, "1mm 미만"],
+        "pop": [0, 60],
+    }
+
+
+def test_compact_hourly_selected_fields_only():
+    items = [{"date": "20261019", "time": "1500", "pop": 30}]
+    assert compact.compact_hourly(60, 127, items)["w"] == {"ts": [2026101915], "pop": [30]}
+
+
+def test_compact_weekly_columns():
+    items = [{"date": "20261022", "min_temp": 5, "max_temp": 15, "sky_am": "맑음", "sky_pm": "구름많고 비", "pop": 40}]
+    assert compact.compact_weekly(60, 127, items)["w"] == {
+        "d": [20261022], "min": [5], "max": [15], "am": [10], "pm": [31], "pop": [40],
+    }
+
+
+def test_compact_region_keeps_missing_cells():
+    cells = [(60, 127, {"desc": "서울"}), (61, 128, {"desc": "성남"})]
+    results = [{"기온(°C)": 8.5, "강수형태": "비"}, None]
+    assert compact.compact_region(cells, results) == {
+        "nx": [60, 61],
+        "ny": [127, 128],
+        "desc": ["서울", "성남"],
+        "w": {"t": [8.5, None], "reh": [None, None], "rn1": [None, None], "pty": [1, None],
+              "wsd": [None, None], "vec": [None, None]},
+    }
+
+
+@pytest.mark.parametrize("accept, encoding", [
+    ("br, gzip", "br" if render.brotli else "gzip"),
+    ("gzip, deflate", "gzip"),
+    ("gzip;q=0, br;q=0", "identity"),
+    ("*", "br" if render.brotli else "gzip"),
+    ("", "identity"),
+])
+def test_negotiate_encoding(accept, encoding):
+    assert render.negotiate_encoding(accept) == encoding
+
+
+def test_small_bodies_not_compressed():
+    assert set(render.encode_variants(b"{}")) == {"identity"}
+
+
+def test_response_cache_stores_every_variant():
+    content = {"items": list(range(500))}
+    render.render_response(content, "identity", "resp:test")
+
+    cached = render.cached_response("resp:test", "gzip")
+    assert cached.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(cached.body) == render.cached_response("resp:test", "identity").body
+    assert render.cached_response("resp:missing", "gzip") is None
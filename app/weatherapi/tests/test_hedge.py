@@ -0,0 +1,147 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from shared.resilience import breaker as breaker_module
+from shared.resilience.breaker import CircuitBreaker
+from weatherapi import quota, service
+from weatherapi.quota import QuotaExceededError
+
+OPERATION = "getVilageFcst"
+HEDGE_DELAY = 0.02  # 지연 백분위수 (이 시간 안에 첫 응답이 없으면 헤지)
+
+
+@pytest.fixture(autouse=True)
+def hedging(monkeypatch):
+    monkeypatch.setattr(service, "HEDGE_ENABLED", True)
+    monkeypatch.setattr(service, "HEDGE_MIN_DELAY", 0.0)
+    monkeypatch.setattr(service, "_hedge_budget", {})
+
+
+@pytest.fixture
+def budget():
+    """헤지 한 번 보낼 수 있는 예산 (요청마다 HEDGE_BUDGET_RATIO가 더 쌓임)"""
+    service._hedge_budget[OPERATION] = 1.0
+
+
+def ok(body: str) -> httpx.Response:
+    return httpx.Response(200, json={"response": {"header": {"resultCode": "00"}, "body": body}},
+                          request=httpx.Request("GET", f"http://kma/{OPERATION}"))
+
+
+def make_client(*script):
+    """호출 순서대로 script의 (지연 초, 응답 또는 예외)를 따르는 외부 API 클라이언트"""
+    client = SimpleNamespace(calls=0, cancelled=[])
+
+    async def get(url, params=None, timeout=None):
+        index = client.calls
+        client.calls += 1
+        delay, result = script[index]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            client.cancelled.append(index)
+            raise
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    client.get = get
+    return client
+
+
+def fixed_breaker():
+    return SimpleNamespace(timeout=lambda: 5.0, percentile=lambda pct: HEDGE_DELAY)
+
+
+def hedged_get(client, breaker=None):
+    return asyncio.run(service.hedged_get(client, breaker or fixed_breaker(), OPERATION, {}))
+
+
+def test_fast_primary_no_hedge(budget):
+    client = make_client((0.0, ok("primary")))
+    assert hedged_get(client).json()["response"]["body"] == "primary"
+    assert client.calls == 1
+    assert service._hedge_budget[OPERATION] >= 1.0
+
+
+def test_no_hedge_without_budget():
+    client = make_client((0.1, ok("primary")), (0.0, ok("hedge")))
+    assert hedged_get(client).json()["response"]["body"] == "primary"
+    assert client.calls == 1
+
+
+def test_budget_accrues_per_request():
+    service._hedge_budget[OPERATION] = 1.0 - service.HEDGE_BUDGET_RATIO
+    client = make_client((0.1, ok("primary")), (0.0, ok("hedge")))
+    assert hedged_get(client).json()["response"]["body"] == "hedge"
+    assert service._hedge_budget[OPERATION] == pytest.approx(0.0)
+
+
+def test_no_hedge_when_quota_short(monkeypatch, budget):
+    def acquire(operation):
+        raise QuotaExceededError(operation, 0)
+
+    monkeypatch.setattr(quota, "acquire", acquire)
+    client = make_client((0.1, ok("primary")), (0.0, ok("hedge")))
+    assert hedged_get(client).json()["response"]["body"] == "primary"
+    assert client.calls == 1
+
+
+def test_hedge_wins_and_primary_cancelled(budget):
+    client = make_client((1.0, ok("primary")), (0.0, ok("hedge")))
+    assert hedged_get(client).json()["response"]["body"] == "hedge"
+    assert client.calls == 2
+    assert client.cancelled == [0]
+
+
+def test_failed_primary_falls_back_to_hedge(budget):
+    client = make_client((0.05, httpx.ConnectError("primary")), (0.1, ok("hedge")))
+    assert hedged_get(client).json()["response"]["body"] == "hedge"
+
+
+def test_both_fail_raises_primary_error(budget):
+    client = make_client((0.05, httpx.ReadTimeout("primary")), (0.0, httpx.ConnectError("hedge")))
+    with pytest.raises(httpx.ReadTimeout):
+        hedged_get(client)
+    assert client.calls == 2
+
+
+def test_outer_cancel_cancels_both(budget):
+    client = make_client((10.0, ok("primary")), (10.0, ok("hedge")))
+
+    async def cancel_midway():
+        task = asyncio.ensure_future(service.hedged_get(client, fixed_breaker(), OPERATION, {}))
+        await asyncio.sleep(HEDGE_DELAY * 3)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+
+    asyncio.run(cancel_midway())
+    assert client.calls == 2
+    assert sorted(client.cancelled) == [0, 1]
+
+
+def test_no_hedge_without_latency_samples(budget):
+    breaker = SimpleNamespace(timeout=lambda: 5.0, percentile=lambda pct: None)
+    client = make_client((0.1, ok("primary")), (0.0, ok("hedge")))
+    assert hedged_get(client, breaker).json()["response"]["body"] == "primary"
+    assert client.calls == 1
+
+
+def test_hedged_latency_recorded_in_breaker(monkeypatch, budget):
+    breaker = CircuitBreaker("hedge-latency")
+    breaker.latencies.extend([HEDGE_DELAY] * breaker_module.MIN_SAMPLES)
+    monkeypatch.setitem(service.UPSTREAM_BREAKERS, OPERATION, breaker)
+    client = make_client((1.0, ok("primary")), (0.0, ok("hedge")))
+    monkeypatch.setattr(service, "get_client", lambda base_url: client)
+
+    data = asyncio.run(service._request_upstream(service.KMA_API_BASE_URL, OPERATION, {}))
+
+    assert data["response"]["body"] == "hedge"
+    # 이긴 쪽 기준 지연 (늦은 첫 요청을 기다리지 않음)
+    assert len(breaker.latencies) == breaker_module.MIN_SAMPLES + 1
+    assert breaker.latencies[-1] < 0.5
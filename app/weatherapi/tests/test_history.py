@@ -0,0 +1,99 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from weatherapi import history
+
+NX, NY = 60, 127
+
+
+def live(**values) -> dict:
+    """초단기실황 응답 형식"""
+    items = [{"category": category, "obsrValue": str(value)} for category, value in values.items()]
+    return {"response": {"body": {"items": {"item": items}}}}
+
+
+def append_at(observed: datetime, **values):
+    history.append(NX, NY, observed.strftime("%Y%m%d"), observed.strftime("%H%M"), live(**values))
+
+
+@pytest.fixture
+def now():
+    return datetime.now().replace(minute=30, second=0, microsecond=0)
+
+
+def test_observation_keeps_numeric_categories():
+    data = live(T1H="12.5", REH=60, PTY=0, UUU="1.2")
+    data["response"]["body"]["items"]["item"].append({"category": "RN1", "obsrValue": "강수없음"})
+    assert history.observation(data) == {"T1H": 12.5, "REH": 60.0, "PTY": 0.0}
+    assert history.observation({"response": {"header": {"resultCode": "03"}}}) == {}
+
+
+def test_downsample():
+    entries = [
+        {"time": "202610190100", "T1H": 10.0, "REH": 50.0, "RN1": 0.5},
+        {"time": "202610190200", "T1H": 13.0, "RN1": 1.2},
+        {"time": "202610190300", "T1H": 11.5, "REH": 71.0},
+    ]
+    assert history.downsample("20261019", entries) == {
+        "date": "20261019", "count": 3,
+        "T1H_min": 10.0, "T1H_max": 13.0, "T1H_mean": 11.5,
+        "REH_mean": 60.5, "RN1_sum": 1.7,
+    }
+    assert history.downsample("20261019", []) == {"date": "20261019", "count": 0}
+
+
+def test_append_overwrites_same_time(fake_redis, now):
+    observed = now.replace(minute=0)
+    append_at(observed, T1H=10)
+    append_at(observed, T1H=11)
+
+    hourly = fake_redis.zrange(f"hist:hourly:{NX}:{NY}", 0, -1)
+    assert [json.loads(value)["T1H"] for value in hourly] == [11.0]
+    daily = fake_redis.zrange(f"hist:daily:{NX}:{NY}", 0, -1)
+    assert len(daily) == 1
+    assert json.loads(daily[0])["count"] == 1
+
+
+def test_append_trims_old_entries(fake_redis, now):
+    old = now.replace(minute=0) - timedelta(days=history.HISTORY_HOURLY_DAYS, hours=1)
+    append_at(old, T1H=5)
+    append_at(now.replace(minute=0), T1H=10)
+
+    hourly = fake_redis.zrange(f"hist:hourly:{NX}:{NY}", 0, -1)
+    assert [json.loads(value)["T1H"] for value in hourly] == [10.0]
+    assert 0 < fake_redis.ttl(f"hist:hourly:{NX}:{NY}") <= history.HISTORY_HOURLY_DAYS * history.DAY_SECONDS
+
+
+def test_append_ignores_empty_response(fake_redis, now):
+    history.append(NX, NY, now.strftime("%Y%m%d"), "0000", {"response": {}})
+    assert fake_redis.keys("hist:*") == []
+
+
+def test_get_history(now):
+    latest = now.replace(minute=0)
+    append_at(latest - timedelta(hours=24), T1H=8, REH=70, WSD=2)
+    append_at(latest - timedelta(hours=1), T1H=11, REH=60)
+    append_at(latest, T1H=12.5, REH=55, RN1=0.5)
+
+    result = history.get_history(NX, NY, hours=3, days=2, now=now)
+
+    assert [entry["T1H"] for entry in result["hourly"]] == [11.0, 12.5]
+    assert result["vs_yesterday"] == {"time": latest.strftime("%Y%m%d%H%M"), "T1H": 4.5, "REH": -15.0}
+    assert [summary["date"] for summary in result["daily"]] == [
+        (latest - timedelta(days=1)).strftime("%Y%m%d"), latest.strftime("%Y%m%d")]
+    assert history.get_history(NX, NY, hours=3, days=0, now=now)["daily"] == []
+
+
+def test_get_history_without_yesterday(now):
+    append_at(now.replace(minute=0), T1H=12)
+    assert history.get_history(NX, NY, hours=24, days=7, now=now)["vs_yesterday"] is None
+
+
+def test_get_history_redis_down(redis_server, now):
+    redis_server.connected = False
+    with pytest.raises(HTTPException) as error:
+        history.get_history(NX, NY, hours=24, days=7, now=now)
+    assert error.value.status_code == 503
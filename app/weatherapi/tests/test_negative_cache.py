@@ -0,0 +1,99 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from weatherapi import service
+from weatherapi.service import UpstreamResultError
+
+CACHE_KEY = "forecast:short:60:127"
+
+
+def params(base_time: str = "1400") -> dict:
+    return {"base_date": "20261019", "base_time": base_time, "nx": 60, "ny": 127}
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """외부 API 대신 responses에서 차례로 꺼내 돌려주거나(예외면 raise) 호출 횟수를 셉니다."""
+    stub = SimpleNamespace(calls=[], responses=[])
+
+    async def request_upstream(base_url, operation, request_params):
+        stub.calls.append(request_params["base_time"])
+        response = stub.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(service, "request_upstream", request_upstream)
+    return stub
+
+
+def fetch(request_params: dict, parse=lambda data: data["items"]):
+    return asyncio.run(service.fetch_with_cache(CACHE_KEY, 600, "http://kma", "getVilageFcst", request_params, parse))
+
+
+def no_data():
+    return UpstreamResultError("getVilageFcst", service.RESULT_NO_DATA, "NO_DATA")
+
+
+def test_no_data_cached_as_empty_result(upstream, fake_redis):
+    upstream.responses = [no_data()]
+
+    assert fetch(params()) == {}
+    assert fetch(params()) == {}
+    assert upstream.calls == ["1400"]
+    neg_key = f"neg:{CACHE_KEY}:202610191400"
+    assert json.loads(fake_redis.get(neg_key))["status"] == 200
+    assert 0 < fake_redis.ttl(neg_key) <= service.NEGATIVE_CACHE_EXPIRE
+    # 빈 결과도 ETag용 내용 버전이 있습니다.
+    assert fake_redis.get(f"ver:{CACHE_KEY}") == "empty-202610191400"
+
+
+def test_error_result_cached_briefly(upstream, fake_redis):
+    upstream.responses = [UpstreamResultError("getVilageFcst", "22", "LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS")]
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as error:
+            fetch(params())
+        assert error.value.status_code == 502
+    assert upstream.calls == ["1400"]
+    assert 0 < fake_redis.ttl(f"neg:{CACHE_KEY}:202610191400") <= service.NEGATIVE_ERROR_CACHE_EXPIRE
+
+
+def test_empty_parse_cached_as_empty_result(upstream, fake_redis):
+    upstream.responses = [{"items": []}]
+
+    assert fetch(params()) == []
+    assert fetch(params()) == {}
+    assert upstream.calls == ["1400"]
+    assert fake_redis.get(CACHE_KEY) is None
+
+
+def test_negative_entry_serves_stale_copy(upstream, fake_redis):
+    fake_redis.set(f"stale:{CACHE_KEY}", json.dumps([{"temp": 10}]))
+    upstream.responses = [no_data()]
+
+    assert fetch(params()) == [{"temp": 10}]
+    assert fetch(params()) == [{"temp": 10}]
+    assert upstream.calls == ["1400"]
+
+
+def test_negative_entry_scoped_to_base_time(upstream):
+    upstream.responses = [no_data(), {"items": [{"temp": 11}]}]
+
+    assert fetch(params("1400")) == {}
+    assert fetch(params("1700")) == [{"temp": 11}]
+    assert upstream.calls == ["1400", "1700"]
+
+
+def test_success_cached_with_version(upstream, fake_redis):
+    upstream.responses = [{"items": [{"temp": 12}]}]
+
+    assert fetch(params()) == [{"temp": 12}]
+    assert fetch(params()) == [{"temp": 12}]
+    assert upstream.calls == ["1400"]
+    assert json.loads(fake_redis.get(f"stale:{CACHE_KEY}")) == [{"temp": 12}]
+    assert fake_redis.get(f"ver:{CACHE_KEY}") is not None
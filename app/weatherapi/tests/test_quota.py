@@ -0,0 +1,98 @@
+from datetime import datetime
+
+import pytest
+
+from weatherapi import quota
+from weatherapi.quota import BACKGROUND, USER, QuotaExceededError
+
+OPERATION = "getVilageFcst"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(quota.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    """일일 한도 / 버킷 용량(= 일일 한도 / 86400 x BURST_SECONDS)을 테스트별로 지정"""
+    def configure(daily: int, burst_seconds: int):
+        monkeypatch.setenv(f"QUOTA_DAILY_LIMIT_{OPERATION}", str(daily))
+        monkeypatch.setattr(quota, "BURST_SECONDS", burst_seconds)
+    return configure
+
+
+def calls_allowed(level: str, attempts: int = 100) -> int:
+    allowed = 0
+    with quota.priority(level):
+        for _ in range(attempts):
+            try:
+                quota.acquire(OPERATION)
+            except QuotaExceededError:
+                break
+            allowed += 1
+    return allowed
+
+
+def daily_key() -> str:
+    return f"quota:daily:{OPERATION}:{datetime.now():%Y%m%d}"
+
+
+def test_counts_daily_usage(fake_redis, clock, limits):
+    limits(daily=86400, burst_seconds=3600)
+    for _ in range(3):
+        quota.acquire(OPERATION)
+    assert fake_redis.get(daily_key()) == "3"
+    assert 0 < fake_redis.ttl(daily_key()) <= 2 * 86400
+
+
+def test_user_can_borrow_half_a_bucket(clock, limits):
+    # 용량 10: 사용자 요청은 토큰 -4까지 (10 -> -5, 15회)
+    limits(daily=86400, burst_seconds=10)
+    assert calls_allowed(USER) == 15
+
+
+def test_background_keeps_half_a_bucket(clock, limits):
+    # 백그라운드는 토큰이 5 이상일 때만 (10 -> 4, 6회)
+    limits(daily=86400, burst_seconds=10)
+    assert calls_allowed(BACKGROUND) == 6
+    assert calls_allowed(USER) == 9
+
+
+def test_bucket_refills_over_time(clock, limits):
+    limits(daily=86400, burst_seconds=10)  # 초당 1개
+    assert calls_allowed(USER) == 15
+    clock[0] += 3
+    assert calls_allowed(USER) == 3
+
+
+def test_daily_limit(fake_redis, clock, limits):
+    limits(daily=100, burst_seconds=86400)
+    fake_redis.set(daily_key(), 99)
+    assert calls_allowed(USER) == 1
+    with pytest.raises(QuotaExceededError) as error:
+        quota.acquire(OPERATION)
+    assert error.value.remaining == 0
+
+
+def test_background_leaves_reserve_for_users(fake_redis, clock, limits):
+    limits(daily=100, burst_seconds=86400)
+    reserve = int(100 * quota.BACKGROUND_RESERVE)
+    fake_redis.set(daily_key(), 100 - reserve - 2)
+    assert calls_allowed(BACKGROUND) == 2
+    assert calls_allowed(USER) == reserve
+
+
+def test_redis_down_allows(redis_server, clock, limits):
+    limits(daily=1, burst_seconds=1)
+    redis_server.connected = False
+    assert calls_allowed(USER, attempts=5) == 5
+
+
+def test_priority_is_scoped():
+    assert quota.current_priority() == USER
+    with quota.priority(BACKGROUND):
+        assert quota.current_priority() == BACKGROUND
+    assert quota.current_priority() == USER
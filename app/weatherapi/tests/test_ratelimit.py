@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from weatherapi import ratelimit
+from weatherapi.ratelimit import CACHE, UPSTREAM
+
+WINDOW = 60
+START = 1_700_000_040.0  # 창 시작 (60의 배수)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [START]
+    monkeypatch.setattr(ratelimit.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def budgets(monkeypatch):
+    monkeypatch.setattr(ratelimit, "RATE_LIMIT_WINDOW", WINDOW)
+    monkeypatch.setattr(ratelimit, "BUDGETS", {CACHE: 5, UPSTREAM: 3})
+    monkeypatch.setattr(ratelimit, "RATE_LIMIT_ENABLED", True)
+    return ratelimit.BUDGETS
+
+
+@pytest.fixture
+def client():
+    """현재 요청의 클라이언트 (rate_limit 의존성이 설정하는 값)"""
+    token = ratelimit._client.set("ip:10.0.0.1")
+    yield "ip:10.0.0.1"
+    ratelimit._client.reset(token)
+
+
+def make_request(headers: dict = None, host: str = "10.0.0.9") -> Request:
+    return Request({
+        "type": "http",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        "client": (host, 12345),
+    })
+
+
+def allowed_count(budget: str, client: str, mode: str = "check", attempts: int = 20) -> int:
+    return sum(ratelimit._count(budget, client, mode) for _ in range(attempts))
+
+
+def test_check_stops_at_limit(clock, budgets):
+    assert allowed_count(CACHE, "ip:a") == 5
+    # 다른 클라이언트는 별도 예산
+    assert allowed_count(CACHE, "ip:b") == 5
+
+
+def test_peek_does_not_count(fake_redis, clock, budgets):
+    assert allowed_count(CACHE, "ip:a", "peek") == 20
+    assert fake_redis.get(f"ratelimit:{CACHE}:ip:a:{int(START // WINDOW)}") is None
+
+
+def test_charge_ignores_limit(fake_redis, clock, budgets):
+    assert allowed_count(UPSTREAM, "ip:a", "charge", attempts=7) == 7
+    key = f"ratelimit:{UPSTREAM}:ip:a:{int(START // WINDOW)}"
+    assert fake_redis.get(key) == "7"
+    assert 0 < fake_redis.ttl(key) <= 2 * WINDOW
+    assert not ratelimit._count(UPSTREAM, "ip:a", "peek")
+
+
+def test_previous_window_weighted(clock, budgets):
+    assert allowed_count(CACHE, "ip:a") == 5
+    # 다음 창 40% 지점: 이전 창 5회 x 0.6 = 3 -> 2회 더 허용
+    clock[0] = START + WINDOW + 0.4 * WINDOW
+    assert allowed_count(CACHE, "ip:a") == 2
+    # 두 창 뒤에는 이전 창이 비어 있음
+    clock[0] = START + 3 * WINDOW
+    assert allowed_count(CACHE, "ip:a") == 5
+
+
+def test_redis_down_allows(redis_server, clock, budgets):
+    redis_server.connected = False
+    assert allowed_count(CACHE, "ip:a") == 20
+
+
+def test_rate_limit_dependency_429(clock, budgets):
+    clock[0] = START + 15
+    for _ in range(5):
+        asyncio.run(ratelimit.rate_limit(make_request()))
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(ratelimit.rate_limit(make_request()))
+    assert error.value.status_code == 429
+    assert error.value.headers["Retry-After"] == "45"
+
+
+def test_rate_limit_disabled(monkeypatch, clock, budgets):
+    monkeypatch.setattr(ratelimit, "RATE_LIMIT_ENABLED", False)
+    for _ in range(10):
+        asyncio.run(ratelimit.rate_limit(make_request()))
+
+
+def test_upstream_budget(clock, budgets, client):
+    for _ in range(3):
+        assert not ratelimit.upstream_exhausted()
+        ratelimit.charge_upstream()
+    assert ratelimit.upstream_exhausted()
+
+
+def test_upstream_without_client(fake_redis, clock, budgets):
+    # 요청 밖(백그라운드 갱신 등)에서는 차감하지 않음
+    ratelimit.charge_upstream()
+    assert not ratelimit.upstream_exhausted()
+    assert fake_redis.keys("ratelimit:*") == []
+
+
+@pytest.mark.parametrize("headers, host, expected", [
+    ({}, "10.0.0.9", "ip:10.0.0.9"),
+    ({"X-Forwarded-For": "1.1.1.1, 10.0.0.2"}, "10.0.0.9", "ip:1.1.1.1"),
+    ({"CF-Connecting-IP": "2.2.2.2", "X-Forwarded-For": "1.1.1.1"}, "10.0.0.9", "ip:2.2.2.2"),
+    ({"X-API-Key": "unknown", "CF-Connecting-IP": "2.2.2.2"}, "10.0.0.9", "ip:2.2.2.2"),
+])
+def test_client_id(headers, host, expected):
+    assert ratelimit.client_id(make_request(headers, host)) == expected
+
+
+def test_client_id_api_key(monkeypatch):
+    monkeypatch.setattr(ratelimit, "RATE_LIMIT_API_KEYS", {"secret"})
+    first = ratelimit.client_id(make_request({"X-API-Key": "secret", "CF-Connecting-IP": "2.2.2.2"}))
+    second = ratelimit.client_id(make_request({"X-API-Key": "secret"}, "10.0.0.3"))
+    assert first == second
+    assert first.startswith("key:") and "secret" not in first
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from shared.startup.readiness import Readiness
+from weatherapi import readiness, service
+
+
+@pytest.fixture
+def failing_upstream(monkeypatch):
+    async def request_upstream(base_url, operation, params):
+        raise HTTPException(status_code=502, detail="외부 API 장애")
+
+    monkeypatch.setattr(service, "request_upstream", request_upstream)
+
+
+@pytest.fixture
+def cells(monkeypatch):
+    monkeypatch.setattr(readiness, "WARM_CELLS", "60,127")
+
+
+def test_prime_cells_fails_when_nothing_cached(cells, failing_upstream):
+    # get_all_data는 오류를 삼키고 빈 항목으로 응답합니다.
+    asyncio.run(service.get_all_data(60, 127))
+    with pytest.raises(RuntimeError, match="60,127"):
+        asyncio.run(readiness.prime_cells())
+
+
+def test_prime_cells_ok_when_cached(monkeypatch, cells):
+    async def get_all_data(nx, ny):
+        for key, _ in service.input_products("all", nx, ny):
+            service.set_cached(key, {"ok": True}, 600)
+
+    monkeypatch.setattr(service, "get_all_data", get_all_data)
+    asyncio.run(readiness.prime_cells())
+
+
+def test_warm_step_degraded_but_ready(cells, failing_upstream):
+    state = Readiness("weatherapi-test")
+
+    async def warm_up(r):
+        await r.step("warm", readiness.prime_cells)
+
+    asyncio.run(state.run(warm_up))
+    assert state.steps["warm"]["ok"] is False
+    assert state.degraded == ["warm"]
+    assert state.ready
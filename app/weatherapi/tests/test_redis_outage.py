@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+
+from shared.metrics.registry import REDIS_AVAILABLE
+from shared.redis import client as redis_client
+from shared.redis.client import GuardedRedis, RedisHealth
+from weatherapi import local_cache as local_cache_module, service
+from weatherapi.local_cache import LocalCache
+from weatherapi.main import app
+
+CACHE_KEY = "weather:60:127"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(redis_client.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(local_cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def outage(monkeypatch, redis_server, clock):
+    """운영과 같이 헬스 트래커로 감싼 Redis. down()/up()으로 장애를 흉내 냅니다."""
+    health = RedisHealth()
+    monkeypatch.setattr(redis_client, "redis",
+                        GuardedRedis(fakeredis.FakeRedis(server=redis_server, decode_responses=True), health))
+    monkeypatch.setattr(redis_client, "redis_binary", GuardedRedis(fakeredis.FakeRedis(server=redis_server), health))
+    monkeypatch.setattr(service, "local_cache", LocalCache(4))
+
+    def set_connected(connected: bool):
+        redis_server.connected = connected
+
+    yield SimpleNamespace(health=health, down=lambda: set_connected(False), up=lambda: set_connected(True))
+    REDIS_AVAILABLE.set(1)
+
+
+def test_falls_back_to_local_cache(outage):
+    outage.down()
+    service.set_cached(CACHE_KEY, {"기온(°C)": 8.5}, 600)
+    assert not outage.health.available
+    assert service.get_cached(CACHE_KEY) == {"기온(°C)": 8.5}
+    assert service.get_cached("weather:61:127") is None
+
+
+def test_uses_redis_again_after_cool_down(outage, clock, redis_server):
+    service.set_cached(CACHE_KEY, {"기온(°C)": 9.0}, 600)
+    outage.down()
+    service.set_cached(CACHE_KEY, {"기온(°C)": 8.5}, 600)
+
+    outage.up()
+    # 차단 중에는 복구된 Redis 대신 로컬 캐시
+    assert service.get_cached(CACHE_KEY) == {"기온(°C)": 8.5}
+    clock[0] += redis_client.REDIS_RETRY_SECONDS
+    assert service.get_cached(CACHE_KEY) == {"기온(°C)": 9.0}
+    assert outage.health.available
+
+
+def test_local_cache_expiry_and_lru(clock):
+    cache = LocalCache(2)
+    cache.set("a", 1, 10)
+    cache.set("b", 2, 10)
+    assert cache.get("a") == 1  # a가 최근 사용
+    cache.set("c", 3, 10)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    clock[0] += 10
+    assert cache.get("a") is None
+    assert cache.entries.keys() == {"c"}
+
+
+def test_routes_during_outage(outage):
+    client = TestClient(app)
+    outage.down()
+    service.set_cached(CACHE_KEY, {"기온(°C)": 8.5, "강수형태": "없음"}, 600)
+
+    current = client.get("/api/weather/current", params={"nx": 60, "ny": 127, "fields": "live"})
+    assert current.status_code == 200
+    assert current.json()["날씨"]["기온(°C)"] == 8.5
+    # 내용 버전(ver:*)을 확인할 수 없어 ETag 없이 캐시 금지
+    assert current.headers["cache-control"] == "no-store"
+    assert "etag" not in current.headers
+
+    assert client.get("/api/weather/history", params={"nx": 60, "ny": 127}).status_code == 503
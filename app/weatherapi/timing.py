@@ -0,0 +1,121 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+
+# ----------------------------------------------
+# 요청 단위 구간 측정 (Server-Timing)
+# ----------------------------------------------
+# 요청마다 루트 Span을 만들고, service.py의 각 단계가 하위 Span을 추가합니다.
+# asyncio.gather로 만든 태스크는 컨텍스트를 복사하므로 부모 Span을 그대로 이어받습니다.
+
+class Span:
+    __slots__ = ("name", "desc", "start", "end", "children")
+
+    def __init__(self, name: str, desc: Optional[str] = None):
+        self.name = name
+        self.desc = desc
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.children: List["Span"] = []
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+    def to_dict(self) -> dict:
+        node = {"name": self.name, "dur_ms": round(self.duration_ms, 2)}
+        if self.desc:
+            node["desc"] = self.desc
+        if self.children:
+            node["children"] = [child.to_dict() for child in self.children]
+        return node
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("timing_span", default=None)
+
+
+@contextmanager
+def span(name: str):
+    """현재 Span 아래에 하위 구간을 기록합니다. 측정 중인 요청이 아니면 아무것도 하지 않습니다."""
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    child = Span(name)
+    parent.children.append(child)
+    token = _current_span.set(child)
+    try:
+        yield child
+    finally:
+        child.end = time.perf_counter()
+        _current_span.reset(token)
+
+
+def mark(name: str, desc: str):
+    """길이가 없는 표식(예: 캐시 hit/miss)을 현재 Span에 남깁니다."""
+    parent = _current_span.get()
+    if parent is None:
+        return
+    marker = Span(name, desc)
+    marker.end = marker.start
+    parent.children.append(marker)
+
+
+async def traced(name: str, coro):
+    """코루틴 전체를 하나의 Span으로 감쌉니다. (asyncio.gather 분기 측정용)"""
+    with span(name):
+        return await coro
+
+
+def current_tree() -> Optional[dict]:
+    """현재 요청의 Span 트리 (debug=true 응답용)"""
+    root = _current_span.get()
+    return root.to_dict() if root is not None else None
+
+
+def format_server_timing(root: Span) -> str:
+    """Span 트리를 Server-Timing 헤더 값으로 펼칩니다. 하위 구간은 '부모.자식' 이름을 사용합니다."""
+    entries = [f"total;dur={root.duration_ms:.1f}"]
+
+    def walk(node: Span, prefix: str):
+        for child in node.children:
+            name = f"{prefix}{child.name}"
+            if child.desc is not None:
+                entries.append(f'{name};desc="{child.desc}"')
+            else:
+                entries.append(f"{name};dur={child.duration_ms:.1f}")
+            walk(child, f"{name}.")
+
+    walk(root, "")
+    return ", ".join(entries)
+
+
+class ServerTimingMiddleware:
+    """요청마다 루트 Span을 열고, 응답 헤더에 Server-Timing을 추가하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        root = Span("total")
+        token = _current_span.set(root)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                root.end = time.perf_counter()
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", format_server_timing(root).encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_span.reset(token)
@@ -0,0 +1,211 @@
+"""
+data.go.kr / ITS 응답 형식을 그대로 재현한 벤치마크용 페이로드 생성기.
+
+실제 API를 호출하면 쿼터가 소모되므로, 기록해 둔 응답의 구조(헤더/바디 봉투, 카테고리 구성,
+행 수, 값 형식)를 그대로 따르되 날짜는 요청의 base_date/base_time에 맞춰 생성합니다.
+같은 요청 파라미터에는 항상 같은 응답을 돌려주도록 좌표/구역 코드로 시드를 고정합니다.
+"""
+import random
+from datetime import datetime, timedelta
+
+# 초단기실황 카테고리 (8개)
+ULTRA_NCST_CATEGORIES = ["PTY", "REH", "RN1", "T1H", "UUU", "VEC", "VVV", "WSD"]
+# 초단기예보 카테고리 (10개 x 6시간 = 60행)
+ULTRA_FCST_CATEGORIES = ["LGT", "PTY", "RN1", "SKY", "T1H", "REH", "UUU", "VVV", "VEC", "WSD"]
+# 단기예보 시간별 카테고리 (12개) + 일별 TMN(0600) / TMX(1500)
+VILAGE_CATEGORIES = ["TMP", "UUU", "VVV", "VEC", "WSD", "SKY", "PTY", "POP", "WAV", "PCP", "REH", "SNO"]
+
+MID_LAND_SKIES = ["맑음", "구름많음", "흐림", "구름많고 비", "흐리고 비", "구름많고 눈"]
+
+
+def _envelope(items, num_of_rows: int, result_code: str = "00", result_msg: str = "NORMAL_SERVICE"):
+    return {
+        "response": {
+            "header": {"resultCode": result_code, "resultMsg": result_msg},
+            "body": {
+                "dataType": "JSON",
+                "items": {"item": items},
+                "pageNo": 1,
+                "numOfRows": num_of_rows,
+                "totalCount": len(items),
+            },
+        }
+    }
+
+
+def error_envelope(result_code: str = "03", result_msg: str = "NO_DATA"):
+    """기상청 오류 응답 (HTTP 200 + resultCode != 00)"""
+    return {"response": {"header": {"resultCode": result_code, "resultMsg": result_msg}}}
+
+
+def _rng(*seed_parts) -> random.Random:
+    return random.Random("|".join(str(p) for p in seed_parts))
+
+
+def _temperature(rng: random.Random, hour: int) -> float:
+    # 새벽 최저, 오후 3시 최고가 되도록 단순한 일교차를 줍니다.
+    diurnal = -abs(hour - 15) / 15 * 8
+    return round(12 + diurnal + rng.uniform(-1.5, 1.5), 1)
+
+
+def ultra_srt_ncst(base_date: str, base_time: str, nx: int, ny: int):
+    rng = _rng("ncst", base_date, base_time, nx, ny)
+    hour = int(base_time[:2])
+    values = {
+        "PTY": "0",
+        "REH": str(rng.randint(30, 95)),
+        "RN1": "0",
+        "T1H": str(_temperature(rng, hour)),
+        "UUU": str(round(rng.uniform(-3, 3), 1)),
+        "VEC": str(rng.randint(0, 359)),
+        "VVV": str(round(rng.uniform(-3, 3), 1)),
+        "WSD": str(round(rng.uniform(0, 6), 1)),
+    }
+    items = [
+        {"baseDate": base_date, "baseTime": base_time, "category": cat, "nx": nx, "ny": ny, "obsrValue": values[cat]}
+        for cat in ULTRA_NCST_CATEGORIES
+    ]
+    return _envelope(items, 10)
+
+
+def ultra_srt_fcst(base_date: str, base_time: str, nx: int, ny: int, hours: int = 6):
+    rng = _rng("ufcst", base_date, base_time, nx, ny)
+    base = datetime.strptime(base_date + base_time[:2], "%Y%m%d%H")
+    items = []
+    for cat in ULTRA_FCST_CATEGORIES:
+        for h in range(1, hours + 1):
+            t = base + timedelta(hours=h)
+            if cat == "T1H":
+                value = str(_temperature(rng, t.hour))
+            elif cat == "SKY":
+                value = rng.choice(["1", "3", "4"])
+            elif cat == "PTY":
+                value = rng.choice(["0", "0", "0", "1"])
+            elif cat == "RN1":
+                value = "강수없음"
+            elif cat == "REH":
+                value = str(rng.randint(30, 95))
+            elif cat == "LGT":
+                value = "0"
+            else:
+                value = str(round(rng.uniform(-5, 5), 1))
+            items.append({
+                "baseDate": base_date, "baseTime": base_time, "category": cat,
+                "fcstDate": t.strftime("%Y%m%d"), "fcstTime": t.strftime("%H00"),
+                "fcstValue": value, "nx": nx, "ny": ny,
+            })
+    return _envelope(items, 60)
+
+
+def vilage_fcst(base_date: str, base_time: str, nx: int, ny: int, num_of_rows: int = 1000):
+    rng = _rng("vilage", base_date, base_time, nx, ny)
+    base = datetime.strptime(base_date + base_time[:2], "%Y%m%d%H")
+    items = []
+    h = 1
+    while len(items) < num_of_rows:
+        t = base + timedelta(hours=h)
+        f_date, f_time = t.strftime("%Y%m%d"), t.strftime("%H00")
+        for cat in VILAGE_CATEGORIES:
+            if cat == "TMP":
+                value = str(round(_temperature(rng, t.hour)))
+            elif cat == "SKY":
+                value = rng.choice(["1", "3", "4"])
+            elif cat == "PTY":
+                value = rng.choice(["0", "0", "0", "1", "4"])
+            elif cat == "POP":
+                value = str(rng.choice([0, 0, 10, 20, 30, 60, 80]))
+            elif cat == "PCP":
+                value = "강수없음"
+            elif cat == "SNO":
+                value = "적설없음"
+            elif cat == "REH":
+                value = str(rng.randint(30, 95))
+            elif cat == "WAV":
+                value = "0"
+            elif cat == "VEC":
+                value = str(rng.randint(0, 359))
+            else:
+                value = str(round(rng.uniform(-5, 5), 1))
+            items.append({
+                "baseDate": base_date, "baseTime": base_time, "category": cat,
+                "fcstDate": f_date, "fcstTime": f_time, "fcstValue": value, "nx": nx, "ny": ny,
+            })
+        if f_time == "0600":
+            items.append({"baseDate": base_date, "baseTime": base_time, "category": "TMN",
+                          "fcstDate": f_date, "fcstTime": f_time, "fcstValue": "3.0", "nx": nx, "ny": ny})
+        if f_time == "1500":
+            items.append({"baseDate": base_date, "baseTime": base_time, "category": "TMX",
+                          "fcstDate": f_date, "fcstTime": f_time, "fcstValue": "19.0", "nx": nx, "ny": ny})
+        h += 1
+    return _envelope(items[:num_of_rows], num_of_rows)
+
+
+def air_state(station_name: str, now: datetime = None):
+    now = now or datetime.now()
+    rng = _rng("air", station_name, now.strftime("%Y%m%d%H"))
+    pm10 = rng.randint(5, 120)
+    pm25 = rng.randint(3, 80)
+    grade = lambda v, cuts: str(1 + sum(v > c for c in cuts))
+    item = {
+        "stationName": station_name,
+        "dataTime": now.strftime("%Y-%m-%d %H:00"),
+        "pm10Value": str(pm10), "pm25Value": str(pm25),
+        "pm10Grade1h": grade(pm10, (30, 80, 150)), "pm25Grade1h": grade(pm25, (15, 35, 75)),
+        "pm10Grade": grade(pm10, (30, 80, 150)), "pm25Grade": grade(pm25, (15, 35, 75)),
+        "o3Value": "0.031", "no2Value": "0.018", "coValue": "0.4", "so2Value": "0.003", "khaiValue": "72",
+    }
+    # 대기오염정보 API는 items가 배열입니다.
+    return {
+        "response": {
+            "header": {"resultCode": "00", "resultMsg": "NORMAL_CODE"},
+            "body": {"items": [item], "pageNo": 1, "numOfRows": 1, "totalCount": 1},
+        }
+    }
+
+
+def mid_ta(reg_id: str, tm_fc: str):
+    rng = _rng("midta", reg_id, tm_fc)
+    item = {"regId": reg_id}
+    for day in range(3, 11):
+        low = rng.randint(-2, 12)
+        item[f"taMin{day}"] = low
+        item[f"taMin{day}Low"] = 0
+        item[f"taMin{day}High"] = 2
+        item[f"taMax{day}"] = low + rng.randint(5, 12)
+        item[f"taMax{day}Low"] = 0
+        item[f"taMax{day}High"] = 2
+    return _envelope([item], 10)
+
+
+def mid_land(reg_id: str, tm_fc: str):
+    rng = _rng("midland", reg_id, tm_fc)
+    item = {"regId": reg_id}
+    for day in range(3, 8):
+        item[f"rnSt{day}Am"] = rng.choice([0, 10, 20, 30, 60])
+        item[f"rnSt{day}Pm"] = rng.choice([0, 10, 20, 30, 60])
+        item[f"wf{day}Am"] = rng.choice(MID_LAND_SKIES)
+        item[f"wf{day}Pm"] = rng.choice(MID_LAND_SKIES)
+    for day in range(8, 11):
+        item[f"rnSt{day}"] = rng.choice([0, 10, 20, 30, 60])
+        item[f"wf{day}"] = rng.choice(MID_LAND_SKIES)
+    return _envelope([item], 10)
+
+
+def cctv_info(min_x: float, max_x: float, min_y: float, max_y: float, count: int = 40):
+    rng = _rng("cctv", round(min_x, 3), round(min_y, 3))
+    data = []
+    for i in range(count):
+        x = rng.uniform(min_x, max_x)
+        y = rng.uniform(min_y, max_y)
+        data.append({
+            "roadsectionid": "",
+            "coordx": round(x, 6),
+            "coordy": round(y, 6),
+            "cctvresolution": "",
+            "filecreatetime": "",
+            "cctvtype": 2,
+            "cctvformat": "MP4",
+            "cctvname": f"[고속도로] 벤치 CCTV {i:02d}",
+            "cctvurl": f"http://stub.local/cctv/{i:02d}.mp4?token=bench",
+        })
+    return {"response": {"coordtype": 1, "data": data, "datacount": len(data)}}
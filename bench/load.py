@@ -0,0 +1,238 @@
+"""
+엔드투엔드 부하 벤치마크.
+
+로컬 대역 서버(bench.stub_upstream)와 가짜 Redis(fakeredis, 또는 --redis-host로 로컬 Redis)를 띄운 뒤
+weatherapi와 cctvapi를 uvicorn으로 실행하고, 시나리오별로 엔드포인트에 부하를 겁니다.
+
+시나리오
+    cold : 캐시를 비우고 요청마다 서로 다른 좌표를 조회 (모든 요청이 캐시 미스)
+    warm : 같은 좌표 집합을 한 번씩 미리 조회해 캐시를 채운 뒤 부하
+    hot  : 캐시를 비우고 하나의 좌표에 동시 요청 (동일 키 폭주)
+
+결과: 시나리오 x 엔드포인트별 RPS, p50/p95/p99(ms), 오류 수(4xx/5xx/연결 실패, 상태 코드별), 오퍼레이션별 외부 API 호출 수
+모든 요청이 같은 주소에서 나가므로 클라이언트별 요청 제한(RATE_LIMIT_ENABLED)은 끈 상태로 측정합니다.
+
+실행 (저장소 루트에서):
+    pip install -r bench/requirements.txt
+    python -m bench.load --requests 300 --concurrency 20 --json bench/results/load.json
+"""
+import argparse
+import asyncio
+import atexit
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(ROOT, "app")
+
+ENDPOINTS = {
+    "current": ("weather", "/api/weather/current"),
+    "forecast": ("weather", "/api/weather/forecast"),
+    "week": ("weather", "/api/weather/week"),
+    "cctv": ("cctv", "/get_cctv"),
+}
+SCENARIOS = ("cold", "warm", "hot")
+
+
+def start_server(app, port: int):
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="on"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def wait_until_up(url: str, timeout: float = 15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError(f"대역 서버가 응답하지 않습니다: {url}")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def load_cells(limit: int) -> List[tuple]:
+    with open(os.path.join(APP_DIR, "weatherapi", "station.json"), encoding="utf-8") as f:
+        keys = list(json.load(f).keys())
+    random.Random(42).shuffle(keys)
+    return [tuple(int(v) for v in key.split(",")) for key in keys[:limit]]
+
+
+def cctv_points(limit: int) -> List[tuple]:
+    # 서로 다른 geohash 타일에 떨어지도록 0.1도 간격 격자에서 뽑습니다.
+    rng = random.Random(7)
+    return [(round(34.0 + rng.randint(0, 40) * 0.1, 4), round(126.0 + rng.randint(0, 30) * 0.1, 4))
+            for _ in range(limit)]
+
+
+def build_params(endpoint: str, targets: List[tuple], i: int) -> dict:
+    a, b = targets[i % len(targets)]
+    if endpoint == "cctv":
+        return {"lat": a, "lng": b}
+    return {"nx": a, "ny": b}
+
+
+async def drive(base_url: str, path: str, endpoint: str, targets: List[tuple], total: int, concurrency: int):
+    latencies: List[float] = []
+    errors = 0
+    statuses: Dict[str, int] = {}
+    counter = iter(range(total))
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0,
+                                 limits=httpx.Limits(max_connections=concurrency)) as client:
+        async def worker():
+            nonlocal errors
+            for i in counter:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path, params=build_params(endpoint, targets, i))
+                    status = str(response.status_code)
+                except httpx.HTTPError:
+                    status = "connection"
+                statuses[status] = statuses.get(status, 0) + 1
+                if status == "connection" or int(status) >= 400:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "statuses": statuses,
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+    }
+
+
+def run(args) -> Dict[str, dict]:
+    os.environ.setdefault("KMA_SERVICE_KEY", "bench")
+    os.environ.setdefault("ITS_CCTV_API_KEY", "bench")
+    # 부하 발생기 하나가 모든 요청을 보내므로 클라이언트별 요청 제한이 걸리면 처리량 대신 429를 재게 됩니다.
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    stub_base = f"http://127.0.0.1:{args.stub_port}"
+    os.environ["KMA_API_BASE_URL"] = f"{stub_base}/kma"
+    os.environ["AIR_API_BASE_URL"] = f"{stub_base}/air"
+    os.environ["KMA_API_MID_URL"] = f"{stub_base}/mid"
+    os.environ["ITS_API_BASE_URL"] = f"{stub_base}/its"
+    if args.redis_host:
+        os.environ["REDIS_HOST"] = args.redis_host
+        os.environ["REDIS_PORT"] = str(args.redis_port)
+    sys.path.insert(0, APP_DIR)
+
+    import shared.redis.client as redis_client
+    if not args.redis_host:
+        # 문자열용/바이너리용(압축 응답 캐시) 클라이언트가 같은 가짜 서버를 보도록 둘 다 교체합니다.
+        import fakeredis
+        server = fakeredis.FakeServer()
+        redis_client.redis = fakeredis.FakeRedis(server=server, decode_responses=True)
+        redis_client.redis_binary = fakeredis.FakeRedis(server=server, decode_responses=False)
+    cache = redis_client.redis
+
+    # 대역 서버는 별도 프로세스로 띄워 측정 대상과 GIL을 나눠 쓰지 않게 합니다.
+    stub = subprocess.Popen([
+        sys.executable, "-m", "bench.stub_upstream", "--port", str(args.stub_port),
+        "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+        "--tail-ms", str(args.tail_ms), "--tail-ratio", str(args.tail_ratio),
+        "--error-rate", str(args.error_rate), "--error-mode", args.error_mode,
+    ], cwd=ROOT)
+    atexit.register(stub.terminate)
+    wait_until_up(f"{stub_base}/_stats")
+
+    # 서비스 모듈은 환경 변수와 Redis 교체가 끝난 뒤 import 합니다.
+    from weatherapi.main import app as weather_app
+    from cctvapi.server import app as cctv_app
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+    start_server(weather_app, args.weather_port)
+    start_server(cctv_app, args.cctv_port)
+    bases = {"weather": f"http://127.0.0.1:{args.weather_port}", "cctv": f"http://127.0.0.1:{args.cctv_port}"}
+
+    results: Dict[str, dict] = {}
+    for scenario in args.scenarios:
+        for endpoint in args.endpoints:
+            service, path = ENDPOINTS[endpoint]
+            if endpoint == "cctv":
+                pool = cctv_points(args.cells)
+            else:
+                pool = load_cells(args.cells)
+
+            cache.flushdb()
+            if scenario == "cold":
+                targets = cctv_points(args.requests) if endpoint == "cctv" else load_cells(args.requests)
+            elif scenario == "warm":
+                targets = pool
+                with httpx.Client(base_url=bases[service], timeout=30.0) as client:
+                    for i in range(len(targets)):
+                        client.get(path, params=build_params(endpoint, targets, i))
+            else:
+                targets = pool[:1]
+
+            httpx.post(f"{stub_base}/_reset")
+            summary = asyncio.run(drive(bases[service], path, endpoint, targets, args.requests, args.concurrency))
+            summary["upstream_calls"] = httpx.get(f"{stub_base}/_stats").json()
+            results[f"{scenario}/{endpoint}"] = summary
+            print(f"{scenario:5s} {endpoint:9s} rps={summary['rps']:8.1f} "
+                  f"p50={summary['p50_ms']:8.1f} p95={summary['p95_ms']:8.1f} p99={summary['p99_ms']:8.1f} "
+                  f"err={summary['errors']:4d} upstream={sum(summary['upstream_calls'].values())}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="weatherapi / cctvapi 부하 벤치마크")
+    parser.add_argument("--scenarios", type=lambda v: v.split(","), default=list(SCENARIOS))
+    parser.add_argument("--endpoints", type=lambda v: v.split(","), default=list(ENDPOINTS))
+    parser.add_argument("--requests", type=int, default=200, help="시나리오 x 엔드포인트별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--cells", type=int, default=50, help="warm/hot 시나리오에 쓰는 좌표 수")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--tail-ms", type=float, default=0.0)
+    parser.add_argument("--tail-ratio", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-mode", choices=["http500", "no_data", "xml"], default="http500")
+    parser.add_argument("--redis-host", default=None, help="지정하면 fakeredis 대신 해당 Redis를 사용 (db가 비워집니다)")
+    parser.add_argument("--redis-port", type=int, default=6379)
+    parser.add_argument("--stub-port", type=int, default=9100)
+    parser.add_argument("--weather-port", type=int, default=9000)
+    parser.add_argument("--cctv-port", type=int, default=9001)
+    parser.add_argument("--json", default=None, help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--verbose", action="store_true", help="서비스 INFO 로그 출력")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": {k: v for k, v in vars(args).items() if k != "json"}, "results": results},
+                      f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
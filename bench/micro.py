@@ -0,0 +1,260 @@
+"""
+파서 / 병합 로직 마이크로 벤치마크.
+
+기록해 둔 기상청 응답(bench/baselines/micro_inputs.json: 1000행 getVilageFcst, 60행 getUltraSrtFcst,
+중기예보 item)과 그때의 기준 시각(now)을 입력으로 parsers.py의 파싱 함수, service.py의 시간별/주간 병합,
+캐시 직렬화(JSON encode/decode)를 측정합니다. 파서 일부(parse_tmn_tmx, parse_mid_ta, parse_mid_land)와 병합 함수는
+datetime.now()로 오늘 날짜를 정하므로, 준비와 측정 동안 parsers/service의 시계를 기록된 now로 고정합니다. (frozen_clock)
+입력과 시각이 고정되어 있으므로 언제 실행해도 같은 일을 합니다.
+
+각 항목마다 호출당 실행 시간(µs)과 tracemalloc 기준 메모리(호출 중 최대 할당량, 호출 후 남는 할당량, KiB)를
+기록합니다. 전체 측정을 --runs번 반복해 실행별 중앙값의 중앙값(median_us)과 잡음(noise_pct: 실행별 중앙값의
+중앙 절대 편차, %)을 남기고, 기준선과는 median_us를 --threshold(%) + 잡음 여유(2 x 두 쪽 잡음 중 큰 값, 최대
+NOISE_ALLOWANCE_MAX_PCT)의 허용 오차로 비교합니다. 잡음이 큰 환경이어도 허용 오차가 threshold + 5%를 넘지 않습니다.
+
+실행 (저장소 루트에서):
+    python -m bench.micro                             # 결과 출력
+    python -m bench.micro --save bench/baselines/micro.json
+    python -m bench.micro --compare bench/baselines/micro.json --threshold 15
+    python -m bench.micro --record-inputs bench/baselines/micro_inputs.json   # 입력 다시 기록 (기준선도 갱신 필요)
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app"))
+INPUTS_PATH = os.path.join(ROOT, "bench", "baselines", "micro_inputs.json")
+# median_us 허용 오차에 더하는 잡음 여유의 상한 (%)
+NOISE_ALLOWANCE_MAX_PCT = 5.0
+
+from bench import fixtures  # noqa: E402
+
+
+def record_inputs(path: str, now: datetime):
+    """now 기준 입력 응답을 만들어 파일로 기록합니다."""
+    now = now.replace(minute=50, second=0, microsecond=0)
+    tm_fc = now.strftime("%Y%m%d0600")
+    inputs = {
+        "now": now.isoformat(),
+        # 단기예보는 그날 02:00 발표분 (TMN/TMX가 그날 날짜에 포함되도록)
+        "vilage": fixtures.vilage_fcst(now.strftime("%Y%m%d"), "0200", 60, 127, num_of_rows=1000),
+        "ultra": fixtures.ultra_srt_fcst(now.strftime("%Y%m%d"), now.strftime("%H30"), 60, 127),
+        "mid_ta": fixtures.mid_ta("11B10101", tm_fc),
+        "mid_land": fixtures.mid_land("11B00000", tm_fc),
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(inputs, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def load_inputs(path: str = INPUTS_PATH) -> dict:
+    with open(path, encoding="utf-8") as f:
+        inputs = json.load(f)
+    inputs["now"] = datetime.fromisoformat(inputs["now"])
+    return inputs
+
+
+@contextmanager
+def frozen_clock(now: datetime):
+    """parsers.py / service.py의 datetime.now()가 now를 돌려주도록 고정합니다."""
+    from weatherapi import parsers, service
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now
+
+    saved = parsers.datetime, service.datetime
+    parsers.datetime = service.datetime = FrozenDatetime
+    try:
+        yield
+    finally:
+        parsers.datetime, service.datetime = saved
+
+
+def build_cases(inputs: dict) -> Dict[str, Callable[[], object]]:
+    """기록된 입력으로 측정 항목을 만듭니다. (frozen_clock(inputs["now"]) 안에서 만들고 실행)"""
+    # service.py는 import 시 Redis 클라이언트를 만들기만 하고 접속하지 않으므로 그대로 가져옵니다.
+    from weatherapi import parsers, service
+
+    now = inputs["now"]
+    vilage, ultra, mid_ta, mid_land = inputs["vilage"], inputs["ultra"], inputs["mid_ta"], inputs["mid_land"]
+
+    short_parsed = parsers.parse_forecast_items(vilage)
+    ultra_parsed = parsers.parse_ultr_forecast_items(ultra)
+    mid_ta_parsed = parsers.parse_mid_ta(mid_ta)
+    mid_land_parsed = parsers.parse_mid_land(mid_land)
+    short_encoded = json.dumps(short_parsed)
+
+    assert len(vilage["response"]["body"]["items"]["item"]) == 1000
+    assert len(ultra["response"]["body"]["items"]["item"]) == 60
+
+    return {
+        "parse_forecast_items[1000]": lambda: parsers.parse_forecast_items(vilage),
+        "parse_ultr_forecast_items[60]": lambda: parsers.parse_ultr_forecast_items(ultra),
+        "parse_tmn_tmx[1000]": lambda: parsers.parse_tmn_tmx(vilage),
+        "parse_mid_ta": lambda: parsers.parse_mid_ta(mid_ta),
+        "parse_mid_land": lambda: parsers.parse_mid_land(mid_land),
+        "aggregate_short_term_to_daily": lambda: parsers.aggregate_short_term_to_daily(short_parsed),
+        "merge_hourly_forecast": lambda: service.merge_hourly_forecast(ultra_parsed, short_parsed, now),
+        "merge_weekly_forecast": lambda: service.merge_weekly_forecast(
+            short_parsed, mid_ta_parsed, mid_land_parsed, now),
+        "cache_encode[forecast:short]": lambda: json.dumps(short_parsed),
+        "cache_decode[forecast:short]": lambda: json.loads(short_encoded),
+    }
+
+
+def time_case(fn: Callable[[], object], repeat: int, min_time: float) -> Dict[str, float]:
+    # 한 번의 측정이 min_time 이상 걸리도록 반복 횟수를 맞춥니다.
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(loops):
+                fn()
+            samples.append((time.perf_counter() - start) / loops * 1e6)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return {"best_us": min(samples), "median_us": statistics.median(samples), "loops": loops}
+
+
+def measure_allocations(fn: Callable[[], object]) -> Dict[str, float]:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        result = fn()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {"peak_kib": round((peak - before) / 1024, 1), "retained_kib": round((current - before) / 1024, 1)}
+
+
+def run(repeat: int, min_time: float, runs: int, only=None, inputs_path: str = INPUTS_PATH) -> dict:
+    inputs = load_inputs(inputs_path)
+    results = {}
+    with frozen_clock(inputs["now"]):
+        cases = {
+            name: fn for name, fn in build_cases(inputs).items()
+            if not only or any(key in name for key in only)
+        }
+        # 항목별로 전체 측정을 runs번 반복합니다. (한 번의 측정이 순간적인 부하에 흔들리지 않도록 항목을 번갈아 실행)
+        samples = {name: [] for name in cases}
+        for _ in range(runs):
+            for name, fn in cases.items():
+                fn()  # 워밍업
+                samples[name].append(time_case(fn, repeat, min_time))
+
+        for name, fn in cases.items():
+            medians = [sample["median_us"] for sample in samples[name]]
+            median = statistics.median(medians)
+            results[name] = {
+                "best_us": round(min(sample["best_us"] for sample in samples[name]), 2),
+                "median_us": round(median, 2),
+                "noise_pct": round(statistics.median(abs(m - median) for m in medians) / median * 100, 1) if median else 0.0,
+                "loops": samples[name][-1]["loops"],
+                **measure_allocations(fn),
+            }
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "runs": runs,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> bool:
+    """
+    기준선 대비 변화율을 출력하고, 하나라도 허용 오차를 넘게 나빠지면 False
+      median_us  threshold(%) + min(2 x 기준선/현재 잡음(noise_pct) 중 큰 값, NOISE_ALLOWANCE_MAX_PCT)
+      peak_kib   threshold(%) (할당량은 실행마다 거의 같음)
+    """
+    ok = True
+    print(f"{'case':36s} {'median_us':>30s} {'peak_kib':>22s}")
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:36s} (기준선 없음)")
+            continue
+        noise = min(2 * max(base.get("noise_pct", 0.0), cur["noise_pct"]), NOISE_ALLOWANCE_MAX_PCT)
+        cols = []
+        for key, tolerance in (("median_us", threshold + noise), ("peak_kib", threshold)):
+            delta = (cur[key] - base[key]) / base[key] * 100 if base[key] else 0.0
+            flag = " !" if delta > tolerance else ""
+            ok = ok and not flag
+            cols.append(f"{base[key]:>8} -> {cur[key]:>8} {delta:+6.1f}%/{tolerance:.0f}%{flag}")
+        print(f"{name:36s} {cols[0]:>30s} {cols[1]:>22s}")
+    if baseline["meta"].get("python") != current["meta"]["python"]:
+        print(f"주의: 기준선 Python {baseline['meta'].get('python')} / 현재 {current['meta']['python']}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="parsers.py / service.py 병합 로직 마이크로 벤치마크")
+    parser.add_argument("--repeat", type=int, default=7, help="실행 1회당 항목별 측정 횟수")
+    parser.add_argument("--runs", type=int, default=5, help="전체 측정 반복 횟수 (중앙값 비교)")
+    parser.add_argument("--min-time", type=float, default=0.1, help="측정 1회당 최소 시간(초)")
+    parser.add_argument("--only", type=lambda v: v.split(","), default=None, help="이름에 포함된 항목만 실행")
+    parser.add_argument("--save", default=None, help="결과를 기준선 JSON으로 저장")
+    parser.add_argument("--compare", default=None, help="비교할 기준선 JSON")
+    parser.add_argument("--threshold", type=float, default=15.0, help="회귀로 판단할 악화율(%%, 잡음은 별도로 더함)")
+    parser.add_argument("--inputs", default=INPUTS_PATH, help="기록된 입력 응답 JSON")
+    parser.add_argument("--record-inputs", default=None, help="현재 시각 기준으로 입력 응답을 새로 기록할 경로")
+    args = parser.parse_args()
+
+    if args.record_inputs:
+        record_inputs(args.record_inputs, datetime.now())
+        print(f"입력 기록: {args.record_inputs}")
+        return
+
+    current = run(args.repeat, args.min_time, args.runs, args.only, args.inputs)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if not compare(current, baseline, args.threshold):
+            sys.exit(1)
+    else:
+        for name, r in current["results"].items():
+            print(f"{name:36s} best={r['best_us']:>10.2f}us median={r['median_us']:>10.2f}us "
+                  f"noise={r['noise_pct']:>5.1f}% peak={r['peak_kib']:>8.1f}KiB retained={r['retained_kib']:>8.1f}KiB")
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+data.go.kr(KMA/AIR/MID)와 ITS를 대신하는 로컬 대역 서버.
+
+경로는 /{api}/{operation} 형식이며, 서비스 쪽 기본 URL 환경 변수를 이 서버로 돌려 사용합니다.
+    KMA_API_BASE_URL=http://127.0.0.1:9100/kma
+    AIR_API_BASE_URL=http://127.0.0.1:9100/air
+    KMA_API_MID_URL=http://127.0.0.1:9100/mid
+    ITS_API_BASE_URL=http://127.0.0.1:9100/its
+
+지연/오류 주입은 StubConfig로 설정하며, 실행 중에도 POST /_config 로 바꿀 수 있습니다.
+오퍼레이션별 호출 수는 GET /_stats, 초기화는 POST /_reset 입니다.
+
+단독 실행:
+    python -m bench.stub_upstream --port 9100 --latency-ms 80 --tail-ms 1500 --tail-ratio 0.02
+"""
+import argparse
+import asyncio
+import random
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from bench import fixtures
+
+OPERATIONS = {
+    "kma": ("getUltraSrtNcst", "getUltraSrtFcst", "getVilageFcst"),
+    "air": ("getMsrstnAcctoRltmMesureDnsty",),
+    "mid": ("getMidTa", "getMidLandFcst"),
+    "its": ("cctvInfo",),
+}
+
+# data.go.kr이 서비스 키 오류 등에서 돌려주는 XML 응답
+SERVICE_ERROR_XML = (
+    "<OpenAPI_ServiceResponse><cmmMsgHeader><errMsg>SERVICE ERROR</errMsg>"
+    "<returnAuthMsg>LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR</returnAuthMsg>"
+    "<returnReasonCode>22</returnReasonCode></cmmMsgHeader></OpenAPI_ServiceResponse>"
+)
+
+
+@dataclass
+class StubConfig:
+    latency_ms: float = 50.0        # 기본 응답 지연
+    jitter_ms: float = 20.0         # 기본 지연에 더해지는 균등 분포 흔들림
+    tail_ms: float = 0.0            # 꼬리 지연 (tail_ratio 확률로 추가)
+    tail_ratio: float = 0.0
+    error_rate: float = 0.0         # 오류 응답 비율
+    error_mode: str = "http500"     # http500 | no_data | xml
+    per_operation_latency_ms: Dict[str, float] = field(default_factory=dict)
+
+
+def create_app(config: StubConfig = None) -> FastAPI:
+    app = FastAPI(title="upstream stub")
+    app.state.config = config or StubConfig()
+    app.state.calls = Counter()
+
+    async def inject(operation: str):
+        cfg: StubConfig = app.state.config
+        delay = cfg.per_operation_latency_ms.get(operation, cfg.latency_ms)
+        delay += random.uniform(0, cfg.jitter_ms)
+        if cfg.tail_ratio and random.random() < cfg.tail_ratio:
+            delay += cfg.tail_ms
+        await asyncio.sleep(delay / 1000)
+
+        if cfg.error_rate and random.random() < cfg.error_rate:
+            if cfg.error_mode == "no_data":
+                return JSONResponse(fixtures.error_envelope())
+            if cfg.error_mode == "xml":
+                return PlainTextResponse(SERVICE_ERROR_XML, media_type="text/xml")
+            return PlainTextResponse("Internal Server Error", status_code=500)
+        return None
+
+    @app.get("/{api}/{operation}")
+    async def upstream(api: str, operation: str, request: Request):
+        if operation not in OPERATIONS.get(api, ()):
+            return PlainTextResponse("not found", status_code=404)
+        app.state.calls[operation] += 1
+
+        error = await inject(operation)
+        if error is not None:
+            return error
+
+        q = request.query_params
+        if operation == "getUltraSrtNcst":
+            body = fixtures.ultra_srt_ncst(q["base_date"], q["base_time"], int(q["nx"]), int(q["ny"]))
+        elif operation == "getUltraSrtFcst":
+            body = fixtures.ultra_srt_fcst(q["base_date"], q["base_time"], int(q["nx"]), int(q["ny"]))
+        elif operation == "getVilageFcst":
+            body = fixtures.vilage_fcst(q["base_date"], q["base_time"], int(q["nx"]), int(q["ny"]),
+                                        int(q.get("numOfRows", 1000)))
+        elif operation == "getMsrstnAcctoRltmMesureDnsty":
+            body = fixtures.air_state(q["stationName"], datetime.now())
+        elif operation == "getMidTa":
+            body = fixtures.mid_ta(q["regId"], q["tmFc"])
+        elif operation == "getMidLandFcst":
+            body = fixtures.mid_land(q["regId"], q["tmFc"])
+        else:
+            body = fixtures.cctv_info(float(q["minX"]), float(q["maxX"]), float(q["minY"]), float(q["maxY"]))
+        return JSONResponse(body)
+
+    @app.get("/_stats")
+    async def stats():
+        return dict(app.state.calls)
+
+    @app.post("/_reset")
+    async def reset():
+        app.state.calls.clear()
+        return {"ok": True}
+
+    @app.post("/_config")
+    async def update_config(request: Request):
+        values = await request.json()
+        app.state.config = StubConfig(**{**asdict(app.state.config), **values})
+        return asdict(app.state.config)
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="data.go.kr / ITS 로컬 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--tail-ms", type=float, default=0.0)
+    parser.add_argument("--tail-ratio", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-mode", choices=["http500", "no_data", "xml"], default="http500")
+    args = parser.parse_args()
+
+    config = StubConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, tail_ms=args.tail_ms,
+        tail_ratio=args.tail_ratio, error_rate=args.error_rate, error_mode=args.error_mode,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from bench import micro
+from weatherapi import parsers, service
+
+
+@pytest.fixture
+def wall_clock(monkeypatch):
+    """실제 시계(parsers/service의 datetime.now)를 지정한 시각으로 바꿉니다."""
+    def set_now(now: datetime):
+        class WallDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return now
+        monkeypatch.setattr(parsers, "datetime", WallDatetime)
+        monkeypatch.setattr(service, "datetime", WallDatetime)
+    return set_now
+
+
+def case_outputs() -> dict:
+    inputs = micro.load_inputs()
+    with micro.frozen_clock(inputs["now"]):
+        return {name: fn() for name, fn in micro.build_cases(inputs).items()}
+
+
+def test_cases_do_not_depend_on_wall_clock(wall_clock):
+    recorded = micro.load_inputs()["now"]
+    wall_clock(recorded)
+    expected = case_outputs()
+
+    for days in (1, 40):
+        wall_clock(recorded + timedelta(days=days))
+        assert case_outputs() == expected
+
+    assert expected["parse_tmn_tmx[1000]"]
+    assert len(expected["parse_mid_ta"]) == 5
+    assert len(expected["merge_weekly_forecast"]) == 8
+
+
+def test_frozen_clock_restores(wall_clock):
+    wall_clock(datetime(2030, 1, 1))
+    saved = parsers.datetime
+    with micro.frozen_clock(datetime(2026, 10, 19, 6, 50)):
+        assert parsers.datetime.now() == service.datetime.now() == datetime(2026, 10, 19, 6, 50)
+    assert parsers.datetime is saved
+    assert service.datetime.now() == datetime(2030, 1, 1)
+
+
+def result(median_us: float, noise_pct: float, peak_kib: float = 10.0) -> dict:
+    return {"meta": {"python": "3.10"},
+            "results": {"case": {"median_us": median_us, "noise_pct": noise_pct, "peak_kib": peak_kib}}}
+
+
+@pytest.mark.parametrize("current, ok", [
+    (result(119.0, 2.0), True),    # 15% + 잡음 여유 4%
+    (result(121.0, 2.0), False),
+    (result(119.0, 40.0), True),   # 잡음 여유는 최대 5%
+    (result(121.0, 40.0), False),
+    (result(100.0, 1.0, peak_kib=12.0), False),
+])
+def test_compare_caps_noise_allowance(current, ok):
+    assert micro.compare(current, result(100.0, 1.0), threshold=15) is ok